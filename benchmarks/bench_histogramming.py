@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the one-pass histogram evaluation against histogramming each range on its own.
+
+Optimizes the bundled NeXus test file once, then histograms the result with the three ranges of
+the advanced NeXus demo, which all bin the radius: with the McSAS3 command line histogrammer
+run once per range, with the in-process evaluation called once per range, and with the
+in-process evaluation of all ranges in one pass.
+
+Usage:
+
+    python benchmarks/bench_histogramming.py [--n-contrib 300] [--n-rep 5] [--repeat 5]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from mcsas3gui.utils.file_utils import get_main_path
+from mcsas3gui.utils.histogramming import analyse
+from mcsas3gui.utils.optimization_runner import run_optimization
+from mcsas3gui.utils.result_reader import read_result
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))  # the test data settings
+from conftest import NEXUS_FILE, RUN_CONFIG, write_configs  # noqa: E402
+
+DEMO_CONFIG = get_main_path() / "configurations" / "prefab" / "advanced_nexus_demo.yaml"
+
+
+def optimize(temp_dir: Path, n_contrib: int, n_rep: int, max_iter: int) -> Path:
+    run_config = {
+        **RUN_CONFIG,
+        "nContrib": n_contrib,
+        "fitParameterLimits": {"radius": [1, 1000]},
+        "maxIter": max_iter,
+        "nRep": n_rep,
+    }
+    read_file, run_file = write_configs(temp_dir, run_config)
+    os.environ["MCSAS3GUI_PREPARED_DATA"] = str(temp_dir / "store")
+    result_file = temp_dir / "result.hdf5"
+    run_optimization(NEXUS_FILE, read_file, result_file, run_file)
+    return result_file
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def cli_per_range(result_file: Path, range_files: list[Path]) -> None:
+    for range_file in range_files:
+        subprocess.run(
+            [sys.executable, "-m", "mcsas3.mcsas3_cli_histogrammer"]
+            + ["-r", str(result_file), "-H", str(range_file), "-i", "1"],
+            check=True,
+            capture_output=True,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n-contrib", type=int, default=300, help="contributions per repetition")
+    parser.add_argument("--n-rep", type=int, default=5, help="repetitions")
+    parser.add_argument("--max-iter", type=int, default=1000, help="iterations per repetition")
+    parser.add_argument("--repeat", type=int, default=5, help="timings to take the best of")
+    args = parser.parse_args()
+
+    hist_ranges = yaml.safe_load(DEMO_CONFIG.read_text())["hist_configuration"]
+    temp_dir = Path(tempfile.mkdtemp())
+    print(f"Optimizing {NEXUS_FILE.name} with {args.n_contrib} contributions ...")
+    result_file = optimize(temp_dir, args.n_contrib, args.n_rep, args.max_iter)
+    range_files = []
+    for index, hist_range in enumerate(hist_ranges):
+        range_files.append(temp_dir / f"range{index}.yaml")
+        range_files[-1].write_text(yaml.safe_dump(hist_range))
+
+    result = read_result(result_file)
+    try:
+        timings = {
+            "CLI histogrammer per range": best_of(
+                lambda: cli_per_range(result_file, range_files), min(args.repeat, 2)
+            ),
+            "read and evaluate per range": best_of(
+                lambda: [analyse(read_result(result_file), [h]) for h in hist_ranges], args.repeat
+            ),
+            "evaluate per range": best_of(
+                lambda: [analyse(result, [h]) for h in hist_ranges], args.repeat
+            ),
+            "evaluate in one pass": best_of(lambda: analyse(result, hist_ranges), args.repeat),
+        }
+    finally:
+        shutil.rmtree(temp_dir)
+    print(f"{len(hist_ranges)} ranges, {args.n_rep} repetitions of {args.n_contrib} contributions:")
+    for label, timing in timings.items():
+        print(f"  {label:<30}: {timing * 1e3:10.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the selective pathDict reads used by the Data Settings tab and the batch pre-flight.
+
+Reads the reduced Q, I, ISigma vectors from the bundled NeXus test file and from a synthetic,
+multi-GB NeXus file which additionally carries raw 2D detector frames. The bytes read by the
+process stay bounded by the size of the referenced vectors, independent of the file size.
+
+Usage:
+
+    python benchmarks/bench_nexus_read.py [--size-gb 2] [--keep]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import h5py
+import numpy as np
+
+from mcsas3gui.utils.data_utils import load_mcdata_1d, read_hdf5_datasets
+from mcsas3gui.utils.file_utils import get_main_path
+
+TESTDATA_FILE = get_main_path() / "testdata" / "merged_AutoMOFs_7_L011.nxs"
+TESTDATA_PATHS = {
+    "Q": "/entry/result/Q",
+    "I": "/entry/result/I",
+    "ISigma": "/entry/result/I_errors",
+}
+FRAME_SHAPE = (1024, 1024)  # float32 detector frames, 4 MiB each
+
+
+def read_bytes() -> int | None:
+    """Bytes read by this process so far, as reported by Linux in /proc/self/io."""
+    try:
+        with open("/proc/self/io") as fd:
+            return int(next(line for line in fd if line.startswith("rchar:")).split()[1])
+    except (OSError, StopIteration):
+        return None
+
+
+def make_synthetic_nexus(file_name: Path, size_gb: float, n_points: int = 1000) -> None:
+    """Write raw detector frames of the requested total size, plus reduced 1D vectors."""
+    n_frames = max(1, int(size_gb * 1024**3 / (np.prod(FRAME_SHAPE) * 4)))
+    with h5py.File(file_name, "w") as h5f:
+        frames = h5f.create_dataset(
+            "/entry/instrument/detector/data",
+            shape=(n_frames, *FRAME_SHAPE),
+            dtype="float32",
+            chunks=(1, *FRAME_SHAPE),
+        )
+        for frame in range(n_frames):
+            frames[frame] = np.full(FRAME_SHAPE, frame, dtype="float32")
+        result = h5f.create_group("/entry/result")
+        q = np.logspace(-2, 0, n_points)
+        result.create_dataset("Q", data=q, chunks=(256,))
+        result.create_dataset("I", data=q**-4, chunks=(256,))
+        result.create_dataset("I_errors", data=0.01 * q**-4, chunks=(256,))
+
+
+def benchmark(file_name: Path, repeat: int = 5) -> None:
+    file_size = file_name.stat().st_size
+    print(f"{file_name.name}: {file_size / 1024**2:.1f} MiB on disk")
+    read_config = {"nbins": 100, "dataRange": [0.0, 1.0], "pathDict": TESTDATA_PATHS}
+    for label, func in (
+        ("read_hdf5_datasets", lambda: read_hdf5_datasets(file_name, TESTDATA_PATHS)),
+        ("load_mcdata_1d", lambda: load_mcdata_1d(file_name, read_config)),
+    ):
+        timings, volumes = [], []
+        for _ in range(repeat):
+            before, start = read_bytes(), time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+            if before is not None:
+                volumes.append(read_bytes() - before)
+        volume = f"{max(volumes) / 1024:.1f} KiB read" if volumes else "read volume unavailable"
+        print(f"  {label:<20}: {min(timings) * 1e3:8.2f} ms (best of {repeat}), {volume}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-gb", type=float, default=2.0, help="size of the synthetic file")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic file")
+    args = parser.parse_args()
+
+    benchmark(TESTDATA_FILE)
+    temp_dir = Path(tempfile.mkdtemp())
+    synthetic_file = temp_dir / "synthetic_frames.nxs"
+    print(f"Writing synthetic file of {args.size_gb} GB to {synthetic_file} ...")
+    make_synthetic_nexus(synthetic_file, args.size_gb)
+    try:
+        benchmark(synthetic_file)
+    finally:
+        if not args.keep:
+            synthetic_file.unlink()
+            temp_dir.rmdir()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the time until the main window is visible, against the startup budget.
+
+Starts the GUI offscreen in a fresh interpreter several times, as the startup test does, and
+reports the time from the first import until the window is shown. Exits with an error if the
+best of these exceeds the budget. The test suite checks that no heavy module is imported at
+startup, but not the time, which depends on the machine and its load.
+
+Usage:
+
+    python benchmarks/bench_startup.py [--repeat 5] [--budget 1.0]
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))  # the startup script
+from test_startup import run_startup  # noqa: E402
+
+STARTUP_BUDGET = 1.0  # seconds until the main window is visible
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="startups to take the best of")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="seconds")
+    args = parser.parse_args()
+
+    timings = [run_startup()["visible"] for _ in range(args.repeat)]
+    best = min(timings)
+    print(
+        f"Window visible after {best:.3f} s (best of {args.repeat}),"
+        f" median {statistics.median(timings):.3f} s, budget {args.budget:.3f} s"
+    )
+    return 0 if best < args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,36 @@
 # main.py
 
+import argparse
 import logging
 import sys
 import tempfile
 from pathlib import Path
 
-from PyQt6.QtWidgets import QApplication
+from mcsas3gui.utils.startup_profile import StartupProfiler, span
 
-from mcsas3gui.gui.main_window import McSAS3MainWindow  # Main window with all tabs
-from mcsas3gui.utils.logging_config import setup_logging  # Import the logging configuration
+
+def parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(description="Graphical user interface for McSAS3.")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="time the imports, the tabs and the first paint of the startup, build the other"
+        " tabs too, write a report and a Chrome trace into DIR (the log directory by default),"
+        " then exit",
+    )
+    args, qt_args = parser.parse_known_args(argv[1:])  # the rest is for Qt
+    return args, argv[:1] + qt_args
 
 
 def main():
+    args, qt_argv = parse_args(sys.argv)
+    profiler = StartupProfiler().start() if args.profile_startup is not None else None
+    # imported after the profiler started, kernel_cache imports sasmodels
+    from mcsas3gui.utils.kernel_cache import configure_kernel_cache
+    from mcsas3gui.utils.logging_config import setup_logging
+
     # Create a temporary directory without automatic cleanup
     temp_dir = Path(tempfile.mkdtemp())
     log_file = temp_dir / "mcsas3_debug.log"
@@ -19,11 +38,35 @@ def main():
     logger = setup_logging(log_level=logging.INFO, log_file=log_file)
     logger.info("Starting McSAS3 GUI application...")
     logger.info(f"Logging to temporary directory at: {log_file}")
+    # Compiled model kernels are kept across sessions and shared with the worker processes
+    configure_kernel_cache()
+    # imported here for the startup profile to include them
+    from PyQt6.QtWidgets import QApplication
+
+    from mcsas3gui.gui.main_window import DEFERRED_TABS, McSAS3MainWindow
+
     # Start the PyQt application
-    app = QApplication(sys.argv)
+    with span("QApplication", "window"):
+        app = QApplication(qt_argv)
+
+    with span("McSAS3MainWindow", "window"):
+        main_window = McSAS3MainWindow(temp_dir)
+
+    if profiler is not None:
+
+        def finish_profile():
+            # the tabs built on first activation, one after the other
+            for name in DEFERRED_TABS:
+                main_window.tab(name)
+            profiler.stop()
+            report, trace = profiler.write(Path(args.profile_startup or temp_dir))
+            logger.info(f"Startup profile written to {report} and {trace}")
+            app.quit()
+
+        profiler.watch_first_paint(main_window, finish_profile)
 
-    main_window = McSAS3MainWindow(temp_dir)
-    main_window.show()
+    with span("show", "window"):
+        main_window.show()
 
     logger.debug("McSAS3 GUI is now visible.")
     sys.exit(app.exec())
@@ -0,0 +1,195 @@
+# src/mcsas3gui/gui/autotune_dialog.py
+
+import logging
+import os
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QDoubleSpinBox,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from ..utils.autotune import (
+    SWEEP_TIME_LIMIT,
+    parse_values,
+    projected_runtime,
+    recommend,
+    recommended_n_cores,
+    sweep_configs,
+)
+from ..utils.autotune_worker import AutotuneWorker
+
+logger = logging.getLogger("McSAS3")
+
+# default sweep ranges, as comma-separated values
+DEFAULT_RANGES = {"nContrib": "100, 200, 300", "convCrit": "1, 2", "maxAccept": "500, 1000"}
+
+
+class AutotuneDialog(QDialog):
+    """Dialog sweeping run configuration settings with short test optimizations on the test data."""
+
+    applySettings = pyqtSignal(dict)  # recommended settings to write into the run configuration
+
+    def __init__(self, run_config: dict, meas_data: dict, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Autotune Run Configuration")
+        self.setMinimumSize(800, 500)
+        self.run_config = run_config
+        self.meas_data = meas_data
+        self.results = []
+        self.recommendation = None
+        self.worker = None
+        layout = QVBoxLayout(self)
+
+        form = QFormLayout()
+        self.range_edits = {}
+        for key, default in DEFAULT_RANGES.items():
+            self.range_edits[key] = QLineEdit(default)
+            self.range_edits[key].setToolTip("Comma-separated values to try")
+            form.addRow(f"{key} values:", self.range_edits[key])
+        self.gof_target_spinbox = QDoubleSpinBox()
+        self.gof_target_spinbox.setRange(0.01, 1000)
+        self.gof_target_spinbox.setValue(float(run_config.get("convCrit", 1)))
+        form.addRow("GOF target:", self.gof_target_spinbox)
+        self.time_limit_spinbox = QDoubleSpinBox()
+        self.time_limit_spinbox.setRange(1, 3600)
+        self.time_limit_spinbox.setValue(SWEEP_TIME_LIMIT)
+        self.time_limit_spinbox.setSuffix(" s")
+        form.addRow("Time limit per run:", self.time_limit_spinbox)
+        layout.addLayout(form)
+
+        self.table = QTableWidget(0, 8)
+        self.table.setHorizontalHeaderLabels(
+            [
+                "nContrib",
+                "convCrit",
+                "maxAccept",
+                "Runtime (s)",
+                "Iterations",
+                "Accepted",
+                "Final GOF",
+                "Per File (s)",
+            ]
+        )
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.table)
+
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+        self.recommendation_label = QLabel()
+        self.recommendation_label.setWordWrap(True)
+        layout.addWidget(self.recommendation_label)
+
+        button_layout = QHBoxLayout()
+        self.run_button = QPushButton("Run Sweep")
+        self.run_button.clicked.connect(self.start_sweep)
+        self.apply_button = QPushButton("Apply Recommendation")
+        self.apply_button.setEnabled(False)
+        self.apply_button.clicked.connect(self.apply_recommendation)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.reject)
+        for button in (self.run_button, self.apply_button, close_button):
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+    @property
+    def n_rep(self) -> int:
+        return int(self.run_config.get("nRep", 1))
+
+    def start_sweep(self):
+        """Start the test optimizations of all combinations of the given values."""
+        try:
+            ranges = {key: parse_values(edit.text()) for key, edit in self.range_edits.items()}
+        except ValueError as e:
+            QMessageBox.warning(self, "Autotune", f"Invalid sweep values: {e}")
+            return
+        self.configs = sweep_configs(self.run_config, ranges)
+        self.n_cores = recommended_n_cores(self.n_rep)
+        self.table.setRowCount(len(self.configs))
+        for row, config in enumerate(self.configs):
+            for column, key in enumerate(("nContrib", "convCrit", "maxAccept")):
+                self.table.setItem(row, column, QTableWidgetItem(str(config.get(key, ""))))
+        self.results = []
+        self.recommendation = None
+        self.apply_button.setEnabled(False)
+        self.run_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.recommendation_label.setText(
+            f"Running {len(self.configs)} test optimizations on {os.cpu_count()} cores..."
+        )
+        self.worker = AutotuneWorker(
+            self.configs, self.meas_data, time_limit=self.time_limit_spinbox.value()
+        )
+        self.worker.progress_signal.connect(self.progress_bar.setValue)
+        self.worker.result_signal.connect(self.show_result)
+        self.worker.finished_signal.connect(self.sweep_finished)
+        self.worker.start()
+
+    def show_result(self, row: int, result):
+        """Fill in the measurements of a finished test optimization."""
+        if not result.ok:
+            item = QTableWidgetItem(f"Error: {result.error}")
+            item.setToolTip(result.error)
+            self.table.setItem(row, 3, item)
+            return
+        per_file = projected_runtime(result.runtime, self.n_rep, self.n_cores)
+        for column, text in enumerate(
+            (
+                f"{result.runtime:.2f}",
+                str(result.steps),
+                str(result.accepted),
+                f"{result.gof:.4g}",
+                f"{per_file:.1f}",
+            ),
+            start=3,
+        ):
+            self.table.setItem(row, column, QTableWidgetItem(text))
+
+    def sweep_finished(self, results: list):
+        """Recommend the fastest configuration reaching the GOF target."""
+        self.results = results
+        self.run_button.setEnabled(True)
+        self.recommendation = recommend(results, self.gof_target_spinbox.value())
+        if self.recommendation is None:
+            self.recommendation_label.setText(
+                "No configuration reached the GOF target. Try larger values or a higher target."
+            )
+            return
+        row = results.index(self.recommendation)
+        self.table.selectRow(row)
+        settings = ", ".join(f"{k}: {v}" for k, v in self.recommended_settings().items())
+        per_file = projected_runtime(self.recommendation.runtime, self.n_rep, self.n_cores)
+        self.recommendation_label.setText(
+            f"Recommended: {settings}. Expected time per file for {self.n_rep} repetitions:"
+            f" {per_file:.1f} s."
+        )
+        self.apply_button.setEnabled(True)
+
+    def recommended_settings(self) -> dict:
+        """Settings of the recommended configuration, including nCores."""
+        return {**self.recommendation.settings, "nCores": self.n_cores}
+
+    def apply_recommendation(self):
+        """Hand the recommended settings to the run configuration editor."""
+        if self.recommendation is not None:
+            self.applySettings.emit(self.recommended_settings())
+            self.accept()
+
+    def reject(self):
+        """Do not close while the sweep is running, its processes would be left behind."""
+        if self.worker is not None and self.worker.isRunning():
+            QMessageBox.information(self, "Autotune", "Please wait for the sweep to finish.")
+            return
+        super().reject()
@@ -3,19 +3,28 @@
 import logging
 from pathlib import Path
 
-import h5py
 import matplotlib.pyplot as plt
-import numpy as np
 import yaml
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from mcsas3.mc_data_1d import McData1D
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QTextCursor, QTextOption  # Import QTextOption for word wrapping
-from PyQt6.QtWidgets import QComboBox, QDialog, QLabel, QMessageBox, QTextEdit, QVBoxLayout, QWidget
-
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..utils.data_utils import load_mcdata_1d
 from ..utils.file_utils import get_default_config_files, get_main_path
+from ..utils.hdf5_utils import is_hdf5_file
 from ..utils.yaml_utils import load_yaml_file
 from .file_line_selection_widget import FileLineSelectionWidget
+from .hdf5_tree_widget import HDF5TreeWidget
 from .yaml_editor_widget import YAMLEditorWidget
 
 # from .drag_and_drop_mixin import DragAndDropMixin
@@ -34,7 +43,6 @@ class DataLoadingTab(QWidget):
         self.update_timer = QTimer(self)  # Timer for debouncing updates
         self.update_timer.setSingleShot(True)
         self.update_timer.timeout.connect(self.update_and_plot)  # Trigger plot after delay
-        self.pdi = []
         self.mds = None
 
         layout = QVBoxLayout()
@@ -69,6 +77,20 @@ class DataLoadingTab(QWidget):
 
         layout.addWidget(self.file_line_selection_widget)
 
+        # Structure browser for HDF5/NeXus files, clicking a dataset fills in the pathDict entry
+        self.hdf5_tree_label = QLabel("File structure (click a dataset to use it as):")
+        self.path_key_dropdown = QComboBox()
+        self.path_key_dropdown.addItems(["Q", "I", "ISigma"])
+        hdf5_tree_header = QHBoxLayout()
+        hdf5_tree_header.addWidget(self.hdf5_tree_label)
+        hdf5_tree_header.addWidget(self.path_key_dropdown)
+        hdf5_tree_header.addStretch()
+        layout.addLayout(hdf5_tree_header)
+        self.hdf5_tree = HDF5TreeWidget()
+        self.hdf5_tree.datasetSelected.connect(self.assign_dataset_path)
+        layout.addWidget(self.hdf5_tree)
+        self.show_hdf5_tree(False)
+
         # Error Message Display at the Bottom
         self.error_message_display = QTextEdit()
         self.error_message_display.setStyleSheet(
@@ -100,10 +122,6 @@ class DataLoadingTab(QWidget):
         # Optionally truncate the message if needed
         # message = message if len(message) <= 200 else message[:200] + "..."
         self.error_message_display.setText(message)
-        if len(self.pdi) > 0:
-            self.error_message_display.append(
-                f"Available datasets in file ({len(self.pdi)} found): \n" + "\n".join(self.pdi)
-            )
         self.error_message_display.moveCursor(QTextCursor.MoveOperation.Start)
         logger.error(message)
 
@@ -151,48 +169,48 @@ class DataLoadingTab(QWidget):
     def load_file(self, file_path: str):
         """Process the file after selection or drop."""
         if Path(file_path).exists():
-            self.pdi = []  # clear any previous information
             logger.debug(f"File loaded: {file_path}")
             self.selected_file = file_path
-            # Check for specific file types and list paths if applicable
-            if file_path.lower().endswith((".hdf5", ".h5", ".nxs")):
-                self.list_hdf5_paths_and_dimensions(file_path)
+            # Check for specific file types and show their structure if applicable
+            self.show_hdf5_tree(is_hdf5_file(file_path))
+            if is_hdf5_file(file_path):
+                try:
+                    self.hdf5_tree.set_file(file_path)
+                except Exception as e:
+                    self.display_error(f"Error reading HDF5 file: {e}. Verify the file structure.")
+            else:
+                self.hdf5_tree.clear_file()
             self.update_and_plot()
         else:
             logger.warning(f"File does not exist: {file_path}")
             QMessageBox.warning(self, "File Error", f"Cannot access file: {file_path}")
 
-    def list_hdf5_paths_and_dimensions(self, file_name: str) -> None:
-        """List paths and dimensions of datasets in an HDF5/Nexus file."""
-        self.error_message_display.clear()
+    def show_hdf5_tree(self, visible: bool) -> None:
+        """Show or hide the HDF5 structure browser and its controls."""
+        for widget in (self.hdf5_tree_label, self.path_key_dropdown, self.hdf5_tree):
+            widget.setVisible(visible)
+
+    def assign_dataset_path(self, hdf5_path: str) -> None:
+        """Set the selected pathDict entry in the YAML configuration to the given dataset."""
         try:
-            self.pdi = []
-            with h5py.File(file_name, "r") as hdf:
-
-                def _log_and_display_attrs(name: str, obj: h5py.HLObject) -> None:
-                    if isinstance(obj, h5py.Dataset):
-                        path_dim_info = f"Path: {name}, Shape: {obj.shape}"
-                        self.pdi += [path_dim_info]
-                        self.error_message_display.append(path_dim_info)
-                        logger.debug(path_dim_info)
-
-                hdf.visititems(_log_and_display_attrs)
-            # self.error_message_display.setText(f"Available datasets in file: \n {self.pdi}")
-            logger.debug(f"{self.pdi=}")
-        except Exception as e:
-            error_message = f"Error reading HDF5 file: {e}. Verify the file structure."
-            logger.error(error_message)
-            self.error_message_display.append(f"Error: {error_message}")
+            yaml_config = yaml.safe_load(self.yaml_editor_widget.yaml_editor.toPlainText()) or {}
+        except yaml.YAMLError as e:
+            self.display_error(f"YAML Error: {e}")
+            return
+        if not isinstance(yaml_config, dict):
+            self.display_error("Cannot set pathDict, the configuration is not a dictionary.")
+            return
+        key = self.path_key_dropdown.currentText()
+        yaml_config["pathDict"] = {**(yaml_config.get("pathDict") or {}), key: hdf5_path}
+        self.yaml_editor_widget.set_yaml_content(yaml_config)
+        # continue with the next key, so Q, I and ISigma can be clicked in sequence
+        next_index = (self.path_key_dropdown.currentIndex() + 1) % self.path_key_dropdown.count()
+        self.path_key_dropdown.setCurrentIndex(next_index)
 
     def update_and_plot(self):
         """Load and plot the data file using the current YAML configuration."""
         # Clear any previous error message
-        if len(self.pdi) > 0:
-            self.error_message_display.setText(
-                f"Available datasets in file ({len(self.pdi)} found): \n" + "\n".join(self.pdi)
-            )
-        else:
-            self.error_message_display.setText("")
+        self.error_message_display.setText("")
 
         file_path = self.file_line_selection_widget.get_file_path()  # self.file_path_line.text()
         if not file_path:
@@ -210,16 +228,7 @@ class DataLoadingTab(QWidget):
 
         # Load data and update the plot
         try:
-            self.mds = McData1D(
-                filename=Path(file_path),
-                nbins=int(yaml_config.get("nbins", 100)),
-                csvargs=yaml_config.get("csvargs", {}),
-                pathDict=yaml_config.get("pathDict", None),
-                IEmin=float(yaml_config.get("IEmin", 0.01)),
-                dataRange=yaml_config.get("dataRange", [-np.inf, np.inf]),
-                omitQRanges=yaml_config.get("omitQRanges", []),
-                resultIndex=int(yaml_config.get("resultIndex", 1)),
-            )
+            self.mds = load_mcdata_1d(file_path, yaml_config)
             logger.debug(f"Loaded data file: {file_path}")
             self.show_plot_popup()  # Display the plot in a popup window
         except Exception as e:
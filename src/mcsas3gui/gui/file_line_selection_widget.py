@@ -6,6 +6,8 @@ from pathlib import Path
 from PyQt6.QtCore import Qt, pyqtSignal  # , QDragEnterEvent, QDropEvent, Qt
 from PyQt6.QtWidgets import QFileDialog, QHBoxLayout, QLineEdit, QPushButton, QWidget
 
+from ..utils.campaign_container import split_address
+
 logger = logging.getLogger("McSAS3")
 
 
@@ -43,7 +45,7 @@ class FilePathLineEdit(QLineEdit):
         """Handle manual entry of file paths and emit signal on Enter."""
         if event.key() == Qt.Key.Key_Return:
             file_path = self.text()
-            if Path(file_path).exists():
+            if split_address(file_path)[0].exists():  # also a sample in a campaign container
                 self.fileChanged.emit(file_path)  # Emit signal with entered file path
             else:
                 logger.warning(f"Entered file does not exist: {file_path}")
@@ -35,7 +35,7 @@ class FileSelectionWidget(QWidget):
         layout.addWidget(QLabel(title))
 
         # File Table
-        self.file_table = QTableWidget(0, 2)
+        self.file_table = QTableWidget(0, 3)
         self.file_table.setStyleSheet(
             """
             QTableWidget, QTableView, QTableWidget::item {
@@ -56,9 +56,10 @@ class FileSelectionWidget(QWidget):
             """
         )
 
-        self.file_table.setHorizontalHeaderLabels(["File Name", "Status"])
+        self.file_table.setHorizontalHeaderLabels(["File Name", "Status", "Info"])
         self.file_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.file_table.setColumnWidth(1, 150)  # Set fixed width for status column
+        self.file_table.setColumnWidth(2, 250)  # details, such as pre-flight check results
         self.file_table.setAcceptDrops(True)
         self.file_table.viewport().installEventFilter(self)
         self.file_table.setDragEnabled(True)
@@ -100,6 +101,7 @@ class FileSelectionWidget(QWidget):
             status_item = QTableWidgetItem("Pending")
             status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             self.file_table.setItem(row_position, 1, status_item)
+            self.file_table.setItem(row_position, 2, QTableWidgetItem(""))
 
             logger.debug(f"Added file to table: {file_name}")
 
@@ -128,6 +130,12 @@ class FileSelectionWidget(QWidget):
             self.file_table.item(row, 1).setText(status)
             return
 
+    def set_info_by_row(self, row: int, info: str = "", tooltip: str | None = None):
+        """Set the details shown for a specific file, with an optional tooltip."""
+        item = self.file_table.item(row, 2)
+        item.setText(info)
+        item.setToolTip(tooltip or info)
+
     def set_status_by_file_name(self, file_path: str | Path, status: str = "Pending"):
         """Set the status for a specific file."""
         if isinstance(file_path, Path):
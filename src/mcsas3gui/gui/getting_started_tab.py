@@ -5,6 +5,7 @@ from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QComboBox, QLabel, QTextBrowser, QVBoxLayout, QWidget
 
 from mcsas3gui.utils.file_utils import get_default_config_files, get_main_path
+from mcsas3gui.utils.startup_profile import span
 from mcsas3gui.utils.yaml_utils import load_yaml_file
 
 from .yaml_editor_widget import CustomDumper
@@ -12,6 +13,15 @@ from .yaml_editor_widget import CustomDumper
 CustomDumper.add_representer(dict, CustomDumper.represent_dict)
 CustomDumper.add_representer(list, CustomDumper.represent_list)
 
+# the tabs a template applies to, in the order it is applied to them
+TAB_NAMES = (
+    "data_loading_tab",
+    "run_settings_tab",
+    "hist_settings_tab",
+    "optimization_tab",
+    "histogramming_tab",
+)
+
 
 def write_yaml_file(data, filepath):
     with open(filepath, "w", encoding="utf-8") as f:
@@ -49,6 +59,7 @@ def write_hist_yaml_block(hist_configs, filepath):
 
 class GettingStartedTab(QWidget):
     _temp_dir = None  # stores sub-configurations extracted from prefab config files
+    _template = None  # the loaded template, applied to each tab once it is built
 
     def __init__(
         self,
@@ -190,70 +201,77 @@ class GettingStartedTab(QWidget):
 
         selected_file = self.config_dropdown.currentText()
         if selected_file:
-            try:
-                yaml_content = self.load_template(self.config_path / selected_file)
-                self.info_viewer.setHtml(
-                    yaml_content.get("html_description", "<p>No description available.</p>")
-                )
-
-                # Apply data reading settings
-                file_dict = yaml_content.get("configurations", {})
-                if self.data_loading_tab and "read_configuration_file" in file_dict:
-                    self.apply_yaml_to_tab_pulldown(
-                        self.data_loading_tab, file_dict["read_configuration_file"]
+            with span(f"load_selected_default_config {selected_file}", "template"):
+                try:
+                    yaml_content = self.load_template(self.config_path / selected_file)
+                    self.info_viewer.setHtml(
+                        yaml_content.get("html_description", "<p>No description available.</p>")
                     )
-                    self.optimization_tab.data_config_selector.set_file_path(
-                        str((self.main_path / file_dict["read_configuration_file"]).as_posix())
+                except Exception as e:
+                    self.info_viewer.setHtml(f"<p>Error loading template: {e}</p>")
+                    return
+                self._template = yaml_content
+                # tabs not built yet get the template once they are, see apply_template
+                for tab_name in TAB_NAMES:
+                    if getattr(self, tab_name):
+                        self.apply_template(tab_name)
+
+    def apply_template(self, tab_name: str):
+        """Apply the settings and files of the loaded template to one of the other tabs."""
+        tab = getattr(self, tab_name)
+        if tab is None or self._template is None:
+            return
+        file_dict = self._template.get("configurations", {})
+        data_files = self._template.get("data_files", {})
+        try:
+            if tab_name == "data_loading_tab":
+                # Apply data reading settings
+                if "read_configuration_file" in file_dict:
+                    self.apply_yaml_to_tab_pulldown(tab, file_dict["read_configuration_file"])
+                if "read_test_file" in data_files:
+                    tab.file_line_selection_widget.set_file_path(
+                        str(self.main_path / data_files["read_test_file"])
                     )
 
+            elif tab_name == "run_settings_tab":
                 # Apply run settings
-                if self.run_settings_tab and "run_configuration_file" in file_dict:
-                    self.apply_yaml_to_tab_pulldown(
-                        self.run_settings_tab, file_dict["run_configuration_file"]
-                    )
-                    self.optimization_tab.run_config_selector.set_file_path(
-                        str((self.main_path / file_dict["run_configuration_file"]).as_posix())
-                    )
+                if "run_configuration_file" in file_dict:
+                    self.apply_yaml_to_tab_pulldown(tab, file_dict["run_configuration_file"])
 
+            elif tab_name == "hist_settings_tab":
                 # Apply hist settings
-                if self.hist_settings_tab and "hist_configuration_file" in file_dict:
-                    self.apply_yaml_to_tab_pulldown(
-                        self.hist_settings_tab, file_dict["hist_configuration_file"]
-                    )
-                    self.histogramming_tab.histogram_config_selector.set_file_path(
-                        str((self.main_path / file_dict["hist_configuration_file"]).as_posix())
+                if "hist_configuration_file" in file_dict:
+                    self.apply_yaml_to_tab_pulldown(tab, file_dict["hist_configuration_file"])
+                if "histogramming_test_file" in data_files:
+                    # does not show as it doesn't exist.. unfortunately
+                    tab.test_file_selector.set_file_path(
+                        str(self.main_path / data_files["histogramming_test_file"])
                     )
 
-                # set data files for the tabs:
-                yaml_content = yaml_content.get("data_files", {})
-                if self.data_loading_tab and "read_test_file" in yaml_content:
-                    self.data_loading_tab.file_line_selection_widget.set_file_path(
-                        str(self.main_path / yaml_content["read_test_file"])
+            elif tab_name == "optimization_tab":
+                if "read_configuration_file" in file_dict:
+                    tab.data_config_selector.set_file_path(
+                        str((self.main_path / file_dict["read_configuration_file"]).as_posix())
                     )
-
-                if (
-                    self.hist_settings_tab and "histogramming_test_file" in yaml_content
-                ):  # does not show as it doesn't exist.. unfortunately
-                    self.hist_settings_tab.test_file_selector.set_file_path(
-                        str(self.main_path / yaml_content["histogramming_test_file"])
+                if "run_configuration_file" in file_dict:
+                    tab.run_config_selector.set_file_path(
+                        str((self.main_path / file_dict["run_configuration_file"]).as_posix())
                     )
+                # Lastly, fill the files into the optimization tab
+                for file_path in data_files.get("optimization_files", []):
+                    tab.file_selection_widget.add_file_to_table(str(self.main_path / file_path))
 
-                # Lastly, fill the files into the optimization tab and histogramming run tab
-                if self.optimization_tab and "optimization_files" in yaml_content:
-                    for file_path in yaml_content["optimization_files"]:
-                        self.optimization_tab.file_selection_widget.add_file_to_table(
-                            str(self.main_path / file_path)
-                        )
-
-                # Lastly, fill the files into the optimization tab and histogramming run tab
-                if self.histogramming_tab and "histogramming_files" in yaml_content:
-                    for file_path in yaml_content["histogramming_files"]:
-                        self.histogramming_tab.file_selection_widget.add_file_to_table(
-                            str(self.main_path / file_path)
-                        )
+            elif tab_name == "histogramming_tab":
+                if "hist_configuration_file" in file_dict:
+                    tab.histogram_config_selector.set_file_path(
+                        str((self.main_path / file_dict["hist_configuration_file"]).as_posix())
+                    )
+                # and into the histogramming run tab
+                for file_path in data_files.get("histogramming_files", []):
+                    tab.file_selection_widget.add_file_to_table(str(self.main_path / file_path))
 
-            except Exception as e:
-                self.info_viewer.setHtml(f"<p>Error loading template: {e}</p>")
+        except Exception as e:
+            self.info_viewer.setHtml(f"<p>Error loading template: {e}</p>")
 
     def handle_dropdown_change(self, index: int):
         # selected_text = self.config_dropdown.itemText(index)
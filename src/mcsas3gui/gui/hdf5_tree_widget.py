@@ -0,0 +1,78 @@
+# src/gui/hdf5_tree_widget.py
+
+import logging
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import QHeaderView, QTreeWidget, QTreeWidgetItem
+
+from ..utils.hdf5_utils import list_hdf5_group
+
+logger = logging.getLogger("McSAS3")
+
+PATH_ROLE = Qt.ItemDataRole.UserRole  # absolute HDF5 path of an item
+POPULATED_ROLE = Qt.ItemDataRole.UserRole + 1  # True once the children of a group were added
+
+
+class HDF5TreeWidget(QTreeWidget):
+    """Browser for the structure of an HDF5/NeXus file, groups are only read when expanded."""
+
+    datasetSelected = pyqtSignal(str)  # Signal emitted with the HDF5 path of a clicked dataset
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_name = None
+        self.setHeaderLabels(["Name", "Shape", "Type"])
+        self.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.setStyleSheet(
+            """
+            QTreeWidget {
+                background-color: palette(base);
+                color: palette(text);
+            }
+            """
+        )
+        self.itemExpanded.connect(self.populate_item)
+        self.itemClicked.connect(self._emit_dataset_selected)
+
+    def set_file(self, file_name: str | Path) -> None:
+        """Show the top level of the given file, deeper levels are read on demand."""
+        self.clear()
+        self.file_name = str(file_name)
+        self._add_children(self.invisibleRootItem(), "/")
+
+    def clear_file(self) -> None:
+        """Remove the shown file structure."""
+        self.clear()
+        self.file_name = None
+
+    def populate_item(self, item: QTreeWidgetItem) -> None:
+        """Add the children of a group item when it is expanded for the first time."""
+        if item.data(0, POPULATED_ROLE) is not False:
+            return  # a dataset, or a group which was populated already
+        item.setData(0, POPULATED_ROLE, True)
+        try:
+            self._add_children(item, item.data(0, PATH_ROLE))
+        except Exception as e:
+            logger.error(f"Error reading group {item.data(0, PATH_ROLE)} of {self.file_name}: {e}")
+
+    def _add_children(self, parent_item: QTreeWidgetItem, group_path: str) -> None:
+        for node in list_hdf5_group(self.file_name, group_path):
+            if node.is_group:
+                item = QTreeWidgetItem([node.name, f"{node.n_children} members", "group"])
+                item.setData(0, POPULATED_ROLE, False)
+                item.setChildIndicatorPolicy(
+                    QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator
+                    if node.n_children
+                    else QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator
+                )
+            else:
+                item = QTreeWidgetItem([node.name, str(node.shape), node.dtype])
+                item.setToolTip(0, node.path)
+            item.setData(0, PATH_ROLE, node.path)
+            parent_item.addChild(item)
+
+    def _emit_dataset_selected(self, item: QTreeWidgetItem, column: int) -> None:
+        if item.data(0, POPULATED_ROLE) is None:  # datasets carry no populated flag
+            logger.debug(f"Dataset selected: {item.data(0, PATH_ROLE)}")
+            self.datasetSelected.emit(item.data(0, PATH_ROLE))
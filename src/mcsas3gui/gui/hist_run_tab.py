@@ -1,13 +1,30 @@
 # src/gui/hist_run_tab.py
 
 import logging
-import sys
 from pathlib import Path
 
-from PyQt6.QtWidgets import QMessageBox, QProgressBar, QPushButton, QVBoxLayout, QWidget
-
-from ..utils.file_utils import make_out_path
+import yaml
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..utils.campaign_container import container_samples, is_container, split_address
+from ..utils.campaign_table_worker import CampaignTableWorker
+from ..utils.histogram_batch_worker import HistogramBatchWorker, ResultCardWorker
+from ..utils.histogramming import result_card_path
+from ..utils.rehistogramming import RESULT_CARD_FORMATS
+from ..utils.result_reader import parse_result_indices
 from ..utils.task_runner_mixin import TaskRunnerMixin
+from ..utils.yaml_utils import load_yaml_file
 from .file_line_selection_widget import FileLineSelectionWidget
 from .file_selection_widget import FileSelectionWidget
 
@@ -41,11 +58,48 @@ class HistRunTab(QWidget, TaskRunnerMixin):
 
         layout.addWidget(self.histogram_config_selector)
 
+        # Results to histogram per file, and the result cards rendered after the histograms are
+        # stored, at low priority
+        card_layout = QHBoxLayout()
+        card_layout.addWidget(QLabel("Result indices:"))
+        self.result_indices_edit = QLineEdit("1")
+        self.result_indices_edit.setToolTip(
+            "Results in each file to histogram, e.g. 1,2 or 1-3. All results of a file are"
+            " histogrammed in one pass over the file."
+        )
+        card_layout.addWidget(self.result_indices_edit)
+        card_layout.addWidget(QLabel("Result cards:"))
+        self.result_card_combo = QComboBox()
+        self.result_card_combo.addItems([*(f.upper() for f in RESULT_CARD_FORMATS), "None"])
+        self.result_card_combo.setToolTip(
+            "Rendering the result cards takes longer than histogramming. The histograms are"
+            " stored first, the cards are rendered afterwards in the background."
+        )
+        card_layout.addWidget(self.result_card_combo)
+        card_layout.addStretch()
+        layout.addLayout(card_layout)
+        self.card_worker = ResultCardWorker()
+        self.card_worker.rendered_signal.connect(self.result_card_rendered)
+        self._card_format = None
+        self._result_indices = [1]
+        self._row_cards = {}  # table row -> [status, cards pending, cards failed]
+
         # Run button
         self.run_button = QPushButton("Run Histogramming")
         self.run_button.clicked.connect(self.run_histogramming)
         layout.addWidget(self.run_button)
 
+        # Campaign table, updated after each run once chosen
+        self.campaign_button = QPushButton("Update Campaign Table...")
+        self.campaign_button.setToolTip(
+            "Collect the population statistics of the selected files into one table, one row"
+            " per file and histogram range. The table is updated after each run from then on."
+        )
+        self.campaign_button.clicked.connect(self.choose_campaign_table)
+        layout.addWidget(self.campaign_button)
+        self._campaign_table = None
+        self.campaign_worker = None
+
         # Progress bar
         self.progress_bar = QProgressBar()
         layout.addWidget(self.progress_bar)
@@ -63,28 +117,121 @@ class HistRunTab(QWidget, TaskRunnerMixin):
             logger.warning(f"File does not exist: {file_path}")
             QMessageBox.warning(self, "File Error", f"Cannot access file: {file_path}")
 
-    def run_histogramming(self):
-        """Run histogramming on the selected files."""
+    def expand_containers(self):
+        """Replace campaign containers in the table by their samples, to histogram each."""
+        table = self.file_selection_widget.file_table
+        for row, file_name in reversed(
+            list(enumerate(self.file_selection_widget.get_selected_files()))
+        ):
+            if split_address(file_name)[1] is None and is_container(file_name):
+                table.removeRow(row)
+                for address in container_samples(file_name).values():
+                    self.file_selection_widget.add_file_to_table(address)
 
+    def run_histogramming(self):
+        """
+        Histogram the selected files in parallel in the background, storing the histograms in
+        each file like the McSAS3 command line histogrammer. The result cards are rendered
+        afterwards, one after another at low priority, if at all.
+        """
+        self.expand_containers()
         files = self.file_selection_widget.get_selected_files()
+        if not files:
+            QMessageBox.warning(self, "Run Histogramming", "No files selected.")
+            return
         hist_config = self.histogram_config_selector.get_file_path()
-
-        command_template = (
-            str(Path(sys.executable).as_posix())
-            + " -m mcsas3.mcsas3_cli_histogrammer -r {input_file} -H {hist_config} -i 1"
+        if not hist_config or not Path(hist_config).is_file():
+            QMessageBox.warning(
+                self, "Run Histogramming", "Please select a histogramming configuration file."
+            )
+            return
+        try:
+            hist_ranges = load_yaml_file(hist_config)
+        except yaml.YAMLError as e:
+            QMessageBox.critical(self, "Run Histogramming", f"Cannot read {hist_config}: {e}")
+            return
+        if isinstance(hist_ranges, dict):  # a single histogram range
+            hist_ranges = [hist_ranges]
+        try:
+            self._result_indices = parse_result_indices(self.result_indices_edit.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Run Histogramming", str(e))
+            return
+        card_format = self.result_card_combo.currentText().lower()
+        self._card_format = card_format if card_format in RESULT_CARD_FORMATS else None
+        self._task_files = files
+        worker = HistogramBatchWorker(
+            files, hist_ranges, self._result_indices, result_cards=self._card_format is not None
         )
-
-        files_in_out = {infn: make_out_path(infn, self._temp_dir) for infn in files}
-        extra_keywords = {"hist_config": hist_config}
-        self.run_tasks(files_in_out, command_template, extra_keywords)
-
-        # selected_files = self.file_selection_widget.get_selected_files()
-        # if not selected_files:
-        #     QMessageBox.warning(self, "Run Histogramming", "No files selected.")
-        #     return
-
-        # for idx, file in enumerate(selected_files):
-        #     # Placeholder: Update status dynamically and handle subprocess calls
-        #     self.file_selection_widget.set_status_by_file_name(file, "Processing")
-        #     self.progress_bar.setValue(int((idx + 1) / len(selected_files) * 100))
-        #     self.file_selection_widget.set_status_by_file_name(file, "Complete")
+        worker.analysis_signal.connect(self.queue_result_card)
+        self.start_worker(worker, len(files))
+
+    def update_file_status(self, row, status):
+        self._row_cards[self._task_rows[row]] = [status, 0, 0]
+        super().update_file_status(row, status)
+
+    def queue_result_card(self, row, result_index, analysis):
+        """Render the result card of a histogrammed result once nothing else is to be done."""
+        if self._card_format is None:
+            return
+        table_row = self._task_rows[row]
+        cards = self._row_cards[table_row]
+        cards[1] += 1
+        self.file_selection_widget.set_status_by_row(table_row, f"{cards[0]}, rendering cards")
+        path = result_card_path(self._task_files[row], self._card_format, result_index)
+        self.card_worker.add(table_row, analysis, path)
+
+    def result_card_rendered(self, table_row, error: str):
+        cards = self._row_cards[table_row]
+        cards[1] -= 1
+        cards[2] += bool(error)
+        if not cards[1]:
+            status = cards[0] + (f", {cards[2]} cards failed" if cards[2] else "")
+            self.file_selection_widget.set_status_by_row(table_row, status)
+
+    def tasks_finished(self):
+        """Re-enable the run button once the histograms are stored, and update the campaign."""
+        self.run_button.setEnabled(True)
+        if self._campaign_table is not None:
+            self.update_campaign_table(self._task_files)
+        message = "All tasks are complete."
+        if self.card_worker.pending or self.card_worker.isRunning():
+            message = "All histograms are stored, the result cards are rendered in the background."
+        QMessageBox.information(self, "Run Histogramming", message)
+
+    def choose_campaign_table(self):
+        """Select the campaign table, new or existing, and add the selected files to it."""
+        default_path = self._campaign_table or self.last_used_directory / "campaign.h5"
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Campaign Table",
+            str(default_path),
+            "HDF5 Table (*.h5 *.hdf5);;Parquet Table (*.parquet)",
+            options=QFileDialog.Option.DontConfirmOverwrite,  # existing tables are updated
+        )
+        if not file_name:
+            return
+        self._campaign_table = Path(file_name)
+        self.update_campaign_table(self.file_selection_widget.get_selected_files())
+
+    def update_campaign_table(self, files):
+        """Add the statistics of new and changed files to the campaign table, in the background."""
+        if not files or (self.campaign_worker is not None and self.campaign_worker.isRunning()):
+            return
+        self.campaign_button.setEnabled(False)
+        self.campaign_worker = CampaignTableWorker(
+            self._campaign_table, files, self._result_indices
+        )
+        self.campaign_worker.finished_signal.connect(self.campaign_table_updated)
+        self.campaign_worker.start()
+
+    def campaign_table_updated(self, update, error: str):
+        self.campaign_button.setEnabled(True)
+        if error:
+            QMessageBox.warning(self, "Campaign Table", f"Could not update the table: {error}")
+            return
+        message = update.summary()
+        if update.errors:
+            message += "\n\n" + "\n".join(f"{f}: {e}" for f, e in update.errors.items())
+        logger.info(message)
+        QMessageBox.information(self, "Campaign Table", f"{self._campaign_table}\n{message}")
@@ -1,14 +1,18 @@
 import logging
-import os
-import subprocess
-import sys
+import time
 from pathlib import Path
-from sys import platform
 from tempfile import gettempdir
 
 import yaml
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QInputDialog,
     QLabel,
     QMessageBox,
     QPushButton,
@@ -17,7 +21,15 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from ..utils.campaign_container import (
+    container_samples,
+    is_container,
+    result_exists,
+    split_address,
+)
 from ..utils.file_utils import get_default_config_files, get_main_path
+from ..utils.histogram_worker import HistogramWorker
+from ..utils.histogramming import render_result_card, result_card_path, save_result_card
 from .file_line_selection_widget import FileLineSelectionWidget
 from .yaml_editor_widget import YAMLEditorWidget
 
@@ -64,10 +76,37 @@ class HistogramSettingsTab(QWidget):
         self.test_file_selector.fileSelected.connect(self.load_test_file)
         layout.addWidget(self.test_file_selector)
 
-        # Test Button
+        # Test Button, the result file is read once into the result cache and histogrammed in
+        # memory in the background
+        self.hist_worker = None
+        self._test_analysis = None  # HistogramAnalysis shown in the canvas
+        self._pending_test = False
+        test_layout = QHBoxLayout()
         test_button = QPushButton("Test Histogramming")
         test_button.clicked.connect(self.test_histogramming)
-        layout.addWidget(test_button)
+        test_layout.addWidget(test_button)
+        self.live_update_checkbox = QCheckBox("Update while editing")
+        self.live_update_checkbox.setToolTip(
+            "Histogram the test file again after each change of the configuration"
+        )
+        self.live_update_checkbox.setChecked(True)
+        test_layout.addWidget(self.live_update_checkbox)
+        self.export_button = QPushButton("Export PDF...")
+        self.export_button.setToolTip("Save the result card shown below as PDF or PNG")
+        self.export_button.clicked.connect(self.export_result_card)
+        self.export_button.setEnabled(False)
+        test_layout.addWidget(self.export_button)
+        layout.addLayout(test_layout)
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(500)
+        self.update_timer.timeout.connect(self.test_histogramming)
+
+        # Result card of the test histogramming
+        self.figure = Figure(figsize=(12, 5))
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setMinimumHeight(350)
+        layout.addWidget(self.canvas)
 
         # Information Output
         self.info_field = QTextEdit()
@@ -91,12 +130,27 @@ class HistogramSettingsTab(QWidget):
             self.load_selected_default_config()
 
     def load_test_file(self, file_path: str):
-        """Process the file after selection or drop."""
-        if Path(file_path).exists():
+        """
+        Process the file after selection or drop. For a campaign container, one of its samples
+        is selected as the test file, addressed as <container>::<sample>.
+        """
+        if split_address(file_path)[1] is None and is_container(file_path):
+            samples = list(container_samples(file_path).values())
+            if not samples:
+                QMessageBox.warning(self, "File Error", f"No samples in container: {file_path}")
+                return
+            file_path, ok = QInputDialog.getItem(
+                self, "Campaign Container", "Sample to test with:", samples, 0, False
+            )
+            if not ok:
+                return
+        if result_exists(file_path):
             self.pdi = []  # clear any previous information
             logger.debug(f"File loaded: {file_path}")
             self.selected_file = file_path
             self.test_file_selector.set_file_path(self.selected_file)
+            self._test_analysis = None
+            self.export_button.setEnabled(False)
         else:
             logger.warning(f"File does not exist: {file_path}")
             QMessageBox.warning(self, "File Error", f"Cannot access file: {file_path}")
@@ -154,84 +208,63 @@ class HistogramSettingsTab(QWidget):
             return
         if self.config_dropdown.currentText() != "<Custom...>":
             self.config_dropdown.setCurrentText("<Custom...>")
+        if self._test_analysis is not None and self.live_update_checkbox.isChecked():
+            self.update_timer.start()
 
     def test_histogramming(self):
-        """Execute a histogramming test with the current settings and selected data file."""
+        """Histogram the selected test file with the current settings, in the background."""
         test_file = self.test_file_selector.get_file_path()
+        if not test_file or not result_exists(test_file):
+            QMessageBox.warning(self, "Error", "Please select a valid test data file.")
+            return
+        hist_ranges = self.yaml_editor_widget.get_yaml_content()
+        if not hist_ranges or not all(isinstance(doc, dict) for doc in hist_ranges):
+            self.info_field.setPlainText("Please configure histogramming settings.")
+            return
+        if self.hist_worker is not None and self.hist_worker.isRunning():
+            self._pending_test = True  # histogram again with the latest settings when done
+            return
 
-        try:
-            if not test_file or not Path(test_file).exists():
-                QMessageBox.warning(self, "Error", "Please select a valid test data file.")
-                return
-
-            yaml_content = self.yaml_editor_widget.get_yaml_content()
-            if not yaml_content:
-                QMessageBox.warning(self, "Error", "Please configure histogramming settings.")
-                return
-
-            # Store the yaml content in a temporary file
-            yaml_file = Path(gettempdir()) / "hist_config_temp_ui.yaml"
-            with open(yaml_file, "w") as file:
-                yaml.dump_all(
-                    yaml_content, file, default_flow_style=False
-                )  # Use dump_all for multi-document YAML
-
-            logger.debug("Launching histogramming test.")
-            self.info_field.append("Launching histogramming test...")
-
-            # Construct the command
-            command = [
-                str(Path(sys.executable).as_posix()),
-                "-m",
-                "mcsas3.mcsas3_cli_histogrammer",
-                "-r",
-                test_file,
-                "-H",
-                str(yaml_file),
-                "-i",
-                "1",
-                # "-v", "-d"
-            ]
-
-            # Specify the working directory (replace 'desired_directory' with the actual path)
-            working_directory = Path(".").resolve()  # Set the directory where the script exists
-
-            # log the exectued command
-            logger.info(f"Running command: \n{command}")
-
-            # log the working directory
-            logger.debug(f"Working directory is {working_directory}.")
-
-            # Execute the command
-            result = subprocess.run(
-                command,
-                cwd=working_directory,  # Run the command from the specified directory
-                capture_output=True,  # Capture stdout and stderr
-                text=True,  # Decode output as text
+        if self._test_analysis is None:
+            self.info_field.setPlainText(f"Loading {test_file} ...")
+        self._test_started = time.perf_counter()
+        self.hist_worker = HistogramWorker(test_file, hist_ranges)
+        self.hist_worker.finished_signal.connect(self.histogramming_finished)
+        self.hist_worker.start()
+
+    def histogramming_finished(self, analysis, error: str):
+        """Show the result card of the test histogramming in the embedded canvas."""
+        if error:
+            self.info_field.setPlainText(f"Error during histogramming test: {error}")
+        else:
+            # only the histograms changed since the last test are drawn again
+            render_result_card(self.figure, analysis, self._test_analysis)
+            self._test_analysis = analysis
+            self.export_button.setEnabled(True)
+            self.canvas.draw_idle()
+            self.info_field.setPlainText(
+                f"Histogrammed {analysis.n_repetitions} repetitions in"
+                f" {time.perf_counter() - self._test_started:.2f} s.\n\n"
+                + "\n".join(analysis.population_report(i) for i in range(len(analysis.histograms)))
             )
+        if self._pending_test:
+            self._pending_test = False
+            self.test_histogramming()
 
-            # Handle the output
-            if result.returncode == 0:
-                self.info_field.append(f"Command executed successfully: \n{result.stdout}")
-                logger.debug(f"Command output: \n{result.stdout}")
-            else:
-                self.info_field.append(f"Command failed with error: \n{result.stderr}")
-                logger.error(f"Command error: \n{result.stderr}")
-
-            # Clean up the temporary file
-            yaml_file.unlink()
-            logger.debug("Temporary config file deleted.")
-            logger.debug("Opening PDF")
-
-            if "darwin" in platform.lower():  # macOS
-                subprocess.Popen([f"open {Path(test_file).with_suffix('.pdf')}"], shell=True)
-            elif "win" in platform.lower():  # Windows
-                pdf_file = str(Path(test_file).with_suffix(".pdf").as_posix())
-                logging.info(f"Showing PDF histogram in {pdf_file}")
-                os.startfile(pdf_file)  # Open the PDF file
-            else:  # linux variants
-                subprocess.Popen([f"xdg-open {Path(test_file).with_suffix('.pdf')}"], shell=True)
-
+    def export_result_card(self):
+        """Save the result card of the last test, by default next to the test file."""
+        if self._test_analysis is None:
+            return
+        default_path = result_card_path(self.test_file_selector.get_file_path(), "pdf")
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Export Result Card", str(default_path), "PDF Files (*.pdf);;PNG Files (*.png)"
+        )
+        if not file_name:
+            return
+        try:
+            save_result_card(self._test_analysis, file_name)
         except Exception as e:
-            logger.error(f"Error during histogramming test: {e}")
-            QMessageBox.critical(self, "Error", f"Error during histogramming test: {e}")
+            logger.error(f"Could not export the result card to {file_name}: {e}")
+            QMessageBox.critical(self, "Error", f"Could not export the result card: {e}")
+            return
+        self.info_field.append(f"Result card exported to {file_name}")
@@ -0,0 +1,121 @@
+# src/mcsas3gui/gui/kernel_cache_dialog.py
+
+import logging
+
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from ..utils.kernel_cache import (
+    cache_entries,
+    evict,
+    kernel_cache_dir,
+    remove_stale_caches,
+    stale_cache_dirs,
+)
+
+logger = logging.getLogger("McSAS3")
+
+
+def format_size(n_bytes: int) -> str:
+    """Human readable file size."""
+    for unit in ("B", "KiB", "MiB"):
+        if n_bytes < 1024:
+            return f"{n_bytes:.0f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} GiB"
+
+
+class KernelCacheDialog(QDialog):
+    """Dialog showing the compiled model kernels in the cache, with options to remove them."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Compiled Model Kernel Cache")
+        self.setMinimumSize(600, 400)
+        layout = QVBoxLayout(self)
+
+        self.location_label = QLabel(f"Location: {kernel_cache_dir()}")
+        self.location_label.setWordWrap(True)
+        layout.addWidget(self.location_label)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Model", "Precision", "Size", "Last Used"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setColumnWidth(0, 200)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        remove_button = QPushButton("Remove Selected")
+        remove_button.clicked.connect(self.remove_selected)
+        clear_button = QPushButton("Clear All")
+        clear_button.clicked.connect(self.clear_all)
+        self.stale_button = QPushButton("Remove Old Versions")
+        self.stale_button.setToolTip("Remove kernels compiled by other sasmodels versions")
+        self.stale_button.clicked.connect(self.remove_stale)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        for button in (remove_button, clear_button, self.stale_button, close_button):
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        """Reload the cache contents into the table."""
+        self.entries = cache_entries()
+        self.table.setRowCount(len(self.entries))
+        for row, entry in enumerate(self.entries):
+            for column, text in enumerate(
+                (
+                    entry.model,
+                    entry.precision,
+                    format_size(entry.size),
+                    f"{entry.last_used:%Y-%m-%d %H:%M}",
+                )
+            ):
+                item = QTableWidgetItem(text)
+                item.setToolTip(str(entry.path))
+                self.table.setItem(row, column, item)
+        total = sum(entry.size for entry in self.entries)
+        self.status_label.setText(f"{len(self.entries)} compiled kernels, {format_size(total)}")
+        n_stale = len(stale_cache_dirs())
+        self.stale_button.setEnabled(n_stale > 0)
+        self.stale_button.setText(f"Remove Old Versions ({n_stale})")
+
+    def remove_selected(self):
+        """Remove the kernels of the selected rows, they are recompiled when needed."""
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        freed = evict([self.entries[row] for row in rows])
+        logger.info(f"Removed {len(rows)} compiled kernels, {format_size(freed)} freed.")
+        self.refresh()
+
+    def clear_all(self):
+        """Remove all kernels of the current sasmodels version."""
+        reply = QMessageBox.question(
+            self,
+            "Clear Kernel Cache",
+            "Remove all compiled model kernels? They are recompiled when needed.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            freed = evict(self.entries)
+            logger.info(f"Kernel cache cleared, {format_size(freed)} freed.")
+            self.refresh()
+
+    def remove_stale(self):
+        """Remove the cache directories of other sasmodels versions."""
+        remove_stale_caches()
+        self.refresh()
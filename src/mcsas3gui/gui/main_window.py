@@ -3,18 +3,29 @@
 # import inspect
 from pathlib import Path
 
-from PyQt6.QtWidgets import QMainWindow, QTabWidget
+from PyQt6.QtWidgets import QMainWindow, QTabWidget, QVBoxLayout, QWidget
+
+from mcsas3gui.utils.startup_profile import span
 
-from .data_loading_tab import DataLoadingTab
 from .getting_started_tab import GettingStartedTab
-from .hist_run_tab import HistRunTab
-from .hist_settings_tab import HistogramSettingsTab
-from .optimization_tab import OptimizationRunTab
-from .run_settings_tab import RunSettingsTab  # Import the new RunSettingsTab
+
+# the tabs after the getting started tab, in the order they are shown, built on first activation
+DEFERRED_TABS = {
+    "data_loading_tab": "Data Settings",
+    "run_settings_tab": "Run Settings",
+    "optimization_tab": "McSAS3 Optimization ...",
+    "hist_settings_tab": "Histogram Settings",
+    "histogramming_tab": "(Re-)Histogramming ...",
+}
 
 
 class McSAS3MainWindow(QMainWindow):
-    """Main window for the McSAS3 GUI application, containing all tabs."""
+    """
+    Main window for the McSAS3 GUI application, containing all tabs.
+
+    Only the getting started tab is built on startup. The other tabs, and the scientific modules
+    they import, are built when a tab is first shown or needed by another tab.
+    """
 
     # use inspect to find main path for this package
 
@@ -22,6 +33,10 @@ class McSAS3MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("McSAS3 Configuration Interface")
         self.setGeometry(100, 100, 800, 600)
+        self.temp_dir = temp_dir
+        self._built = {}  # tab name -> tab, once built
+        self._placeholders = {}  # tab name -> page in the tab widget the tab is built into
+        self._pending_paths = {}  # (tab name, selector) -> file saved before the tab was built
 
         # Main tab widget
         self.tabs = QTabWidget()
@@ -31,37 +46,90 @@ class McSAS3MainWindow(QMainWindow):
         self.setup_tabs(temp_dir)
 
     def setup_tabs(self, temp_dir: Path):
-        GSTab = GettingStartedTab(self, temp_dir=temp_dir)
+        with span("getting_started_tab", "tab"):
+            self.GSTab = GettingStartedTab(self, temp_dir=temp_dir)
+        self.tabs.addTab(self.GSTab, "Getting Started")
+        for name, title in DEFERRED_TABS.items():
+            placeholder = QWidget()
+            layout = QVBoxLayout(placeholder)
+            layout.setContentsMargins(0, 0, 0, 0)
+            self._placeholders[name] = placeholder
+            self.tabs.addTab(placeholder, title)
+        self.tabs.currentChanged.connect(self._build_current_tab)
+
+    def _build_current_tab(self, index: int):
+        for name, placeholder in self._placeholders.items():
+            if self.tabs.widget(index) is placeholder:
+                self.tab(name)
+
+    def tab(self, name: str) -> QWidget:
+        """The tab of the given name, e.g. 'run_settings_tab', building it if not done yet."""
+        if name not in self._built:
+            # tabs it depends on are built first, from within the builder
+            with span(name, "tab"):
+                tab = getattr(self, f"_build_{name}")()
+            self._built[name] = tab
+            self._placeholders[name].layout().addWidget(tab)
+            # connect the tab to the getting started tab, and apply the selected template
+            setattr(self.GSTab, name, tab)
+            with span(f"apply template to {name}", "template"):
+                self.GSTab.apply_template(name)
+            for selector, path in list(self._pending_paths.items()):
+                if selector[0] == name:
+                    getattr(tab, selector[1]).set_file_path(self._pending_paths.pop(selector))
+        return self._built[name]
+
+    def _set_file_path(self, name: str, selector: str, path: str):
+        """Set a file selector of a tab, or remember the file until the tab is built."""
+        if name in self._built:
+            getattr(self._built[name], selector).set_file_path(path)
+        else:
+            self._pending_paths[(name, selector)] = path
+
+    def _build_data_loading_tab(self):
+        from .data_loading_tab import DataLoadingTab
+
         DLTab = DataLoadingTab(self)
-        RSTab = RunSettingsTab(self, DLTab, temp_dir=temp_dir)
-        HSTab = HistogramSettingsTab(self)
-        HRTab = HistRunTab(self, HSTab, temp_dir=temp_dir)
-        ORTab = OptimizationRunTab(self, DLTab, RSTab, HSTab, HRTab, temp_dir=temp_dir)
-        self.tabs.addTab(GSTab, "Getting Started")
-        self.tabs.addTab(DLTab, "Data Settings")
-        self.tabs.addTab(RSTab, "Run Settings")
-        self.tabs.addTab(ORTab, "McSAS3 Optimization ...")
-        self.tabs.addTab(HSTab, "Histogram Settings")
-        self.tabs.addTab(HRTab, "(Re-)Histogramming ...")
-
-        # connect the tabs to the getting started tab:
-        GSTab.data_loading_tab = DLTab
-        GSTab.run_settings_tab = RSTab
-        GSTab.optimization_tab = ORTab
-        GSTab.hist_settings_tab = HSTab
-        GSTab.histogramming_tab = HRTab
-        # re-trigger the dropdowns in the getting started tab
-        GSTab.refresh_config_dropdown(savedName="getting_started.yaml")
-
-        # make some signal connections we can't seem to do anywhere else:
-        # when a histogram file is saved in the hist settings tab,
-        # set this to the current file in the hist run tab
-        HSTab.yaml_editor_widget.fileSaved.connect(HRTab.histogram_config_selector.set_file_path)
         # when a data load settigns file is saved in the data settings tab,
         # set this to the current file in the optimization run tab
         DLTab.yaml_editor_widget.fileSaved.connect(
-            ORTab.data_config_selector.set_file_path
-        )  # Handle file save
+            lambda path: self._set_file_path("optimization_tab", "data_config_selector", path)
+        )
+        return DLTab
+
+    def _build_run_settings_tab(self):
+        from .run_settings_tab import RunSettingsTab
+
+        RSTab = RunSettingsTab(self, self.tab("data_loading_tab"), temp_dir=self.temp_dir)
         RSTab.yaml_editor_widget.fileSaved.connect(
-            ORTab.run_config_selector.set_file_path
-        )  # Handle file save
+            lambda path: self._set_file_path("optimization_tab", "run_config_selector", path)
+        )
+        return RSTab
+
+    def _build_hist_settings_tab(self):
+        from .hist_settings_tab import HistogramSettingsTab
+
+        HSTab = HistogramSettingsTab(self)
+        # when a histogram file is saved in the hist settings tab,
+        # set this to the current file in the hist run tab
+        HSTab.yaml_editor_widget.fileSaved.connect(
+            lambda path: self._set_file_path("histogramming_tab", "histogram_config_selector", path)
+        )
+        return HSTab
+
+    def _build_histogramming_tab(self):
+        from .hist_run_tab import HistRunTab
+
+        return HistRunTab(self, self.tab("hist_settings_tab"), temp_dir=self.temp_dir)
+
+    def _build_optimization_tab(self):
+        from .optimization_tab import OptimizationRunTab
+
+        return OptimizationRunTab(
+            self,
+            self.tab("data_loading_tab"),
+            self.tab("run_settings_tab"),
+            self.tab("hist_settings_tab"),
+            self.tab("histogramming_tab"),
+            temp_dir=self.temp_dir,
+        )
@@ -0,0 +1,45 @@
+# src/mcsas3gui/gui/model_comparison_dialog.py
+
+import math
+from pathlib import Path
+
+import pandas
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+
+class ModelComparisonDialog(QDialog):
+    """Table of GOF and runtime per input file and run configuration of a comparison batch."""
+
+    def __init__(self, table: pandas.DataFrame, summary_file: Path | None = None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Model Comparison")
+        self.setMinimumSize(700, 300)
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(len(table.index), len(table.columns))
+        self.table.setHorizontalHeaderLabels(
+            [f"{run_config}\n{quantity}" for run_config, quantity in table.columns]
+        )
+        self.table.setVerticalHeaderLabels([str(index) for index in table.index])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        for row, values in enumerate(table.itertuples(index=False)):
+            for column, value in enumerate(values):
+                text = "failed" if math.isnan(value) else f"{value:.4g}"
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.table.resizeColumnsToContents()
+        layout.addWidget(self.table)
+        if summary_file is not None:
+            summary_label = QLabel(f"Stored in: {summary_file}")
+            summary_label.setWordWrap(True)
+            layout.addWidget(summary_label)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
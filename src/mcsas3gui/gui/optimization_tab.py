@@ -1,13 +1,57 @@
 import logging
+import math
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 
-from PyQt6.QtWidgets import QMessageBox, QProgressBar, QPushButton, QVBoxLayout, QWidget
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
 
+from ..utils.campaign_container import sample_names
+from ..utils.container_writer_worker import ContainerWriterWorker
+from ..utils.data_utils import mcdata_kwargs
 from ..utils.file_utils import make_out_path
+from ..utils.model_comparison import (
+    evaluate_cell,
+    matrix_tasks,
+    run_config_tags,
+    summary_table,
+    write_summary,
+)
+from ..utils.preflight_worker import PreflightWorker
+from ..utils.prepared_data import load_stats
+from ..utils.result_reader import (
+    format_result_indices,
+    index_status,
+    optimized_result_indices,
+    parse_result_indices,
+)
+from ..utils.runtime_estimate import (
+    estimate_batch,
+    format_duration,
+    load_corrections,
+    record_actual_runtime,
+)
+from ..utils.runtime_estimate_worker import CalibrationWorker
+from ..utils.staging import SCRATCH_ENV, SCRATCH_LIMIT_ENV, scratch_config
 from ..utils.task_runner_mixin import TaskRunnerMixin
+from ..utils.yaml_utils import load_yaml_file
 from .file_line_selection_widget import FileLineSelectionWidget
 from .file_selection_widget import FileSelectionWidget
+from .model_comparison_dialog import ModelComparisonDialog
 
 logger = logging.getLogger("McSAS3")
 
@@ -68,10 +112,80 @@ class OptimizationRunTab(QWidget, TaskRunnerMixin):
 
         layout.addWidget(self.run_config_selector)
 
+        # Further run configurations to compare: each file is optimized with each configuration
+        self._matrix_tasks = None
+        self.compare_configs_widget = FileSelectionWidget(
+            title="Compare with further Run Configurations (optional):",
+            acceptable_file_types="*.yaml",
+            last_used_directory=self.last_used_directory,
+        )
+        layout.addWidget(self.compare_configs_widget)
+
+        # Results to optimize into per file, all in one job per file with the data prepared once
+        indices_layout = QHBoxLayout()
+        indices_layout.addWidget(QLabel("Result indices:"))
+        self.result_indices_edit = QLineEdit("1")
+        self.result_indices_edit.setToolTip(
+            "Results in each result file to optimize, e.g. 1,2 or 1-3. Each result is optimized"
+            " independently with the run configuration."
+        )
+        indices_layout.addWidget(self.result_indices_edit)
+        layout.addLayout(indices_layout)
+        self._result_indices = [1]
+
+        # Results are written next to each input file, or collected into a campaign container
+        # with one group per sample, by a single writer as the optimizations finish
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(QLabel("Output:"))
+        self.output_combo = QComboBox()
+        self.output_combo.addItems(["One file per input", "Campaign container..."])
+        self.output_combo.activated.connect(self.choose_output)
+        output_layout.addWidget(self.output_combo)
+        output_layout.addWidget(QLabel("Samples per shard:"))
+        self.shard_size_spinbox = QSpinBox()
+        self.shard_size_spinbox.setRange(0, 1_000_000)
+        self.shard_size_spinbox.setSpecialValueText("No shards")
+        self.shard_size_spinbox.setToolTip(
+            "Spread the samples over container files of at most this many samples each"
+        )
+        self.shard_size_spinbox.setEnabled(False)
+        output_layout.addWidget(self.shard_size_spinbox)
+        # Jobs run on a copy of their input on node-local scratch, results are published only
+        # when complete, so no partial result files end up on (network) storage
+        self.staging_checkbox = QCheckBox("Stage on local scratch")
+        self.staging_checkbox.setToolTip(
+            f"{scratch_config().summary()}. Set {SCRATCH_ENV} and {SCRATCH_LIMIT_ENV} to change."
+        )
+        output_layout.addWidget(self.staging_checkbox)
+        layout.addLayout(output_layout)
+        self._container_path = None
+        self.container_worker = None
+        self._task_status = {}  # last status of each task, before it was written to the container
+
         # Progress and Run Controls
         self.progress_bar = QProgressBar()
         layout.addWidget(self.progress_bar)
 
+        # Check that all files load with the data configuration, also done before every run
+        check_layout = QHBoxLayout()
+        self.preflight_button = QPushButton("Pre-flight Check")
+        self.preflight_button.clicked.connect(lambda: self.start_preflight())
+        check_layout.addWidget(self.preflight_button)
+
+        # Predict the runtime of the batch from short timed optimizations
+        self.batch_estimate = None
+        self.estimate_button = QPushButton("Estimate Runtime")
+        self.estimate_button.setToolTip(
+            "Time a short optimization per distinct data size, and extrapolate to the selected"
+            " files with maxIter, nRep and nCores of the run configuration"
+        )
+        self.estimate_button.clicked.connect(self.start_estimate)
+        check_layout.addWidget(self.estimate_button)
+        layout.addLayout(check_layout)
+        self.estimate_label = QLabel()
+        self.estimate_label.setWordWrap(True)
+        layout.addWidget(self.estimate_label)
+
         self.run_button = QPushButton("Run McSAS3 Optimization ...")
         self.run_button.clicked.connect(self.start_optimizations)
         layout.addWidget(self.run_button)
@@ -100,25 +214,383 @@ class OptimizationRunTab(QWidget, TaskRunnerMixin):
             logger.warning(f"File does not exist: {file_path}")
             QMessageBox.warning(self, "File Error", f"Cannot access file: {file_path}")
 
+    def choose_output(self, index: int):
+        """Select the campaign container to write into, new or existing."""
+        self._container_path = None
+        if index == 1:
+            file_name, _ = QFileDialog.getSaveFileName(
+                self,
+                "Campaign Container",
+                str(self.last_used_directory / "campaign.h5"),
+                "HDF5 Container (*.h5 *.hdf5)",
+                options=QFileDialog.Option.DontConfirmOverwrite,  # samples are added to it
+            )
+            if file_name:
+                self._container_path = Path(file_name)
+        self.output_combo.setCurrentIndex(1 if self._container_path else 0)
+        container_text = "Campaign container..."
+        if self._container_path:
+            container_text = f"Campaign container: {self._container_path.name}"
+        self.output_combo.setItemText(1, container_text)
+        self.output_combo.setToolTip(str(self._container_path or ""))
+        self.shard_size_spinbox.setEnabled(self._container_path is not None)
+
     def _set_expected_output(self, outpath):
         if self.hist_settings_tab:
             self.hist_settings_tab.test_file_selector.set_file_path(str(outpath))
         if self.histogramming_tab:
             self.histogramming_tab.file_selection_widget.add_file_to_table(str(outpath))
 
-    def start_optimizations(self):
+    def start_preflight(self, on_finished=None):
+        """Load all files with the selected data configuration in parallel worker processes."""
         files = self.file_selection_widget.get_selected_files()
+        if not files:
+            QMessageBox.warning(self, "Pre-flight Check", "No files selected.")
+            return
         data_config = self.data_config_selector.get_file_path()
+        if not data_config or not Path(data_config).is_file():
+            QMessageBox.warning(
+                self, "Pre-flight Check", "Please select a valid data load configuration file."
+            )
+            return
+
+        self.preflight_worker = PreflightWorker(files, load_yaml_file(data_config))
+        self.preflight_worker.progress_signal.connect(self.update_progress)
+        self.preflight_worker.result_signal.connect(self.show_preflight_result)
+        self.preflight_worker.finished_signal.connect(on_finished or self.preflight_finished)
+
+        self.run_button.setEnabled(False)
+        self.preflight_button.setEnabled(False)
+        self.estimate_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.preflight_worker.start()
+
+    def show_preflight_result(self, row, result):
+        """Show the pre-flight result of a single file in the table."""
+        self.file_selection_widget.set_status_by_row(
+            row, "Pre-flight OK" if result.ok else "Pre-flight Failed"
+        )
+        self.file_selection_widget.set_info_by_row(row, result.summary())
+
+    def preflight_finished(self, results):
+        """Re-enable the buttons and summarize a stand-alone pre-flight check."""
+        self.run_button.setEnabled(True)
+        self.preflight_button.setEnabled(True)
+        self.estimate_button.setEnabled(True)
+        failed = sum(not result.ok for result in results)
+        QMessageBox.information(
+            self,
+            "Pre-flight Check",
+            f"{len(results) - failed} of {len(results)} files load with the data configuration.",
+        )
+
+    def start_estimate(self):
+        """Run the pre-flight check first, its data sizes determine the calibrations needed."""
         run_config = self.run_config_selector.get_file_path()
+        if not run_config or not Path(run_config).is_file():
+            QMessageBox.warning(
+                self, "Estimate Runtime", "Please select a valid run configuration file."
+            )
+            return
+        self.start_preflight(on_finished=self.calibrate_after_preflight)
+
+    def calibrate_after_preflight(self, results):
+        """Time a short optimization on one file of each distinct data size."""
+        self.preflight_button.setEnabled(True)
+        self.run_button.setEnabled(True)
+        self.estimate_button.setEnabled(True)
+        files = self.preflight_worker.files
+        # the pre-flight check does not rebin, the optimization runs on the rebinned data
+        nbins = mcdata_kwargs(self.preflight_worker.read_config)["nbins"]
+        self._estimate_shapes = {
+            file_name: result.n_binned(nbins)
+            for file_name, result in zip(files, results)
+            if result.ok
+        }
+        if not self._estimate_shapes:
+            self.estimate_label.setText("No file loads with the data configuration.")
+            return
+        representatives = {}
+        for file_name, shape in self._estimate_shapes.items():
+            representatives.setdefault(shape, file_name)
+        self._estimate_run_config = load_yaml_file(self.run_config_selector.get_file_path())
+
+        self.calibration_worker = CalibrationWorker(
+            representatives, self.preflight_worker.read_config, self._estimate_run_config
+        )
+        self.calibration_worker.progress_signal.connect(self.update_progress)
+        self.calibration_worker.finished_signal.connect(self.calibration_finished)
+        self.run_button.setEnabled(False)
+        self.preflight_button.setEnabled(False)
+        self.estimate_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.estimate_label.setText(
+            f"Timing test optimizations for {len(representatives)} distinct data sizes..."
+        )
+        self.calibration_worker.start()
+
+    def calibration_finished(self, calibrations, error):
+        """Extrapolate the calibrations to the batch and show the estimate."""
+        self.run_button.setEnabled(True)
+        self.preflight_button.setEnabled(True)
+        self.estimate_button.setEnabled(True)
+        if error:
+            self.batch_estimate = None
+            self.estimate_label.setText(f"Runtime estimate failed: {error}")
+            return
+        try:  # each result index is optimized on its own
+            n_results = len(parse_result_indices(self.result_indices_edit.text()))
+        except ValueError:
+            n_results = 1
+        self.batch_estimate = estimate_batch(
+            calibrations,
+            self._estimate_shapes,
+            self._estimate_run_config,
+            load_corrections(),
+            n_results,
+        )
+        self.estimate_label.setText(self.batch_estimate.summary())
+
+    def start_optimizations(self):
+        """Run the pre-flight check first, the optimizations start when it has passed."""
+        try:
+            self._result_indices = parse_result_indices(self.result_indices_edit.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Run Optimization", str(e))
+            return
+        self.start_preflight(on_finished=self.run_after_preflight)
+
+    def run_after_preflight(self, results):
+        """Start the optimizations for the files which passed, after confirmation on failures."""
+        self.run_button.setEnabled(True)
+        self.preflight_button.setEnabled(True)
+        self.estimate_button.setEnabled(True)
+        files = self.preflight_worker.files
+        rows = [row for row, result in enumerate(results) if result.ok]
+        if len(results) != len(files):
+            QMessageBox.critical(
+                self, "Pre-flight Check", "The pre-flight check was aborted, see the log."
+            )
+            return
+        if not rows:
+            QMessageBox.critical(
+                self,
+                "Pre-flight Check",
+                "No files could be loaded with the data configuration, see the table for details.",
+            )
+            return
+        if len(rows) < len(files):
+            answer = QMessageBox.question(
+                self,
+                "Pre-flight Check",
+                f"{len(files) - len(rows)} of {len(files)} files failed to load with the data"
+                " configuration, see the table for details.\n\n"
+                f"Run the optimization for the remaining {len(rows)} files?",
+            )
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+        self.run_optimizations([files[row] for row in rows], rows)
 
-        command_template = (
+    def _command_template(self) -> str:
+        return (
             str(Path(sys.executable).as_posix())
             + " "
-            "-m mcsas3.mcsas3_cli_runner -f {input_file} -F {data_config} "
-            "-r {result_file} -R {run_config} -i 1 -d"
+            "-m mcsas3gui.utils.optimization_runner -f {input_file} -F {data_config} "
+            "-r {result_file} -R {run_config} -i {result_indices} -s {source_file} -d"
+        )
+
+    def run_optimizations(self, files, rows=None):
+        data_config = self.data_config_selector.get_file_path()
+        run_config = self.run_config_selector.get_file_path()
+        run_configs = [run_config] + [
+            str(compare_config)
+            for compare_config in self.compare_configs_widget.get_selected_files()
+            if str(compare_config) != run_config
+        ]
+        if len(run_configs) > 1:
+            self.run_comparison(files, run_configs, rows)
+            return
+
+        command_template = self._command_template()
+        self._matrix_tasks = None
+        self.container_worker = None
+        if self._container_path:
+            # the jobs write into local scratch files, moved into the container when finished
+            self._task_samples = sample_names(files)
+            scratch_dir = self._temp_dir / "container_scratch"
+            scratch_dir.mkdir(exist_ok=True)
+            files_in_out = {
+                infn: scratch_dir / f"{sample}_output.hdf5"
+                for infn, sample in zip(files, self._task_samples)
+            }
+            try:
+                self.container_worker = ContainerWriterWorker(
+                    self._container_path, self.shard_size_spinbox.value()
+                )
+            except (OSError, ValueError) as e:
+                QMessageBox.critical(self, "Campaign Container", str(e))
+                return
+            self.container_worker.written_signal.connect(self.sample_written)
+            self._container_forwarded = False
+            self._container_queued = 0  # results queued for the container, and written so far
+            self._container_written = 0
+            self._finish_after_container = False
+        else:
+            files_in_out = {infn: make_out_path(infn, self._temp_dir) for infn in files}
+            self._set_expected_output(list(files_in_out.values())[0])  # forward the first output
+        extra_keywords = {
+            "data_config": data_config,
+            "run_config": run_config,
+            "result_indices": format_result_indices(self._result_indices),
+        }
+        self._task_outputs = list(files_in_out.values())
+        self._run_started = time.monotonic()
+        self._run_files = list(files)
+        self._run_config = load_yaml_file(run_config)
+        self._run_store_stats = load_stats()
+        self.run_tasks(
+            files_in_out, command_template, extra_keywords, rows, scratch=self._scratch_config()
+        )
+
+    def run_comparison(self, files, run_configs, rows=None):
+        """Optimize each file with each run configuration, into separate result files."""
+        self.container_worker = None  # comparisons are evaluated from the separate files
+        try:
+            self._matrix_tasks = matrix_tasks(files, run_configs, self._temp_dir)
+        except ValueError as e:
+            QMessageBox.critical(self, "Compare Run Configurations", str(e))
+            return
+        self._matrix_outcomes = {}
+        file_rows = dict(zip(files, rows if rows is not None else range(len(files))))
+        self._set_expected_output(self._matrix_tasks[0][2])
+        self._run_started = time.monotonic()
+        self._run_files = list(files)
+        self._run_config = None  # the runtime estimate is made for a single run configuration
+        self._run_store_stats = load_stats()
+        logger.info(
+            f"Comparing {len(run_configs)} run configurations on {len(files)} files:"
+            f" {len(self._matrix_tasks)} optimizations"
+        )
+        self.run_tasks(
+            [(input_file, result_file) for input_file, _, result_file in self._matrix_tasks],
+            self._command_template(),
+            {
+                "data_config": self.data_config_selector.get_file_path(),
+                "result_indices": format_result_indices(self._result_indices),
+            },
+            [file_rows[input_file] for input_file, _, _ in self._matrix_tasks],
+            [{"run_config": run_config} for _, run_config, _ in self._matrix_tasks],
+            scratch=self._scratch_config(),
+        )
+
+    def _scratch_config(self):
+        """Where to stage the jobs, None to run them in place."""
+        return scratch_config() if self.staging_checkbox.isChecked() else None
+
+    def update_file_status(self, row, status):
+        """Show which run configuration the status refers to, when comparing several."""
+        self._task_status[row] = status
+        if self._matrix_tasks:
+            tags = run_config_tags([run_config for _, run_config, _ in self._matrix_tasks])
+            status = f"{tags[Path(self._matrix_tasks[row][1])]}: {status}"
+        super().update_file_status(row, status)
+
+    def task_done(self, task, success, runtime):
+        """
+        Note the outcome of each optimization of a comparison, and show which results were
+        optimized when several result indices are processed per file.
+        """
+        if self._matrix_tasks:
+            self._matrix_outcomes[task] = (success, runtime)
+        result_file = (
+            self._matrix_tasks[task][2] if self._matrix_tasks else self._task_outputs[task]
+        )
+        if not success:  # the status shows the failure, the result file is not trusted
+            return
+        optimized = self._result_indices
+        if len(self._result_indices) > 1:
+            try:
+                optimized = optimized_result_indices(result_file)
+            except OSError:  # not even the result file was written
+                optimized = []
+            status = index_status({i: i in optimized for i in self._result_indices})
+            self.update_file_status(task, status)
+        if self.container_worker is not None and optimized:
+            self._container_queued += 1
+            self.container_worker.add(task, result_file, self._task_samples[task])
+
+    def sample_written(self, task, address: str, error: str):
+        """
+        Note that a result is in the campaign container, and forward the first one. Once the
+        last one is written after the tasks finished, the batch is complete.
+        """
+        self._container_written += 1
+        status = self._task_status.get(task, "Complete")
+        if error:
+            logger.error(f"Could not write {self._task_samples[task]} to the container: {error}")
+            self.update_file_status(task, f"{status}, not in container")
+        else:
+            self.update_file_status(task, f"{status}, in container")
+            if not self._container_forwarded:
+                self._container_forwarded = True
+                self._set_expected_output(address)
+        if self._finish_after_container and self._container_written == self._container_queued:
+            self._finish_after_container = False
+            super().tasks_finished()
+
+    def show_comparison(self):
+        """Summarize GOF and runtime of each optimization of a comparison."""
+        cells = [
+            evaluate_cell(
+                input_file,
+                run_config,
+                result_file,
+                *self._matrix_outcomes.get(task, (False, math.nan)),
+            )
+            for task, (input_file, run_config, result_file) in enumerate(self._matrix_tasks)
+        ]
+        summary_file = (
+            self._matrix_tasks[0][2].parent / f"model_comparison_{datetime.now():%Y%m%d_%H%M%S}.csv"
         )
+        try:
+            write_summary(cells, summary_file)
+        except OSError as e:
+            logger.warning(f"Could not store the model comparison summary: {e}")
+            summary_file = None
+        self.comparison_dialog = ModelComparisonDialog(summary_table(cells), summary_file, self)
+        self.comparison_dialog.show()
 
-        files_in_out = {infn: make_out_path(infn, self._temp_dir) for infn in files}
-        self._set_expected_output(list(files_in_out.values())[0])  # forward the first output file
-        extra_keywords = {"data_config": data_config, "run_config": run_config}
-        self.run_tasks(files_in_out, command_template, extra_keywords)
+    def tasks_finished(self):
+        """
+        Compare the runtime with the estimate, so that later estimates improve, and report the
+        reuse of prepared data in this batch.
+        """
+        store_stats = load_stats() - self._run_store_stats
+        logger.info(f"{store_stats.summary()} in this batch.")
+        self.estimate_label.setText(f"{store_stats.summary()} in this batch.")
+        if self._matrix_tasks:
+            self.show_comparison()
+        estimate = self.batch_estimate
+        if (
+            estimate is not None
+            and self._run_config == self._estimate_run_config
+            and len(self._result_indices) == estimate.n_results
+            and all(file_name in estimate.file_times for file_name in self._run_files)
+        ):
+            actual = time.monotonic() - self._run_started
+            predicted = estimate.predicted(self._run_files)
+            record_actual_runtime(str(self._run_config.get("modelName")), predicted, actual)
+            self.estimate_label.setText(
+                f"Last batch took {format_duration(actual)}, estimated"
+                f" {format_duration(predicted * estimate.correction)}."
+                f" {store_stats.summary()} in this batch."
+            )
+            self.batch_estimate = None  # the correction has changed
+        if (
+            self.container_worker is not None
+            and self._container_written < self._container_queued
+        ):
+            # the batch is complete once the last results are in the container, see sample_written
+            self._finish_after_container = True
+            return
+        super().tasks_finished()
@@ -0,0 +1,147 @@
+# src/mcsas3gui/gui/precision_dialog.py
+
+import logging
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QDialog,
+    QDoubleSpinBox,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from ..utils.precision import (
+    PRECISION_TEST_ITERATIONS,
+    PRECISION_TOLERANCE,
+    recommend_precision,
+)
+from ..utils.precision_worker import PrecisionWorker
+
+logger = logging.getLogger("McSAS3")
+
+
+class PrecisionDialog(QDialog):
+    """Dialog comparing accuracy and speed of the model in single and double precision."""
+
+    applySettings = pyqtSignal(dict)  # recommended modelDType to write into the run configuration
+
+    def __init__(self, run_config: dict, meas_data: dict, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Model Precision")
+        self.setMinimumSize(600, 350)
+        self.run_config = run_config
+        self.meas_data = meas_data
+        self.recommendation = None
+        self.worker = None
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(
+            QLabel(
+                f"Model: {run_config.get('modelName')}, current modelDType:"
+                f" {run_config.get('modelDType', 'fast (McSAS3 default)')}"
+            )
+        )
+        form = QFormLayout()
+        self.tolerance_spinbox = QDoubleSpinBox()
+        self.tolerance_spinbox.setDecimals(6)
+        self.tolerance_spinbox.setRange(1e-6, 1)
+        self.tolerance_spinbox.setSingleStep(1e-4)
+        self.tolerance_spinbox.setValue(PRECISION_TOLERANCE)
+        self.tolerance_spinbox.setToolTip(
+            "Acceptable relative deviation of the model intensity from double precision"
+        )
+        self.tolerance_spinbox.valueChanged.connect(self.update_recommendation)
+        form.addRow("Relative error tolerance:", self.tolerance_spinbox)
+        self.auto_apply_checkbox = QCheckBox("Apply the recommendation when done")
+        form.addRow(self.auto_apply_checkbox)
+        layout.addLayout(form)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(
+            ["modelDType", "Max. Rel. Error", f"Time for {PRECISION_TEST_ITERATIONS} Steps (s)", ""]
+        )
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.run_button = QPushButton("Compare")
+        self.run_button.clicked.connect(self.start_comparison)
+        self.apply_button = QPushButton("Apply Recommendation")
+        self.apply_button.setEnabled(False)
+        self.apply_button.clicked.connect(self.apply_recommendation)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.reject)
+        for button in (self.run_button, self.apply_button, close_button):
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+        self.results = []
+
+    def start_comparison(self):
+        """Evaluate and time the model in each dtype in the background."""
+        self.run_button.setEnabled(False)
+        self.apply_button.setEnabled(False)
+        self.status_label.setText("Comparing precisions, this includes compiling the kernels...")
+        self.worker = PrecisionWorker(self.meas_data, self.run_config)
+        self.worker.finished_signal.connect(self.comparison_finished)
+        self.worker.start()
+
+    def comparison_finished(self, results: list, error: str):
+        """Show the comparison and recommend a dtype."""
+        self.run_button.setEnabled(True)
+        self.results = results
+        if error:
+            self.status_label.setText(f"Comparison failed: {error}")
+            return
+        reference = next((r.runtime for r in results if r.dtype == "double" and r.ok), None)
+        self.table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            if result.ok:
+                speedup = f"{reference / result.runtime:.2f}x speed" if reference else ""
+                texts = (result.dtype, f"{result.max_rel_error:.2g}", f"{result.runtime:.2f}")
+                texts += (speedup,)
+            else:
+                texts = (result.dtype, "", "", f"Error: {result.error}")
+            for column, text in enumerate(texts):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.update_recommendation()
+        if self.auto_apply_checkbox.isChecked():
+            self.apply_recommendation()
+
+    def update_recommendation(self):
+        """Recommend the fastest dtype within the tolerance."""
+        if not self.results:
+            return
+        self.recommendation = recommend_precision(self.results, self.tolerance_spinbox.value())
+        if self.recommendation is None:
+            self.status_label.setText("No dtype is within the tolerance.")
+            self.apply_button.setEnabled(False)
+            return
+        self.table.selectRow(self.results.index(self.recommendation))
+        self.status_label.setText(f"Recommended modelDType: {self.recommendation.dtype}")
+        self.apply_button.setEnabled(True)
+
+    def apply_recommendation(self):
+        """Hand the recommended dtype to the run configuration editor."""
+        if self.recommendation is not None:
+            self.applySettings.emit({"modelDType": self.recommendation.dtype})
+            self.accept()
+
+    def reject(self):
+        """Do not close while the comparison is running, its process would be left behind."""
+        if self.worker is not None and self.worker.isRunning():
+            QMessageBox.information(self, "Model Precision", "Please wait for the comparison.")
+            return
+        super().reject()
@@ -1,18 +1,41 @@
 import logging
-import re
+from datetime import datetime
 from pathlib import Path
 from typing import Sequence
 
-import h5py
 from matplotlib import pyplot as plt
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from mcsas3.mc_hat import McHat
+from mcsas3.mc_model import McModel
+from mcsas3.mc_opt import McOpt
 from PyQt6.QtCore import QTimer
-from PyQt6.QtWidgets import QComboBox, QDialog, QLabel, QPushButton, QTextEdit, QVBoxLayout, QWidget
-from sasmodels.core import load_model_info
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
 
 from ..utils.file_utils import get_default_config_files, get_main_path
+from ..utils.gof_plateau import PLATEAU_WINDOW, detect_plateau
+from ..utils.kernel_cache_worker import KernelPrecompileWorker
+from ..utils.model_registry import completion_words, model_parameters
+from ..utils.single_repetition import (
+    PREVIEW_FACTOR,
+    PREVIEW_TIME_LIMIT,
+    preview_config,
+    thin_meas_data,
+)
+from ..utils.single_repetition_worker import SingleRepetitionWorker
 from ..utils.yaml_utils import load_yaml_file
+from .autotune_dialog import AutotuneDialog
+from .kernel_cache_dialog import KernelCacheDialog
+from .precision_dialog import PrecisionDialog
 from .yaml_editor_widget import YAMLEditorWidget
 
 logger = logging.getLogger("McSAS3")
@@ -55,10 +78,76 @@ class RunSettingsTab(QWidget):
             self.refresh_config_dropdown
         )  # Refresh dropdown after save
 
-        # Test Run Button
-        test_run_button = QPushButton("Test single repetition on loaded Test Data")
-        test_run_button.clicked.connect(self.run_test_optimization)
-        layout.addWidget(test_run_button)
+        # Test Run Button, the test runs in a separate process and can be cancelled
+        self.test_worker = None
+        self._test_conv_crit = McOpt.convCrit
+        self.test_run_button = QPushButton("Test single repetition on loaded Test Data")
+        self.test_run_button.clicked.connect(self.run_test_optimization)
+        self.cancel_test_button = QPushButton("Cancel Test")
+        self.cancel_test_button.setEnabled(False)
+        self.cancel_test_button.clicked.connect(self.cancel_test_optimization)
+        test_run_layout = QHBoxLayout()
+        test_run_layout.addWidget(self.test_run_button)
+        test_run_layout.addWidget(self.cancel_test_button)
+        self.keep_result_checkbox = QCheckBox("Keep result file")
+        self.keep_result_checkbox.setToolTip(
+            "Store the data and the test optimization result in an HDF5 file in the temporary"
+            " directory"
+        )
+        test_run_layout.addWidget(self.keep_result_checkbox)
+        self.stop_on_plateau_checkbox = QCheckBox("Stop on GOF plateau")
+        self.stop_on_plateau_checkbox.setChecked(False)  # a plateau is reported, not stopped at
+        self.stop_on_plateau_checkbox.setToolTip(
+            "Stop the test when the GOF has not improved meaningfully in the last"
+            f" {PLATEAU_WINDOW} attempts while still above convCrit. A plateau is shown in the"
+            " diagnostic either way."
+        )
+        test_run_layout.addWidget(self.stop_on_plateau_checkbox)
+        layout.addLayout(test_run_layout)
+
+        # Quick preview: a rough fit on fewer data points with reduced budgets
+        self._preview_factor = None
+        preview_layout = QHBoxLayout()
+        self.preview_button = QPushButton("Quick Preview on loaded Test Data")
+        self.preview_button.setToolTip(
+            "Rough fit with the data points, nContrib, maxIter and maxAccept reduced by the"
+            f" given factor, stopped after {PREVIEW_TIME_LIMIT:g} s at the latest"
+        )
+        self.preview_button.clicked.connect(self.run_preview_optimization)
+        preview_layout.addWidget(self.preview_button)
+        preview_layout.addWidget(QLabel("Reduction factor:"))
+        self.preview_factor_spinbox = QSpinBox()
+        self.preview_factor_spinbox.setRange(2, 100)
+        self.preview_factor_spinbox.setValue(PREVIEW_FACTOR)
+        preview_layout.addWidget(self.preview_factor_spinbox)
+        layout.addLayout(preview_layout)
+
+        # Compiled model kernels are cached, compile them as soon as a model is configured
+        self.precompile_worker = KernelPrecompileWorker()
+        self.precompile_worker.compiled_signal.connect(self.kernel_compiled)
+        self._precompiled = set()  # (model name, dtype) pairs compiled or queued
+        kernel_layout = QHBoxLayout()
+        self.precompile_checkbox = QCheckBox("Precompile model kernels in the background")
+        self.precompile_checkbox.setChecked(True)
+        kernel_layout.addWidget(self.precompile_checkbox)
+        kernel_cache_button = QPushButton("Kernel Cache...")
+        kernel_cache_button.clicked.connect(self.show_kernel_cache)
+        kernel_layout.addWidget(kernel_cache_button)
+        autotune_button = QPushButton("Autotune...")
+        autotune_button.setToolTip(
+            "Sweep nContrib, convCrit and maxAccept with test optimizations on the loaded test"
+            " data, and recommend the fastest settings reaching a GOF target"
+        )
+        autotune_button.clicked.connect(self.show_autotune)
+        kernel_layout.addWidget(autotune_button)
+        precision_button = QPushButton("Precision...")
+        precision_button.setToolTip(
+            "Compare the model intensity and speed in single and double precision, and recommend"
+            " the fastest modelDType within a tolerance"
+        )
+        precision_button.clicked.connect(self.show_precision)
+        kernel_layout.addWidget(precision_button)
+        layout.addLayout(kernel_layout)
 
         # Info text field for model parameters
         self.info_field = QTextEdit()
@@ -75,6 +164,7 @@ class RunSettingsTab(QWidget):
         layout.addWidget(self.info_field)
 
         self.setLayout(layout)
+
         if self.config_dropdown.count() > 0:
             self.config_dropdown.setCurrentIndex(0)
             self.load_selected_default_config()
@@ -159,14 +249,8 @@ class RunSettingsTab(QWidget):
                 continue
 
             try:
-                model_info = load_model_info(model_name)
-                model_parameters = model_info.parameters.defaults.copy()
-                exclude_patterns = [r"up_.*", r".*_M0", r".*_mtheta", r".*_mphi"]
-                filtered_parameters = {
-                    param: default_value
-                    for param, default_value in model_parameters.items()
-                    if not any(re.match(pattern, param) for pattern in exclude_patterns)
-                }
+                filtered_parameters = model_parameters(model_name)
+                self.precompile_kernel(model_name, document.get("modelDType", McModel.modelDType))
 
                 info_text += "  Sasmodels Parameters: \n"
                 for param, default_value in filtered_parameters.items():
@@ -182,9 +266,105 @@ class RunSettingsTab(QWidget):
                 logger.error(f"Error loading model parameters: {e}")
 
         self.info_field.setPlainText(info_text)
+        # the model info is loaded here, for the models of the configuration only, and cached
+        self.yaml_editor_widget.set_completions(
+            completion_words(
+                str(document.get("modelName", ""))
+                for document in yaml_content
+                if isinstance(document, dict)
+            )
+        )
+
+    def precompile_kernel(self, model_name: str, model_dtype: str | None):
+        """Compile the model kernel into the kernel cache in the background, once per session."""
+        key = (model_name, model_dtype)
+        if not self.precompile_checkbox.isChecked() or key in self._precompiled:
+            return
+        self._precompiled.add(key)
+        self.precompile_worker.add(model_name, model_dtype)
+
+    def kernel_compiled(self, model_name: str, error: str):
+        """Report a failed precompilation, the optimization would fail the same way."""
+        if error:
+            self.info_field.append(f"\nCompiling the model kernel for {model_name} failed: {error}")
+
+    def show_kernel_cache(self):
+        """Show the contents of the kernel cache, allowing to remove kernels."""
+        KernelCacheDialog(self).exec()
+
+    def get_run_config(self) -> dict | None:
+        """The run configuration from the editor as a single dictionary, None if invalid."""
+        # Parse the YAML configuration for the optimizer
+        yaml_content = self.yaml_editor_widget.get_yaml_content()
+        if not yaml_content:
+            self.info_field.setPlainText("Invalid or missing run configuration.")
+            return None
+
+        # Ensure YAML content is a dictionary for the optimizer
+        if isinstance(yaml_content, list):
+            # Combine all documents into a single dictionary, overriding keys if repeated
+            combined_yaml_content = {}
+            for doc in yaml_content:
+                if not isinstance(doc, dict):
+                    self.info_field.setPlainText(
+                        "One or more YAML documents are not valid configurations."
+                    )
+                    return None
+                combined_yaml_content.update(doc)
+            yaml_content = combined_yaml_content
+        return yaml_content
+
+    def show_autotune(self):
+        """Open the parameter sweep on the loaded test data, to tune the run configuration."""
+        self._show_tuning_dialog(AutotuneDialog)
+
+    def show_precision(self):
+        """Open the comparison of model precisions on the loaded test data."""
+        run_config = self.get_run_config()
+        if run_config is not None and str(run_config.get("modelName", "")).lower() in (
+            "sim",
+            "mcsas_sphere",
+        ):
+            self.info_field.setPlainText("The precision can only be chosen for sasmodels models.")
+            return
+        self._show_tuning_dialog(PrecisionDialog)
+
+    def _show_tuning_dialog(self, dialog_class):
+        """Open a dialog testing the run configuration on the loaded test data."""
+        mds = self.data_loading_tab.mds
+        if not mds:
+            self.info_field.setPlainText("No data loaded in the Data Loading tab.")
+            return
+        run_config = self.get_run_config()
+        if run_config is None:
+            return
+        dialog = dialog_class(run_config, mds.measData.copy(), parent=self)
+        dialog.applySettings.connect(self.apply_run_settings)
+        dialog.exec()
+
+    def apply_run_settings(self, settings: dict):
+        """Update the given keys in the run configuration in the editor."""
+        run_config = self.get_run_config()
+        if run_config is None:
+            return
+        run_config.update(settings)
+        self.yaml_editor_widget.set_yaml_content(run_config)
+        logger.info(f"Applied run settings: {settings}")
+
+    def run_preview_optimization(self):
+        """Start a quick preview: a test repetition on thinned data with reduced budgets."""
+        self.run_test_optimization(preview_factor=self.preview_factor_spinbox.value())
 
-    def run_test_optimization(self):
-        """Run a single optimization repetition on the loaded test data."""
+    def run_test_optimization(self, preview_factor: int | None = None):
+        """
+        Start a single optimization repetition on the loaded test data in the background.
+
+        Args:
+            preview_factor (int): For a quick preview, the factor by which the number of data
+                points, nContrib, maxIter and maxAccept are reduced.
+        """
+        if self.test_worker is not None and self.test_worker.isRunning():
+            return
         try:
             # Retrieve data from the DataLoadingTab
             mds = self.data_loading_tab.mds
@@ -192,76 +372,110 @@ class RunSettingsTab(QWidget):
                 self.info_field.setPlainText("No data loaded in the Data Loading tab.")
                 return
 
-            # Parse the YAML configuration for the optimizer
-            yaml_content = self.yaml_editor_widget.get_yaml_content()
-            if not yaml_content:
-                self.info_field.setPlainText("Invalid or missing run configuration.")
+            yaml_content = self.get_run_config()
+            if yaml_content is None:
                 return
 
-            # Ensure YAML content is a dictionary for the optimizer
-            if isinstance(yaml_content, list):
-                # Combine all documents into a single dictionary, overriding keys if repeated
-                combined_yaml_content = {}
-                for doc in yaml_content:
-                    if not isinstance(doc, dict):
-                        self.info_field.setPlainText(
-                            "One or more YAML documents are not valid configurations."
-                        )
-                        return
-                    combined_yaml_content.update(doc)
-                yaml_content = combined_yaml_content
-
-            # Create a temporary file to save data for the optimizer
-            temp_file = self._temp_dir / "test_data.hdf5"
-            self.tempFileName = Path(temp_file.name)
-            logger.debug(f"Temporary HDF5 file created at: {self.tempFileName}")
-
-            mds.store(self.tempFileName)
-            yaml_content.update({"nRep": 1})  # Update configuration for single repetition
-
-            mh = McHat(**yaml_content)
-            mh.run(mds.measData.copy(), self.tempFileName)
-
-            self.info_field.setPlainText("Optimization completed successfully.")
-
-            with h5py.File(self.tempFileName, "r") as h5f:
-                fitQ = h5f["/analyses/MCResult1/mcdata/measData/Q"][()].flatten()  # model Q
-                fitI = h5f["/analyses/MCResult1/optimization/repetition0/modelI"][
-                    ()
-                ]  # model intensity
-                acceptedGofs = h5f["/analyses/MCResult1/optimization/repetition0/acceptedGofs"][
-                    ()
-                ]  # list of GOFs
-                acceptedSteps = h5f["/analyses/MCResult1/optimization/repetition0/acceptedSteps"][
-                    ()
-                ]  # steps accepted
-                maxIter = h5f["/analyses/MCResult1/optimization/repetition0/maxIter"][
-                    ()
-                ]  # max iterations
-                maxAccept = h5f["/analyses/MCResult1/optimization/repetition0/maxAccept"][
-                    ()
-                ]  # max accepts
-                x0 = h5f["/analyses/MCResult1/optimization/repetition0/x0"][
-                    ()
-                ]  # scaling and background
+            # the data is in memory already, the optimizations prepare it in their own jobs
+            meas_data = dict(mds.measData)
+            self._preview_factor = preview_factor
+            if preview_factor:
+                yaml_content = preview_config(yaml_content, preview_factor)
+                meas_data = thin_meas_data(meas_data, preview_factor)
+
+            # The result is handed over in memory, the HDF5 file is only written on request
+            self.result_file = None
+            if self.keep_result_checkbox.isChecked() and not preview_factor:
+                self.result_file = (
+                    self._temp_dir / f"test_result_{datetime.now():%Y%m%d_%H%M%S_%f}.hdf5"
+                )
+                mds.store(self.result_file)
+                logger.info(f"Storing the test optimization result in: {self.result_file}")
 
-            self._plot_fit(
-                fit_q=fitQ,
-                fit_intensity=fitI,
-                accepted_gofs=acceptedGofs,
-                accepted_steps=acceptedSteps,
-                max_iter=maxIter,
-                max_accept=maxAccept,
-                x0=x0,
+            # limits shown in the metrics plot while the optimization runs, McOpt defaults
+            self._test_limits = (
+                yaml_content.get("maxIter", 100000),
+                yaml_content.get("maxAccept", float("inf")),
             )
-
-            # Clean up the temporary file
-            self.tempFileName.unlink()
+            self._test_conv_crit = yaml_content.get("convCrit", McOpt.convCrit)
+            self.test_worker = SingleRepetitionWorker(
+                meas_data,
+                yaml_content,
+                self.result_file,
+                time_limit=PREVIEW_TIME_LIMIT if preview_factor else None,
+                stop_on_plateau=self.stop_on_plateau_checkbox.isChecked(),
+            )
+            self.test_worker.progress_signal.connect(self.show_test_progress)
+            self.test_worker.finished_signal.connect(self.test_optimization_finished)
+            self.test_run_button.setEnabled(False)
+            self.preview_button.setEnabled(False)
+            self.cancel_test_button.setEnabled(True)
+            self.info_field.setPlainText(f"{self._test_description()} running...")
+            self.test_worker.start()
 
         except Exception as e:
             logger.error(f"Error during test optimization: {e}")
             self.info_field.setPlainText(f"Error during test optimization: {e}")
 
+    def _test_description(self) -> str:
+        if self._preview_factor:
+            return f"Quick preview (data and budgets reduced {self._preview_factor}x)"
+        return "Test optimization"
+
+    def cancel_test_optimization(self):
+        """Stop a running test optimization."""
+        if self.test_worker is not None and self.test_worker.isRunning():
+            self.cancel_test_button.setEnabled(False)
+            self.info_field.setPlainText("Cancelling test optimization...")
+            self.test_worker.cancel()
+
+    def show_test_progress(self, accepted_steps: list, accepted_gofs: list, step: int):
+        """Update the optimization metrics plot with the progress of the test optimization."""
+        if not accepted_gofs:
+            return
+        self.info_field.setPlainText(
+            f"{self._test_description()} running: {step} steps, {len(accepted_gofs)} accepted, "
+            f"GOF: {accepted_gofs[-1]:.4g}"
+        )
+        status = detect_plateau(accepted_steps, accepted_gofs, step, self._test_conv_crit)
+        if status is not None:
+            self.info_field.append(status.summary())
+        self._plot_optimization_metrics(accepted_gofs, accepted_steps, *self._test_limits)
+
+    def test_optimization_finished(self, outcome: str, result):
+        """Plot the result of a completed test optimization, or report why it did not complete."""
+        self.test_run_button.setEnabled(True)
+        self.preview_button.setEnabled(True)
+        self.cancel_test_button.setEnabled(False)
+        if outcome == "cancelled":
+            self.info_field.setPlainText(f"{self._test_description()} cancelled.")
+        elif outcome != "done":
+            logger.error(f"Error during test optimization: {result}")
+            self.info_field.setPlainText(f"Error during test optimization: {result}")
+        else:
+            self.info_field.setPlainText("Optimization completed successfully.")
+            if self._preview_factor:
+                self.info_field.setPlainText(
+                    f"{self._test_description()} completed. This is a rough fit only,"
+                    " run a full test before starting the optimizations."
+                )
+            if result.stop_reason:
+                self.info_field.append(f"Stopped by: {result.stop_reason}")
+            for diagnostic in result.diagnostics:
+                self.info_field.append(diagnostic)
+            if self.result_file is not None:
+                self.info_field.append(f"Result stored in: {self.result_file}")
+            self._plot_fit(
+                fit_q=result.fit_q,
+                fit_intensity=result.model_i,
+                accepted_gofs=result.accepted_gofs,
+                accepted_steps=result.accepted_steps,
+                max_iter=result.max_iter,
+                max_accept=result.max_accept,
+                x0=result.x0,
+                label="Quick Preview (rough)" if self._preview_factor else None,
+            )
+
     def _plot_fit(
         self,
         fit_q: Sequence[float],
@@ -271,6 +485,7 @@ class RunSettingsTab(QWidget):
         max_iter: int,
         max_accept: int,
         x0: Sequence[float],
+        label: str | None = None,
     ) -> None:
         """
         Plot the fit results in the existing data plot or reopen it if not open,
@@ -284,6 +499,7 @@ class RunSettingsTab(QWidget):
             max_iter (int): Maximum iteration setting.
             max_accept (int): Maximum accept setting.
             x0 (array-like): Scaling and background [scale, background].
+            label (str): Legend label of the fit, defaults to the one of a test optimization.
         """
         try:
             # Retrieve the data plot from the DataLoadingTab
@@ -293,7 +509,13 @@ class RunSettingsTab(QWidget):
 
             # Plot the fit on the existing data plot with zorder for proper layering
             scaled_fit_intensity = x0[0] * fit_intensity + x0[1]
-            ax.plot(fit_q, scaled_fit_intensity, "r--", label="Test McSAS3 Optimization", zorder=10)
+            ax.plot(
+                fit_q,
+                scaled_fit_intensity,
+                "r--",
+                label=label or "Test McSAS3 Optimization",
+                zorder=10,
+            )
             ax.legend()
             data_tab.fig.canvas.draw()
 
@@ -4,9 +4,10 @@ import logging
 import re
 
 import yaml
-from PyQt6.QtCore import QEvent, QRegularExpression, pyqtSignal
-from PyQt6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat
+from PyQt6.QtCore import QEvent, QRegularExpression, QStringListModel, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextCursor
 from PyQt6.QtWidgets import (
+    QCompleter,
     QFileDialog,
     QHBoxLayout,
     QPushButton,
@@ -110,6 +111,75 @@ class YAMLErrorHighlighter(QSyntaxHighlighter):
         return super().eventFilter(obj, event)
 
 
+class CompletingTextEdit(QTextEdit):
+    """Text editor offering completions for the word being typed, from a list of words."""
+
+    completion_keys = (
+        Qt.Key.Key_Enter,
+        Qt.Key.Key_Return,
+        Qt.Key.Key_Escape,
+        Qt.Key.Key_Tab,
+        Qt.Key.Key_Backtab,
+    )
+    min_prefix_length = 2  # number of characters to type before completions are shown
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.completer = QCompleter(self)
+        self.completer.setModel(QStringListModel(self.completer))
+        self.completer.setWidget(self)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+        self.completer.activated.connect(self.insert_completion)
+
+    def set_completions(self, words):
+        """Set the words offered for completion."""
+        self.completer.model().setStringList(list(words))
+
+    def word_before_cursor(self) -> str:
+        """The (partial) word left of the cursor, model names may contain '@'."""
+        cursor = self.textCursor()
+        text = cursor.block().text()[: cursor.positionInBlock()]
+        return re.search(r"[\w@]*$", text).group()
+
+    def insert_completion(self, completion: str):
+        """Replace the typed prefix by the selected completion."""
+        cursor = self.textCursor()
+        cursor.movePosition(
+            QTextCursor.MoveOperation.Left,
+            QTextCursor.MoveMode.KeepAnchor,
+            len(self.completer.completionPrefix()),
+        )
+        cursor.insertText(completion)
+        self.setTextCursor(cursor)
+
+    def keyPressEvent(self, event):
+        """Show, update or hide the completion popup while typing."""
+        popup = self.completer.popup()
+        if popup.isVisible() and event.key() in self.completion_keys:
+            event.ignore()  # handled by the completer
+            return
+        super().keyPressEvent(event)
+
+        prefix = self.word_before_cursor()
+        typed = event.text()
+        if not typed or not (typed[-1].isalnum() or typed[-1] in "_@"):
+            popup.hide()
+            return
+        if len(prefix) < self.min_prefix_length:
+            popup.hide()
+            return
+        if prefix != self.completer.completionPrefix():
+            self.completer.setCompletionPrefix(prefix)
+            popup.setCurrentIndex(self.completer.completionModel().index(0, 0))
+        if self.completer.completionCount() == 0:
+            popup.hide()
+            return
+        rect = self.cursorRect()
+        rect.setWidth(popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width())
+        self.completer.complete(rect)
+
+
 class YAMLEditorWidget(QWidget):
     fileSaved = pyqtSignal(str)
 
@@ -120,7 +190,7 @@ class YAMLEditorWidget(QWidget):
         layout = QVBoxLayout()
 
         # YAML Editor with Error Highlighting
-        self.yaml_editor = QTextEdit()
+        self.yaml_editor = CompletingTextEdit()
         self.yaml_editor.setStyleSheet(
             """
                 QTextEdit, QPlainTextEdit {
@@ -151,6 +221,10 @@ class YAMLEditorWidget(QWidget):
 
         self.setLayout(layout)
 
+    def set_completions(self, words):
+        """Set the words offered for completion while typing in the editor."""
+        self.yaml_editor.set_completions(words)
+
     def validate_yaml(self):
         """Validate YAML content and highlight any syntax errors."""
         yaml_content = self.yaml_editor.toPlainText()
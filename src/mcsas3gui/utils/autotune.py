@@ -0,0 +1,113 @@
+# src/mcsas3gui/utils/autotune.py
+
+import itertools
+import math
+import os
+from functools import partial
+from typing import Iterator, NamedTuple, Sequence
+
+from mcsas3.mc_opt import McOpt
+
+from .parallel_utils import default_workers, process_pool
+from .single_repetition import run_single_repetition
+
+SWEEP_KEYS = ("nContrib", "convCrit", "maxAccept")  # run configuration keys varied in a sweep
+SWEEP_TIME_LIMIT = 30.0  # default limit of a single sweep run in seconds
+
+
+class SweepResult(NamedTuple):
+    """Outcome of a single test optimization in a parameter sweep."""
+
+    settings: dict  # the values of the SWEEP_KEYS set in the run configuration
+    runtime: float = math.nan  # seconds in the optimization loop, without the model setup
+    steps: int = 0  # optimization steps executed until it stopped
+    accepted: int = 0  # accepted steps, not counting the initial guess
+    gof: float = math.nan  # final goodness of fit
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def converged(self) -> bool:
+        """Whether the convergence criterion of the run was reached."""
+        return self.ok and self.gof <= self.settings.get("convCrit", McOpt.convCrit)
+
+
+def parse_values(text: str) -> list[float | int]:
+    """Parse comma-separated numbers, keeping integers as int."""
+    values = []
+    for item in text.replace(";", ",").split(","):
+        item = item.strip()
+        if item:
+            number = float(item)
+            values.append(int(number) if number.is_integer() and "." not in item else number)
+    return values
+
+
+def sweep_configs(run_config: dict, ranges: dict[str, Sequence]) -> list[dict]:
+    """All combinations of the given values, each applied to a copy of the run configuration."""
+    keys = [key for key in SWEEP_KEYS if ranges.get(key)]
+    configs = []
+    for values in itertools.product(*(ranges[key] for key in keys)):
+        configs.append({**run_config, **dict(zip(keys, values))})
+    return configs
+
+
+def run_sweep_point(
+    run_config: dict, meas_data: dict, time_limit: float | None = SWEEP_TIME_LIMIT
+) -> SweepResult:
+    """Run a single repetition with the given configuration and measure it."""
+    settings = {key: run_config[key] for key in SWEEP_KEYS if key in run_config}
+    try:
+        result = run_single_repetition(meas_data, run_config, time_limit=time_limit)
+    except Exception as e:  # report the failing configuration instead of ending the sweep
+        return SweepResult(settings, error=f"{type(e).__name__}: {e}")
+    return SweepResult(
+        settings,
+        runtime=result.runtime,
+        steps=result.n_steps,
+        accepted=max(0, len(result.accepted_steps) - 1),  # McCore records step 0 as accepted
+        gof=float(result.accepted_gofs[-1]) if len(result.accepted_gofs) else math.nan,
+    )
+
+
+def run_sweep(
+    configs: list[dict],
+    meas_data: dict,
+    time_limit: float | None = SWEEP_TIME_LIMIT,
+    max_workers: int | None = None,
+) -> Iterator[SweepResult]:
+    """Run all configurations in parallel worker processes, yields results in order of configs."""
+    run_point = partial(run_sweep_point, meas_data=meas_data, time_limit=time_limit)
+    if max_workers is None:
+        max_workers = default_workers(len(configs))
+    if max_workers == 1:  # not worth starting another process
+        yield from map(run_point, configs)
+        return
+    with process_pool(len(configs), max_workers) as pool:
+        yield from pool.map(run_point, configs)
+
+
+def recommend(results: list[SweepResult], gof_target: float) -> SweepResult | None:
+    """The fastest run reaching the GOF target, or None if no run reached it."""
+    candidates = [result for result in results if result.ok and result.gof <= gof_target]
+    return min(candidates, key=lambda result: result.runtime, default=None)
+
+
+def recommended_n_cores(n_rep: int, n_cpus: int | None = None) -> int:
+    """
+    Fewest cores completing n_rep repetitions in the fewest rounds.
+
+    The repetitions run in parallel in rounds of nCores, so using more cores than needed for the
+    minimum number of rounds does not make a batch file finish faster.
+    """
+    n_cpus = n_cpus or os.cpu_count() or 1
+    n_rounds = math.ceil(n_rep / n_cpus)
+    return max(1, math.ceil(n_rep / n_rounds))
+
+
+def projected_runtime(runtime: float, n_rep: int, n_cores: int) -> float:
+    """Runtime of the optimization of one file, from the runtime of a single repetition."""
+    return runtime * math.ceil(n_rep / max(1, n_cores))
@@ -0,0 +1,40 @@
+import logging
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .autotune import run_sweep
+
+logger = logging.getLogger("McSAS3")
+
+
+class AutotuneWorker(QThread):
+    progress_signal = pyqtSignal(int)
+    result_signal = pyqtSignal(int, object)  # index of the configuration, SweepResult
+    finished_signal = pyqtSignal(list)  # all SweepResults, in the order of the configurations
+
+    def __init__(self, configs, meas_data, time_limit=None):
+        """
+        Args:
+            configs (list): Run configurations to test, see autotune.sweep_configs.
+            meas_data (dict): Measurement data, as in McData1D.measData.
+            time_limit (float): Limit of each test optimization in seconds.
+        """
+        super().__init__()
+        self.configs = configs
+        self.meas_data = meas_data
+        self.time_limit = time_limit
+
+    def run(self):
+        """Run the test optimizations in parallel processes and report each result."""
+        results = []
+        try:
+            for index, result in enumerate(
+                run_sweep(self.configs, self.meas_data, time_limit=self.time_limit)
+            ):
+                results.append(result)
+                self.result_signal.emit(index, result)
+                self.progress_signal.emit(int((index + 1) / len(self.configs) * 100))
+        except Exception as e:
+            logger.error(f"Parameter sweep aborted: {e}")
+        logger.info(f"Parameter sweep of {len(results)} configurations done.")
+        self.finished_signal.emit(results)
@@ -1,29 +1,49 @@
 import logging
 import shlex
 import subprocess
+import time
 from pathlib import Path
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from .staging import ScratchConfig, StagedJob, clean_scratch, discard, publish, stage
+
 logger = logging.getLogger("McSAS3")
 
 
 class BaseWorker(QThread):
     progress_signal = pyqtSignal(int)
     status_signal = pyqtSignal(int, str)
+    task_done_signal = pyqtSignal(int, bool, float)  # task, success, runtime in seconds
     finished_signal = pyqtSignal()
 
-    def __init__(self, files_in_out, command_template, extra_keywords=None):
+    def __init__(
+        self,
+        files_in_out,
+        command_template,
+        extra_keywords=None,
+        task_keywords=None,
+        scratch: ScratchConfig | None = None,
+    ):
         """
         Args:
-            files_in_out (dict): Pairs for {input:output} file paths to process.
-            command_template (str): Command template with placeholders for replacement.
+            files_in_out (dict | list): Pairs for {input:output} file paths to process, or a list
+                of (input, output) pairs if an input file is processed more than once.
+            command_template (str): Command template with placeholders for replacement:
+                {input_file} and {result_file} are the files the task reads and writes, which
+                are copies on scratch for a staged task; {source_file} is always the input file
+                as given, to record in the result where the data came from.
             extra_keywords (dict): Additional keywords for replacing in the command template.
+            task_keywords (list): Keywords per task, which override the extra keywords.
+            scratch (ScratchConfig): Run each task on a copy of its input in this scratch
+                directory, and publish its result file only when it succeeded.
         """
         super().__init__()
         self.files_in_out = files_in_out
         self.command_template = command_template
         self.extra_keywords = extra_keywords or {}
+        self.task_keywords = task_keywords
+        self.scratch = scratch
 
     def quote_path(self, path):
         """Ensure the path is properly quoted for safe command-line usage."""
@@ -31,18 +51,56 @@ class BaseWorker(QThread):
             path = str(path.as_posix())
         return f'"{path}"' if " " in path else path
 
+    def _stage(self, file_name, result_file) -> StagedJob | None:
+        """Stage a task on scratch if configured and it fits, else it runs in place."""
+        if self.scratch is None:
+            return None
+        try:
+            return stage(Path(file_name), Path(result_file), self.scratch)
+        except OSError as e:
+            logger.warning(f"Could not stage {file_name} on scratch, running it in place: {e}")
+            return None
+
+    @staticmethod
+    def _publish_failed(job: StagedJob) -> None:
+        """
+        Leave what a failed job wrote at its destination, as a job run in place does, e.g. the
+        results it optimized before failing, and never the earlier result.
+        """
+        try:
+            if job.result_file.is_file():
+                publish(job)
+            else:
+                job.destination.unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Could not replace the earlier result {job.destination}: {e}")
+
     def run(self):
         """Run commands sequentially."""
-        total_files = len(self.files_in_out)
-        for row, (file_name, result_file) in enumerate(self.files_in_out.items()):
-            if result_file.is_file():
+        tasks = list(
+            self.files_in_out.items() if isinstance(self.files_in_out, dict) else self.files_in_out
+        )
+        total_files = len(tasks)
+        if self.scratch is not None:
+            clean_scratch(self.scratch)
+        for row, (file_name, result_file) in enumerate(tasks):
+            source_file = file_name  # the input file, also when the task runs on a copy of it
+            job = self._stage(file_name, result_file)
+            if job is not None:  # the earlier result stays in place until the job ends
+                file_name, result_file = job.input_file, job.result_file
+            elif result_file.is_file():
                 result_file.unlink()
 
             # Add file-specific keywords, quoting paths
+            task_keywords = self.task_keywords[row] if self.task_keywords else {}
             keywords = {
                 "input_file": self.quote_path(Path(file_name)),
                 "result_file": self.quote_path(Path(result_file)),
-                **{key: self.quote_path(value) for key, value in self.extra_keywords.items()},
+                "source_file": self.quote_path(Path(source_file)),
+                **{
+                    key: self.quote_path(value)
+                    for key, value in {**self.extra_keywords, **task_keywords}.items()
+                },
             }
 
             # Replace placeholders in the command template
@@ -50,12 +108,24 @@ class BaseWorker(QThread):
 
             logger.info(f"Running command: {command}")
 
+            start = time.monotonic()
             try:
                 self.status_signal.emit(row, "Running")
                 subprocess.run(command, check=True)
+                if job is not None:
+                    publish(job)
                 self.status_signal.emit(row, "Complete")
-            except subprocess.CalledProcessError:
+                self.task_done_signal.emit(row, True, time.monotonic() - start)
+            except (subprocess.CalledProcessError, OSError) as e:
+                if isinstance(e, OSError):  # e.g. the result could not be published
+                    logger.error(f"Task for {file_name} failed: {e}")
+                if job is not None:
+                    self._publish_failed(job)
                 self.status_signal.emit(row, "Failed")
+                self.task_done_signal.emit(row, False, time.monotonic() - start)
+            finally:
+                if job is not None:
+                    discard(job)
 
             # Update progress
             progress = int((row + 1) / total_files * 100)
@@ -0,0 +1,330 @@
+# src/mcsas3gui/utils/campaign_container.py
+
+import argparse
+import hashlib
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import h5py
+
+logger = logging.getLogger("McSAS3")
+
+ADDRESS_SEPARATOR = "::"  # between the container file and the sample, in a sample address
+SAMPLES_GROUP = "samples"  # one group per sample, holding what its result file holds at the root
+INDEX_GROUP = "index"  # one dataset per column, one row per sample in the order they were added
+INDEX_COLUMNS = {"sample": h5py.string_dtype(), "source": h5py.string_dtype(), "added": float}
+MODIFIED_ATTR = "modified_ns"  # of each sample group, the time it was last written
+
+
+def sample_address(container: str | Path, sample: str) -> str:
+    """
+    Address of a sample in a campaign container, accepted wherever a result file name is.
+
+    >>> sample_address("campaign.h5", "S1")
+    'campaign.h5::S1'
+    """
+    return f"{container}{ADDRESS_SEPARATOR}{sample}"
+
+
+def split_address(address: str | Path) -> tuple[Path, str | None]:
+    """
+    The file of a result address, and the sample for a sample in a campaign container.
+
+    >>> split_address("campaign.h5::S1")[1]
+    'S1'
+    >>> split_address("result.hdf5")[1] is None
+    True
+    """
+    file_name, separator, sample = str(address).partition(ADDRESS_SEPARATOR)
+    return Path(file_name), (sample if separator else None)
+
+
+def resolve_address(address: str | Path) -> str:
+    """The address with the absolute path of its file, as a key for tables and caches."""
+    file_name, sample = split_address(address)
+    file_name = file_name.resolve()
+    return str(file_name) if sample is None else sample_address(file_name, sample)
+
+
+def result_exists(address: str | Path) -> bool:
+    """If the result file exists, or the sample is in the campaign container."""
+    file_name, sample = split_address(address)
+    if sample is None:
+        return file_name.exists()
+    try:
+        with h5py.File(file_name, "r") as h5f:
+            return f"{SAMPLES_GROUP}/{sample}" in h5f
+    except OSError:
+        return False
+
+
+@contextmanager
+def open_result(address: str | Path, mode: str = "r"):
+    """
+    Open a result file, or a sample in a campaign container, and yield the group holding its
+    analyses: the file itself, or the group of the sample. A sample opened for writing gets a
+    new stamp, see result_stamp.
+    """
+    file_name, sample = split_address(address)
+    with h5py.File(file_name, mode) as h5f:
+        if sample is None:
+            yield h5f
+            return
+        if f"{SAMPLES_GROUP}/{sample}" not in h5f:
+            raise KeyError(f"No sample {sample} in {file_name}")
+        group = h5f[f"{SAMPLES_GROUP}/{sample}"]
+        try:
+            yield group
+        finally:
+            if mode != "r":
+                group.attrs[MODIFIED_ATTR] = time.time_ns()
+
+
+def result_stamp(address: str | Path, group: h5py.Group | None = None) -> int:
+    """
+    A value that changes whenever the result is written: the modification time of a result
+    file, or the time a sample was last written for a sample in a campaign container, so that
+    writing one sample does not outdate what is known about the others.
+
+    Args:
+        group (h5py.Group): The result opened already with open_result, to read the stamp of a
+            sample from.
+    """
+    file_name, sample = split_address(address)
+    if sample is None:
+        return file_name.stat().st_mtime_ns
+    if group is not None:
+        return int(group.attrs.get(MODIFIED_ATTR, 0))
+    return result_stamps([address])[str(address)]
+
+
+def result_stamps(addresses: list[str | Path]) -> dict:
+    """
+    The stamp of each result, see result_stamp, or the exception raised getting it. Each
+    container is opened once for all of its samples.
+    """
+    stamps, by_container = {}, {}
+    for address in map(str, addresses):
+        file_name, sample = split_address(address)
+        if sample is None:
+            try:
+                stamps[address] = file_name.stat().st_mtime_ns
+            except OSError as e:
+                stamps[address] = e
+        else:
+            by_container.setdefault(file_name, []).append((address, sample))
+    for file_name, samples in by_container.items():
+        try:
+            with h5py.File(file_name, "r") as h5f:
+                for address, sample in samples:
+                    group = h5f.get(f"{SAMPLES_GROUP}/{sample}")
+                    stamps[address] = (
+                        KeyError(f"No sample {sample} in {file_name}")
+                        if group is None
+                        else int(group.attrs.get(MODIFIED_ATTR, 0))
+                    )
+        except OSError as e:
+            stamps.update((address, e) for address, _ in samples)
+    return {str(address): stamps[str(address)] for address in addresses}
+
+
+def is_container(file_name: str | Path) -> bool:
+    """If the file is a campaign container, rather than a single result file."""
+    try:
+        with h5py.File(file_name, "r") as h5f:
+            return INDEX_GROUP in h5f and SAMPLES_GROUP in h5f
+    except OSError:
+        return False
+
+
+def shard_files(container: str | Path) -> list[Path]:
+    """
+    The container file, and its shards <stem>_000<suffix>, ... if it was written in shards. The
+    writer does not mix the two, but both are found if they were.
+    """
+    container = Path(container)
+    pattern = f"{container.stem}_[0-9][0-9][0-9]{container.suffix}"
+    shards = sorted(container.parent.glob(pattern))
+    return [container] + shards if container.is_file() else shards
+
+
+def read_index(shard: str | Path) -> list[str]:
+    """The samples in a container file, from its index only."""
+    with h5py.File(shard, "r") as h5f:
+        if f"{INDEX_GROUP}/sample" not in h5f:
+            return []
+        return list(h5f[f"{INDEX_GROUP}/sample"].asstr()[()])
+
+
+def container_samples(container: str | Path) -> dict:
+    """The address of each sample in a container, or in all of its shards."""
+    return {
+        sample: sample_address(shard, sample)
+        for shard in shard_files(container)
+        for sample in read_index(shard)
+    }
+
+
+def sample_names(files: list[str | Path]) -> list[str]:
+    """
+    A sample name for each file: its name without suffix and output tag, and a hash of its
+    path. Files of the same name in different directories get different samples, also when
+    added to a container in different batches, and a file added again replaces its sample.
+
+    >>> names = sample_names(["a/S1.nxs", "b/S1.nxs", "S2_output.hdf5", "a/S1.nxs"])
+    >>> [name[:-7] for name in names], names[0] != names[1], names[0] == names[3]
+    (['S1', 'S1', 'S2', 'S1'], True, True)
+    """
+    return [
+        f"{Path(file_name).stem.removesuffix('_output')}_{_path_hash(Path(file_name))}"
+        for file_name in files
+    ]
+
+
+def _path_hash(path: Path) -> str:
+    return hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:6]
+
+
+class ContainerWriter:
+    """
+    Writes result files into a campaign container, one group per sample, replacing a sample
+    written before. Meant to be the only writer of the container, fed with the result files of
+    parallel jobs, so that the jobs never write to the container themselves.
+
+    With a shard size, the samples are spread over shard files of at most that many samples
+    each, <stem>_000<suffix>, <stem>_001<suffix>, ... next to the given container path.
+    """
+
+    def __init__(self, container: str | Path, shard_size: int = 0):
+        self.container = Path(container)
+        self.shard_size = shard_size
+        self._shards = {}  # shard file -> samples in it, in the order of its index
+        files = shard_files(self.container)
+        if shard_size and self.container in files:
+            raise ValueError(f"{self.container} was written without shards, it cannot be sharded")
+        if not shard_size and files and self.container not in files:
+            raise ValueError(f"{self.container} was written in shards, give a shard size")
+        for shard in files if shard_size else [self.container]:
+            if shard.is_file() and not is_container(shard) and not _is_empty(shard):
+                raise ValueError(f"{shard} is not a campaign container")
+            self._shards[shard] = read_index(shard) if shard.is_file() else []
+
+    def _shard_of(self, sample: str) -> Path:
+        """The shard holding the sample, or the one to add it to."""
+        for shard, samples in self._shards.items():
+            if sample in samples:
+                return shard
+        shard = max(self._shards, default=None)
+        if self.shard_size and (shard is None or len(self._shards[shard]) >= self.shard_size):
+            shard = self.container.with_name(
+                f"{self.container.stem}_{len(self._shards):03d}{self.container.suffix}"
+            )
+            self._shards[shard] = []
+        self._shards[shard].append(sample)
+        return shard
+
+    def add(self, items: list[tuple], remove: bool = False) -> list:
+        """
+        Copy result files into the container, opening each shard once for all of them.
+
+        Args:
+            items (list): (result file, sample name) pairs.
+            remove (bool): Delete each result file once it is in the container.
+
+        Returns the address of each sample, or the exception raised when copying it, so that one
+        unreadable result file does not stop the others.
+        """
+        outcomes = [None] * len(items)
+        by_shard = {}
+        for position, (result_file, sample) in enumerate(items):
+            by_shard.setdefault(self._shard_of(sample), []).append(position)
+        for shard, positions in by_shard.items():
+            with h5py.File(shard, "a") as h5f:
+                rows = _index_rows(h5f)
+                for position in positions:
+                    result_file, sample = items[position]
+                    try:
+                        _copy_sample(h5f, Path(result_file), sample, rows)
+                    except (OSError, KeyError) as e:
+                        logger.warning(f"Could not add {result_file} to {shard}: {e}")
+                        outcomes[position] = e
+                        continue
+                    outcomes[position] = sample_address(shard, sample)
+        if remove:
+            for (result_file, _), outcome in zip(items, outcomes):
+                if isinstance(outcome, str):
+                    Path(result_file).unlink(missing_ok=True)
+        return outcomes
+
+
+def _is_empty(file_name: Path) -> bool:
+    try:
+        with h5py.File(file_name, "r") as h5f:
+            return not len(h5f)
+    except OSError:
+        return file_name.stat().st_size == 0
+
+
+def _index_rows(h5f: h5py.File) -> dict:
+    """Row of each sample in the index of a container file, creating the index if needed."""
+    index = h5f.require_group(INDEX_GROUP)
+    for column, dtype in INDEX_COLUMNS.items():
+        if column not in index:
+            index.create_dataset(column, shape=(0,), maxshape=(None,), dtype=dtype, chunks=True)
+    return {sample: row for row, sample in enumerate(index["sample"].asstr()[()])}
+
+
+def _copy_sample(h5f: h5py.File, result_file: Path, sample: str, rows: dict) -> None:
+    with h5py.File(result_file, "r") as source:  # fails before the earlier sample is removed
+        path = f"{SAMPLES_GROUP}/{sample}"
+        if path in h5f:
+            del h5f[path]
+        group = h5f.require_group(path)
+        for name in source:
+            source.copy(source[name], group, name=name)
+        group.attrs[MODIFIED_ATTR] = time.time_ns()
+    index = h5f[INDEX_GROUP]
+    if sample not in rows:
+        rows[sample] = len(rows)
+        for column in INDEX_COLUMNS:
+            index[column].resize((len(rows),))
+    row = rows[sample]
+    index["sample"][row] = sample
+    index["source"][row] = str(result_file)
+    index["added"][row] = time.time()
+
+
+def pack(
+    container: str | Path, result_files: list[str | Path], shard_size: int = 0, remove: bool = False
+) -> list:
+    """Add result files to a container as samples named after the files, see ContainerWriter."""
+    items = list(zip(result_files, sample_names(result_files)))
+    return ContainerWriter(container, shard_size).add(items, remove)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Collects McSAS3 result files into a campaign container, one group per"
+        " sample, or lists the samples in a container if no result files are given."
+    )
+    parser.add_argument("container", type=Path, help="campaign container HDF5 file")
+    parser.add_argument("result_files", nargs="*", type=Path, help="result files to add")
+    parser.add_argument("-s", "--shardSize", type=int, default=0, help="samples per shard file")
+    parser.add_argument("--remove", action="store_true", help="delete the added result files")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    if not args.result_files:
+        for address in container_samples(args.container).values():
+            print(address)
+        return 0
+    outcomes = pack(args.container, args.result_files, args.shardSize, args.remove)
+    failed = sum(not isinstance(outcome, str) for outcome in outcomes)
+    logger.info(f"{len(outcomes) - failed} samples added to {args.container}, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+# src/mcsas3gui/utils/campaign_table.py
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
+import h5py
+import numpy as np
+import pandas
+
+from .campaign_container import (
+    container_samples,
+    is_container,
+    open_result,
+    resolve_address,
+    result_stamp,
+    result_stamps,
+    split_address,
+)
+from .histogramming import MODE_KEYS, OPT_KEYS
+from .parallel_utils import default_workers, process_pool
+from .result_reader import parse_result_indices
+
+logger = logging.getLogger("McSAS3")
+
+TABLE_GROUP = "campaign"  # group of the column datasets in an HDF5 campaign table
+SORT_COLUMNS = ["file", "result_index", "hist_index"]  # the order of the rows in a table
+RANGE_KEYS = ("parameter", "rangeMin", "rangeMax", "nBin", "binScale", "binWeighting")
+RESULT_PATTERN = "*_output.hdf5"  # searched for in directories, see make_out_path
+
+
+class CampaignUpdate(NamedTuple):
+    """Outcome of updating a campaign table with a set of result files."""
+
+    table: pandas.DataFrame
+    n_read: int  # files read, as they were new or changed
+    n_unchanged: int  # files skipped, as their rows are up to date
+    errors: dict  # error message per file that could not be read
+
+    def summary(self) -> str:
+        text = (
+            f"Campaign table: {len(self.table)} rows, {self.n_read} files read,"
+            f" {self.n_unchanged} unchanged"
+        )
+        return text + (f", {len(self.errors)} failed" if self.errors else "")
+
+
+def _value(dataset: h5py.Dataset):
+    value = dataset[()]
+    if isinstance(value, bytes):
+        return value.decode()
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _read_statistics(h5f: h5py.Group, file_row: dict, result_index: int) -> list[dict]:
+    root = h5f[f"analyses/MCResult{result_index}"]
+    if "histograms" not in root:
+        raise KeyError(f"No histograms in {file_row['file']} #{result_index}, histogram it first")
+    file_row = {"file": file_row["file"], "result_index": result_index, **file_row}
+    averages = root.get("optimization/average", {})
+    for key in OPT_KEYS:
+        if key in averages:
+            file_row[key] = _value(averages[key]["valMean"])
+            file_row[f"{key}_std"] = _value(averages[key]["valStd"])
+    rows = []
+    for name, group in root["histograms"].items():
+        row = {**file_row, "hist_index": int(name.removeprefix("histRange"))}
+        row.update({key: _value(group[key]) for key in RANGE_KEYS if key in group})
+        for mode in MODE_KEYS:
+            row[mode] = _value(group[f"average/{mode}/valMean"])
+            row[f"{mode}_std"] = _value(group[f"average/{mode}/valStd"])
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["hist_index"])
+
+
+def read_statistics(file_name: str | Path, result_index: int = 1) -> list[dict]:
+    """
+    One row per histogram range of a histogrammed result file: the range, its population
+    statistics averaged over the repetitions, and the optimization statistics of the result.
+
+    Only the groups written by the histogramming are read, not the contributions. The file may
+    also be a sample in a campaign container.
+    """
+    with open_result(file_name) as h5f:
+        file_row = {"file": resolve_address(file_name), "mtime_ns": result_stamp(file_name, h5f)}
+        return _read_statistics(h5f, file_row, result_index)
+
+
+def _read_task(file_name: str, result_indices: tuple[int]) -> tuple[list[dict], str | None]:
+    """The rows of all results of a file, read with the file opened once."""
+    rows, errors = [], []
+    try:
+        with open_result(file_name) as h5f:
+            # the stamp of the result, see result_stamp, to tell when it was written again
+            file_row = {"file": file_name, "mtime_ns": result_stamp(file_name, h5f)}
+            for result_index in result_indices:
+                try:
+                    rows += _read_statistics(h5f, file_row, result_index)
+                except Exception as e:  # the other results of the file are still read
+                    errors.append(f"#{result_index} {type(e).__name__}: {e}")
+    except Exception as e:  # report anything, so that the other files are still read
+        return [], f"{type(e).__name__}: {e}"
+    return rows, "; ".join(errors) or None
+
+
+def _sorted(table: pandas.DataFrame) -> pandas.DataFrame:
+    if table.empty:
+        return table
+    return table.sort_values(SORT_COLUMNS, ignore_index=True)
+
+
+def _column_data(values: pandas.Series) -> np.ndarray:
+    if not pandas.api.types.is_numeric_dtype(values):
+        return values.astype(str).to_numpy(dtype=h5py.string_dtype())
+    return np.asarray(values)
+
+
+def read_table(table_path: str | Path) -> pandas.DataFrame:
+    """
+    Read a campaign table, from Parquet if the file name ends in .parquet, else HDF5. The rows
+    are sorted by file, result index and histogram range, an HDF5 table is stored unsorted.
+    """
+    return _sorted(_read_stored(table_path))
+
+
+def _read_stored(table_path: str | Path) -> pandas.DataFrame:
+    """The rows of a campaign table in the order they are stored in."""
+    table_path = Path(table_path)
+    if table_path.suffix == ".parquet":
+        return pandas.read_parquet(table_path)
+    with h5py.File(table_path, "r") as h5f:
+        group = h5f[TABLE_GROUP]
+        columns = [str(c) for c in group.attrs["columns"]]
+        return pandas.DataFrame(
+            {
+                column: (
+                    group[column].asstr()[()]
+                    if h5py.check_string_dtype(group[column].dtype)
+                    else group[column][()]
+                )
+                for column in columns
+            },
+            columns=columns,
+        )
+
+
+def write_table(table: pandas.DataFrame, table_path: str | Path) -> None:
+    """
+    Write a campaign table, one resizable dataset per column, replacing the file at once so
+    that readers never see a partial table. Parquet is written if the file name ends in
+    .parquet, which requires pyarrow.
+    """
+    table_path = Path(table_path)
+    fd, temp_name = tempfile.mkstemp(suffix=".tmp", dir=table_path.parent)
+    os.close(fd)
+    try:
+        if table_path.suffix == ".parquet":
+            table.to_parquet(temp_name, index=False)
+        else:
+            with h5py.File(temp_name, "w") as h5f:
+                group = h5f.create_group(TABLE_GROUP)
+                group.attrs["columns"] = list(table.columns)
+                for column, values in table.items():
+                    group.create_dataset(
+                        column,
+                        data=_column_data(values),
+                        maxshape=(None,),
+                        chunks=True,
+                        compression="gzip",
+                    )
+        os.replace(temp_name, table_path)
+    finally:
+        Path(temp_name).unlink(missing_ok=True)
+
+
+def update_rows(table_path: str | Path, stale: np.ndarray, rows: pandas.DataFrame) -> bool:
+    """
+    Replace the stale rows of an HDF5 campaign table by new rows in place, writing only those
+    rows: the new rows take the places of the stale ones, the table is extended for the rest,
+    or the last rows are moved into the places left over and the table is shortened.
+
+    Args:
+        stale: Whether each row is to be replaced, in the order stored in the file.
+        rows: The new rows, with the columns of the table.
+
+    Returns False, without writing, if the new rows do not fit the columns of the table, which
+    is then to be written anew with write_table.
+    """
+    with h5py.File(table_path, "r+") as h5f:
+        group = h5f[TABLE_GROUP]
+        columns = [str(c) for c in group.attrs["columns"]]
+        if sorted(columns) != sorted(rows.columns):
+            return False
+        data = {column: _column_data(rows[column]) for column in columns}
+        for column, values in data.items():
+            dataset = group[column]
+            if dataset.maxshape[0] is not None or len(dataset) != len(stale):
+                return False  # written before the tables were resizable
+            if h5py.check_string_dtype(dataset.dtype):
+                if not h5py.check_string_dtype(values.dtype):
+                    return False
+            elif values.dtype.kind not in "biuf" or not np.can_cast(
+                values.dtype, dataset.dtype, "safe"
+            ):
+                return False
+        free = np.flatnonzero(stale)
+        n_old, n_new = len(stale), len(rows)
+        length = n_old + n_new - len(free)
+        slots = np.concatenate([free[:n_new], np.arange(n_old, length)]).astype(int)
+        holes = free[n_new:]
+        # rows beyond the new length that are kept, moved into the holes before it
+        moved = np.setdiff1d(np.arange(length, n_old), holes)
+        for column, values in data.items():
+            dataset = group[column]
+            if len(moved):
+                dataset[holes[: len(moved)]] = dataset[moved]
+            if length > n_old:
+                dataset.resize((length,))
+            if n_new:
+                dataset[slots] = values
+            if length < n_old:
+                dataset.resize((length,))
+    return True
+
+
+def result_files(paths: list[str | Path]) -> list[Path]:
+    """
+    The given files, and the result files found in the given directories and below, named like
+    the optimization names its output. Input files and campaign tables next to them are left
+    out. A campaign container given is replaced by the addresses of its samples; containers in
+    the directories are not looked into, as that would open every file found.
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += sorted(p for p in path.rglob(RESULT_PATTERN) if p.is_file())
+        elif split_address(path)[1] is None and is_container(path):
+            files += [Path(address) for address in container_samples(path).values()]
+        else:
+            files.append(path)
+    return files
+
+
+def update_table(
+    table_path: str | Path,
+    files: list[str | Path],
+    result_indices: int | list[int] = 1,
+    max_workers: int | None = None,
+) -> CampaignUpdate:
+    """
+    Add the histogram statistics of result files to a campaign table, creating it if needed.
+
+    Only files that are new to the table or changed since are read, in parallel worker
+    processes, each with all of the result indices at once. Their earlier rows are replaced; the
+    rows of all other files and results are kept. Only the replaced rows are written to an HDF5
+    table, see update_rows; a Parquet table cannot be changed, it is written anew.
+    """
+    if isinstance(result_indices, int):
+        result_indices = [result_indices]
+    result_indices = tuple(result_indices)
+    table_path = Path(table_path)
+    table = _read_stored(table_path) if table_path.is_file() else pandas.DataFrame()
+    known = {}
+    if not table.empty:
+        known = dict(zip(zip(table["file"], table["result_index"]), table["mtime_ns"].astype(int)))
+    files = list(dict.fromkeys(resolve_address(f) for f in files))
+    to_read, errors = [], {}
+    for file_name, stamp in result_stamps(files).items():
+        if isinstance(stamp, Exception):
+            errors[file_name] = f"{type(stamp).__name__}: {stamp}"
+        elif any(known.get((file_name, i)) != stamp for i in result_indices):
+            to_read.append(file_name)
+    n_unchanged = len(files) - len(to_read) - len(errors)
+
+    task = partial(_read_task, result_indices=result_indices)
+    if max_workers is None:
+        max_workers = default_workers(len(to_read))
+    if max_workers == 1 or len(to_read) <= 1:  # not worth starting another process
+        outcomes = list(map(task, to_read))
+    else:
+        chunksize = max(1, len(to_read) // (4 * max_workers))
+        with process_pool(len(to_read), max_workers) as pool:
+            outcomes = list(pool.map(task, to_read, chunksize=chunksize))
+
+    rows = []
+    for file_name, (file_rows, error) in zip(to_read, outcomes):
+        if error:
+            logger.warning(f"Could not read the histogram statistics of {file_name}: {error}")
+            errors[file_name] = error
+        rows += file_rows
+    new_rows = pandas.DataFrame(rows)
+    if not table.empty:
+        read_keys = {(file_name, i) for file_name in to_read for i in result_indices}
+        stale = np.array(
+            [key in read_keys for key in zip(table["file"], table["result_index"])], dtype=bool
+        )
+        table = table[~stale]
+    else:
+        stale = np.zeros(0, dtype=bool)
+    if rows:
+        table = new_rows if table.empty else pandas.concat([table, new_rows], ignore_index=True)
+    table = _sorted(table)
+    if not table_path.is_file():
+        write_table(table, table_path)
+    elif to_read and (stale.any() or rows):
+        # only the changed rows are written, the table is written anew if its columns changed
+        if table_path.suffix == ".parquet" or not update_rows(table_path, stale, new_rows):
+            write_table(table, table_path)
+    update = CampaignUpdate(table, len(to_read), n_unchanged, errors)
+    logger.info(update.summary())
+    return update
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Collects the histogram statistics of McSAS3 result files into one table,"
+        " reading only files that are new or changed since the last update."
+    )
+    parser.add_argument("table", type=Path, help="campaign table, HDF5 or .parquet")
+    parser.add_argument("paths", nargs="+", type=Path, help="result files or directories")
+    parser.add_argument(
+        "-i", "--resultIndex", type=parse_result_indices, default=[1], help="e.g. 1 or 1,2 or 1-3"
+    )
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    update = update_table(args.table, result_files(args.paths), args.resultIndex, args.workers)
+    return 1 if update.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
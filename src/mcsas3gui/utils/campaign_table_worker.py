@@ -0,0 +1,36 @@
+import logging
+from pathlib import Path
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .campaign_table import update_table
+
+logger = logging.getLogger("McSAS3")
+
+
+class CampaignTableWorker(QThread):
+    finished_signal = pyqtSignal(object, str)  # CampaignUpdate, error message (empty on success)
+
+    def __init__(
+        self, table_path: str | Path, files: list[str | Path], result_indices: list[int] = (1,)
+    ):
+        """
+        Args:
+            table_path (str | Path): Campaign table to update, HDF5 or .parquet.
+            files (list): Histogrammed McSAS3 result files.
+            result_indices (list): Results in the files to collect.
+        """
+        super().__init__()
+        self.table_path = Path(table_path)
+        self.files = files
+        self.result_indices = list(result_indices)
+
+    def run(self):
+        """Read the new and changed files in parallel and rewrite the table."""
+        try:
+            update = update_table(self.table_path, self.files, self.result_indices)
+        except Exception as e:
+            logger.error(f"Updating the campaign table {self.table_path} failed: {e}")
+            self.finished_signal.emit(None, f"{type(e).__name__}: {e}")
+            return
+        self.finished_signal.emit(update, "")
@@ -0,0 +1,50 @@
+import logging
+from collections import deque
+from pathlib import Path
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .campaign_container import ContainerWriter
+
+logger = logging.getLogger("McSAS3")
+
+
+class ContainerWriterWorker(QThread):
+    # task, sample address (empty on failure), error message (empty on success)
+    written_signal = pyqtSignal(int, str, str)
+
+    def __init__(self, container: str | Path, shard_size: int = 0):
+        """
+        Args:
+            container (str | Path): Campaign container to write the results into.
+            shard_size (int): Samples per shard file, 0 for a single container file.
+        """
+        super().__init__()
+        self.writer = ContainerWriter(container, shard_size)
+        self.pending = deque()  # (task, result file, sample) still to write
+        self.finished.connect(self._restart_if_pending)
+
+    def add(self, row: int, result_file: Path, sample: str):
+        """Queue a finished result file and start writing if idle."""
+        self.pending.append((row, result_file, sample))
+        if not self.isRunning():
+            self.start()
+
+    def _restart_if_pending(self):
+        if self.pending:  # added while the last batch was being written
+            self.start()
+
+    def run(self):
+        """Move the queued result files into the container, all queued so far at once."""
+        while self.pending:
+            batch = [self.pending.popleft() for _ in range(len(self.pending))]
+            try:
+                outcomes = self.writer.add([(path, sample) for _, path, sample in batch], True)
+            except Exception as e:  # the container itself could not be written
+                logger.error(f"Could not write to the campaign container: {e}")
+                outcomes = [e] * len(batch)
+            for (row, _, _), outcome in zip(batch, outcomes):
+                if isinstance(outcome, str):
+                    self.written_signal.emit(row, outcome, "")
+                else:
+                    self.written_signal.emit(row, "", str(outcome))
@@ -0,0 +1,91 @@
+# src/mcsas3gui/utils/data_utils.py
+
+import logging
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pandas
+from mcsas3.mc_data_1d import McData1D
+
+from .hdf5_utils import is_hdf5_file
+
+logger = logging.getLogger("McSAS3")
+
+# HDF5 chunk cache settings for reading the reduced 1D vectors: each chunk is read exactly once,
+# so a moderate cache with preemption of fully read chunks (w0=1) is sufficient, and the cache
+# does not grow with detector frames stored alongside in the same file.
+CHUNK_CACHE_BYTES = 8 * 1024**2
+CHUNK_CACHE_SLOTS = 10007  # a prime, as recommended by the HDF5 documentation
+CHUNK_CACHE_W0 = 1.0
+
+
+def mcdata_kwargs(read_config: dict) -> dict:
+    """
+    Translate a data read configuration into keyword arguments for McData1D.
+
+    csvargs are only passed on when configured: McData1D keeps its defaults otherwise, which are
+    stored with the data and needed to load it from a result file again. Other options, such as
+    qNudge, are passed on as they are, as the McSAS3 command line runner does.
+    """
+    kwargs = dict(
+        nbins=int(read_config.get("nbins", 100)),
+        pathDict=read_config.get("pathDict", None),
+        IEmin=float(read_config.get("IEmin", 0.01)),
+        dataRange=read_config.get("dataRange", [-np.inf, np.inf]),
+        omitQRanges=read_config.get("omitQRanges", []),
+        resultIndex=int(read_config.get("resultIndex", 1)),
+    )
+    return {**read_config, **kwargs}
+
+
+def read_hdf5_datasets(file_name: str | Path, path_dict: dict) -> dict:
+    """
+    Read only the datasets referenced in path_dict, e.g. {"Q": "/entry/result/Q", ...}.
+
+    Only the groups along the given paths are resolved, unrelated groups (such as raw detector
+    frames) are never touched. Each dataset is read directly into a preallocated array.
+    """
+    data = {}
+    with h5py.File(
+        file_name,
+        "r",
+        rdcc_nbytes=CHUNK_CACHE_BYTES,
+        rdcc_nslots=CHUNK_CACHE_SLOTS,
+        rdcc_w0=CHUNK_CACHE_W0,
+    ) as h5f:
+        for key, path in path_dict.items():
+            dset = h5f[str(path)]
+            if dset.shape == ():  # scalars can not be read into an array directly
+                data[key] = np.asarray(dset[()])
+                continue
+            values = np.empty(dset.shape, dtype=dset.dtype)
+            if values.size:
+                dset.read_direct(values)
+            data[key] = values.squeeze()
+    return data
+
+
+def load_mcdata_1d(file_path: str | Path, read_config: dict) -> McData1D:
+    """
+    Load a 1D data file with the given read configuration, as the McSAS3 CLI runner would.
+
+    For HDF5/NeXus files with a complete pathDict, only the referenced datasets are read.
+    Anything else (csv, pdh, NeXus 'default' attribute traversal, 2D data) is left to McData1D.
+    """
+    file_path = Path(file_path)
+    kwargs = mcdata_kwargs(read_config)
+    path_dict = kwargs["pathDict"]
+    if (
+        is_hdf5_file(file_path)
+        and isinstance(path_dict, dict)
+        and all(key in path_dict for key in ("Q", "I", "ISigma"))
+    ):
+        raw_data = read_hdf5_datasets(file_path, path_dict)
+        if all(values.ndim == 1 for values in raw_data.values()):
+            df = pandas.DataFrame(
+                {key: values.astype(float, copy=False) for key, values in raw_data.items()}
+            )
+            logger.debug(f"Read {list(raw_data)} selectively from {file_path}")
+            return McData1D(df=df, filename=file_path, **kwargs)
+    return McData1D(filename=file_path, **kwargs)
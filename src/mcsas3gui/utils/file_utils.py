@@ -1,6 +1,9 @@
+import os
 from importlib.resources import files
 from pathlib import Path
 
+USER_DATA_ENV = "MCSAS3GUI_DATA_DIR"  # overrides the directory of data kept across sessions
+
 
 def get_default_config_files(directory: Path) -> list[str]:
     """Get a list of YAML configuration files in the specified directory."""
@@ -17,6 +20,11 @@ def get_main_path() -> Path:
     return files("mcsas3gui")
 
 
+def get_user_data_path() -> Path:
+    """Directory for data kept across sessions, such as caches and learned settings."""
+    return Path(os.environ.get(USER_DATA_ENV) or Path.home() / ".mcsas3gui")
+
+
 def is_base_path(base_path, full_path):
     # Convert to Path objects
     base = Path(base_path).resolve()
@@ -26,8 +34,9 @@ def is_base_path(base_path, full_path):
     return base in full.parents or base == full
 
 
-def make_out_path(inpath, temp_dir: Path):
+def make_out_path(inpath, temp_dir: Path, tag: str = ""):
+    """Output file of an input file, the tag distinguishes outputs of several configurations."""
     outdir = inpath.parent
     if is_base_path(get_main_path(), inpath):
         outdir = temp_dir
-    return outdir / (inpath.stem + "_output.hdf5")
+    return outdir / (inpath.stem + (f"_{tag}" if tag else "") + "_output.hdf5")
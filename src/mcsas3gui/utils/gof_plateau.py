@@ -0,0 +1,121 @@
+# src/mcsas3gui/utils/gof_plateau.py
+
+import math
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+PLATEAU_WINDOW = 2000  # number of most recent attempts in which the GOF trend is judged
+PLATEAU_MIN_IMPROVEMENT = 0.01  # relative GOF improvement over the window counted as meaningful
+LIMIT_EDGE = 0.02  # fraction of a parameter range counted as "at the limit"
+LIMIT_PILEUP = 0.2  # fraction of contributions at a limit which indicates too narrow limits
+
+
+class PlateauStatus(NamedTuple):
+    """GOF trend over the most recent attempts of an optimization."""
+
+    plateau: bool  # no meaningful improvement over the window, while above convCrit
+    improvement: float  # relative GOF improvement over the window, from the fitted trend
+    gof: float  # current GOF
+    steps_to_convergence: float  # attempts needed to reach convCrit at the current trend
+
+    def summary(self, window: int = PLATEAU_WINDOW) -> str:
+        text = f"GOF improved by {self.improvement:.1%} in the last {window} attempts"
+        if self.plateau:
+            text = f"No meaningful improvement: {text}"
+        if math.isfinite(self.steps_to_convergence) and self.steps_to_convergence > 0:
+            text += f", convCrit reached in ~{self.steps_to_convergence:.3g} attempts at this rate"
+        return text
+
+
+def gof_trend(
+    accepted_steps: Sequence[int],
+    accepted_gofs: Sequence[float],
+    step: int,
+    window: int = PLATEAU_WINDOW,
+) -> tuple[float, float]:
+    """
+    Fit log(GOF) linearly against the attempts in the last window, returns (slope, current GOF).
+
+    The GOF only changes on accepted steps, so the GOF at the start of the window and the current
+    GOF at the latest step are included as points of the fit.
+    """
+    steps = np.asarray(accepted_steps, dtype=float)
+    gofs = np.asarray(accepted_gofs, dtype=float)
+    start = max(0, step - window)
+    before = np.flatnonzero(steps <= start)
+    in_window = steps > start
+    fit_steps = np.concatenate([[start] if len(before) else [], steps[in_window], [step]])
+    start_gof = [gofs[before[-1]]] if len(before) else []
+    fit_gofs = np.concatenate([start_gof, gofs[in_window], [gofs[-1]]])
+    if len(np.unique(fit_steps)) < 2:
+        return 0.0, float(gofs[-1])
+    slope, _ = np.polyfit(fit_steps, np.log(fit_gofs), 1)
+    return float(slope), float(gofs[-1])
+
+
+def detect_plateau(
+    accepted_steps: Sequence[int],
+    accepted_gofs: Sequence[float],
+    step: int,
+    conv_crit: float,
+    window: int = PLATEAU_WINDOW,
+    min_improvement: float = PLATEAU_MIN_IMPROVEMENT,
+) -> PlateauStatus | None:
+    """Judge the GOF trend of a running optimization, None until a full window has passed."""
+    if step < window or not len(accepted_gofs):
+        return None
+    slope, gof = gof_trend(accepted_steps, accepted_gofs, step, window)
+    improvement = 1 - math.exp(min(0.0, slope) * window)
+    if slope < 0 and conv_crit > 0:
+        steps_to_convergence = math.log(conv_crit / gof) / slope
+    else:
+        steps_to_convergence = math.inf
+    return PlateauStatus(
+        plateau=improvement < min_improvement and gof > conv_crit,
+        improvement=improvement,
+        gof=gof,
+        steps_to_convergence=max(0.0, steps_to_convergence),
+    )
+
+
+def limit_diagnostics(
+    parameter_set, fit_parameter_limits: dict, log_randoms: dict | None = None
+) -> list[str]:
+    """
+    Report fit parameters of which many contributions ended up at the limits of their range.
+
+    Args:
+        parameter_set (pandas.DataFrame): Parameter values of the contributions, as in McModel.
+        fit_parameter_limits (dict): (lower, upper) limits per fit parameter.
+        log_randoms (dict): Whether a parameter is drawn log-uniformly, per fit parameter.
+    """
+    diagnostics = []
+    for name, (lower, upper) in fit_parameter_limits.items():
+        values = np.asarray(parameter_set[name], dtype=float)
+        if (log_randoms or {}).get(name) and lower > 0:
+            values, lower_t, upper_t = np.log(values), math.log(lower), math.log(upper)
+        else:
+            lower_t, upper_t = lower, upper
+        position = (values - lower_t) / (upper_t - lower_t)
+        for fraction, limit, which in (
+            (np.mean(position <= LIMIT_EDGE), lower, "lower"),
+            (np.mean(position >= 1 - LIMIT_EDGE), upper, "upper"),
+        ):
+            if fraction >= LIMIT_PILEUP:
+                diagnostics.append(
+                    f"{fraction:.0%} of the contributions have {name} at the {which} limit"
+                    f" ({limit:g}), consider extending the fitParameterLimits."
+                )
+    return diagnostics
+
+
+def convergence_diagnostics(status: PlateauStatus | None, conv_crit: float) -> list[str]:
+    """Explain a GOF which levelled off above the convergence criterion."""
+    if status is None or not status.plateau:
+        return []
+    return [
+        f"The GOF levelled off at {status.gof:.4g}, above convCrit {conv_crit:g}. convCrit may be"
+        " unreachable with this model and these data uncertainties: check the model,"
+        " its limits and the uncertainty estimates, or raise convCrit."
+    ]
@@ -0,0 +1,69 @@
+# src/mcsas3gui/utils/hdf5_utils.py
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import h5py
+
+logger = logging.getLogger("McSAS3")
+
+HDF5_SUFFIXES = (".hdf5", ".h5", ".nxs")
+
+
+class HDF5NodeInfo(NamedTuple):
+    """Metadata of a single member of an HDF5 group, as shown in the structure browser."""
+
+    name: str  # name of the member within its parent group
+    path: str  # absolute HDF5 path, e.g. '/entry/result/Q'
+    is_group: bool
+    shape: tuple | None = None  # datasets only
+    dtype: str | None = None  # datasets only
+    n_children: int = 0  # groups only
+
+
+def is_hdf5_file(file_name: str | Path) -> bool:
+    """Check by suffix whether a file is expected to be an HDF5/NeXus file."""
+    return str(file_name).lower().endswith(HDF5_SUFFIXES)
+
+
+def file_signature(file_name: str | Path) -> tuple[str, int]:
+    """Return (resolved path, modification time in ns), used as cache key for file contents."""
+    path = Path(file_name).resolve()
+    return str(path), path.stat().st_mtime_ns
+
+
+def join_hdf5_path(group_path: str, name: str) -> str:
+    """Join an absolute HDF5 group path and a member name."""
+    return f"{group_path.rstrip('/')}/{name}"
+
+
+@lru_cache(maxsize=512)
+def _list_group(file_name: str, mtime_ns: int, group_path: str) -> tuple[HDF5NodeInfo, ...]:
+    """Read the direct members of a group. The mtime is part of the cache key only."""
+    nodes = []
+    with h5py.File(file_name, "r") as h5f:
+        group = h5f[group_path]
+        for name in group:
+            path = join_hdf5_path(group_path, name)
+            obj = group.get(name)  # None for dangling soft or external links
+            if obj is None:
+                logger.debug(f"Skipping unresolvable link {path} in {file_name}")
+                continue
+            if isinstance(obj, h5py.Group):
+                nodes.append(HDF5NodeInfo(name, path, True, n_children=len(obj)))
+            elif isinstance(obj, h5py.Dataset):
+                nodes.append(HDF5NodeInfo(name, path, False, obj.shape, str(obj.dtype)))
+    return tuple(nodes)
+
+
+def list_hdf5_group(file_name: str | Path, group_path: str = "/") -> tuple[HDF5NodeInfo, ...]:
+    """
+    List the direct members of a group in an HDF5/NeXus file without walking the full tree.
+
+    Results are cached per (file, mtime, group), so re-opening an unchanged file is free,
+    while a file modified on disk is read again.
+    """
+    file_key, mtime_ns = file_signature(file_name)
+    return _list_group(file_key, mtime_ns, group_path)
@@ -0,0 +1,107 @@
+import logging
+from collections import deque
+from pathlib import Path
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .histogramming import HistogramAnalysis, save_result_card
+from .rehistogramming import run_rehistogramming
+from .result_reader import index_status, result_cache
+
+logger = logging.getLogger("McSAS3")
+
+
+class HistogramBatchWorker(QThread):
+    progress_signal = pyqtSignal(int)
+    status_signal = pyqtSignal(int, str)
+    task_done_signal = pyqtSignal(int, bool, float)  # task, success, runtime in seconds
+    # task, result index, HistogramAnalysis for the result card
+    analysis_signal = pyqtSignal(int, int, object)
+    finished_signal = pyqtSignal()
+
+    def __init__(
+        self,
+        files: list[str | Path],
+        hist_ranges: list[dict],
+        result_indices: list[int] = (1,),
+        max_workers: int | None = None,
+        result_cards: bool = True,
+    ):
+        """
+        Args:
+            files (list): McSAS3 optimization result files to histogram.
+            hist_ranges (list): Histogram configurations, the documents of the YAML.
+            result_indices (list): Results in the files to histogram, all in one pass per file.
+            max_workers (int): Number of worker processes, defaults to one per core.
+            result_cards (bool): Whether the analyses are emitted for rendering result cards,
+                otherwise they are not kept.
+        """
+        super().__init__()
+        self.files = [Path(file_name) for file_name in files]
+        self.hist_ranges = hist_ranges
+        self.result_indices = list(result_indices)
+        self.max_workers = max_workers
+        self.result_cards = result_cards
+
+    def run(self):
+        """Histogram the files in parallel and store the histograms, without result cards."""
+        for row in range(len(self.files)):
+            self.status_signal.emit(row, "Running")
+        outcomes = run_rehistogramming(
+            self.files, self.hist_ranges, self.result_indices, self.max_workers, self.result_cards
+        )
+        file_outcomes = []
+        row = 0
+        for outcome in outcomes:  # per file, one outcome per result index
+            file_outcomes.append(outcome)
+            if len(file_outcomes) < len(self.result_indices):
+                continue
+            status = index_status({o.result_index: o.ok for o in file_outcomes})
+            self.status_signal.emit(row, status)
+            for outcome in file_outcomes:
+                if not outcome.ok:
+                    logger.error(
+                        f"Histogramming of {outcome.file_name} #{outcome.result_index} failed:"
+                        f" {outcome.error}"
+                    )
+                elif outcome.analysis is not None:
+                    self.analysis_signal.emit(row, outcome.result_index, outcome.analysis)
+            ok = all(o.ok for o in file_outcomes)
+            self.task_done_signal.emit(row, ok, outcome.runtime)
+            self.progress_signal.emit(int((row + 1) / len(self.files) * 100))
+            file_outcomes = []  # the analyses are only held by the result card worker
+            row += 1
+        logger.info(result_cache.stats().summary())
+        self.finished_signal.emit()
+
+
+class ResultCardWorker(QThread):
+    rendered_signal = pyqtSignal(int, str)  # task, error message (empty on success)
+
+    def __init__(self):
+        super().__init__()
+        self.pending = deque()  # (task, HistogramAnalysis, result card path) still to render
+        self.finished.connect(self._restart_if_pending)
+
+    def add(self, row: int, analysis: HistogramAnalysis, path: Path):
+        """Queue a result card and start rendering if idle, behind any other work."""
+        self.pending.append((row, analysis, path))
+        if not self.isRunning():
+            self.start(QThread.Priority.LowestPriority)
+
+    def _restart_if_pending(self):
+        if self.pending:  # added while the last card was finishing
+            self.start(QThread.Priority.LowestPriority)
+
+    def run(self):
+        """Render the queued result cards one after another."""
+        while self.pending:
+            row, analysis, path = self.pending.popleft()
+            try:
+                save_result_card(analysis, path)
+                error = ""
+            except Exception as e:
+                logger.warning(f"Could not render the result card {path}: {e}")
+                error = str(e)
+            del analysis  # not held until the next card is rendered
+            self.rendered_signal.emit(row, error)
@@ -0,0 +1,40 @@
+import logging
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .histogramming import analyse
+from .result_reader import result_cache
+
+logger = logging.getLogger("McSAS3")
+
+
+class HistogramWorker(QThread):
+    # HistogramAnalysis, error message (empty on success)
+    finished_signal = pyqtSignal(object, str)
+
+    def __init__(self, file_name: str | Path, hist_ranges: list[dict], result_index: int = 1):
+        """
+        Args:
+            file_name (str | Path): McSAS3 optimization result file.
+            hist_ranges (list): Histogram configurations, the documents of the YAML.
+            result_index (int): Result in the file to histogram.
+        """
+        super().__init__()
+        self.file_name = Path(file_name)
+        self.hist_ranges = hist_ranges
+        self.result_index = result_index
+
+    def run(self):
+        """Take the result from the cache, reading the file if needed, and histogram it."""
+        start = time.perf_counter()
+        try:
+            result = result_cache.get(self.file_name, self.result_index)
+            analysis = analyse(result, self.hist_ranges)
+        except Exception as e:
+            logger.error(f"Histogramming of {self.file_name} failed: {e}")
+            self.finished_signal.emit(None, f"{type(e).__name__}: {e}")
+            return
+        logger.debug(f"Histogrammed {self.file_name} in {time.perf_counter() - start:.3f} s")
+        self.finished_signal.emit(analysis, "")
@@ -0,0 +1,502 @@
+# src/mcsas3gui/utils/histogramming.py
+
+import logging
+from pathlib import Path
+from typing import NamedTuple
+
+import h5py
+import numpy as np
+import pandas
+from matplotlib.figure import Figure
+
+from .campaign_container import open_result, split_address
+from .result_reader import ResultData, result_cache
+
+logger = logging.getLogger("McSAS3")
+
+MODE_KEYS = ("totalValue", "mean", "variance", "skew", "kurtosis")
+OPT_KEYS = ("scaling", "background", "gof", "accepted", "step")
+# from SasModels units (1/(cm sr) for dimensions in Angstrom) to absolute units, as in McSAS3
+CORRECTION_FACTOR = 1e-5
+BIN_SCALES = ("linear", "log", "auto")
+BIN_WEIGHTINGS = ("vol",)  # the only weighting McSAS3 implements
+
+
+class HistogramAnalysis(NamedTuple):
+    """Histograms and population statistics averaged over the repetitions, as McAnalysis."""
+
+    hist_ranges: list  # histogram configurations, with rangeMin and rangeMax filled in
+    histograms: list  # DataFrame per range with xMean, xWidth, yMean, yStd
+    modes: pandas.DataFrame  # valMean and valStd per mode (columns) and range (rows)
+    opt_averages: pandas.DataFrame  # valMean and valStd per optimization parameter
+    model_i_mean: np.ndarray  # scaled model intensity, averaged over the repetitions
+    model_i_std: np.ndarray
+    meas_data: dict
+    n_repetitions: int
+    repetitions: np.ndarray  # repetition indices, in the order of the rows below
+    bin_edges: list  # per range
+    repetition_histograms: list  # (repetition, bin) array per range
+    repetition_modes: list  # DataFrame per range with the modes (columns) per repetition
+
+    def population_report(self, index: int) -> str:
+        """Population statistics of a histogram range, formatted as in the McSAS3 result card."""
+        hist_range = self.hist_ranges[index]
+        text = (
+            f"For {hist_range['rangeMin']: 0.02e} ≤ {hist_range['parameter']} ≤"
+            f" {hist_range['rangeMax']: 0.02e}, vol-weighted \n"
+        )
+        text += "\n".rjust(48, "-")
+        for key in MODE_KEYS:
+            text += _format_statistic(
+                key, self.modes.loc[index, (key, "valMean")], self.modes.loc[index, (key, "valStd")]
+            )
+        return text
+
+    def run_report(self) -> str:
+        """Optimization statistics, formatted as in the McSAS3 result card."""
+        text = (
+            f"For {np.min(self.meas_data['Q']): 0.02e} ≤ Q (1/nm) ≤"
+            f" {np.max(self.meas_data['Q']): 0.02e}\n"
+        )
+        text += "\n".rjust(50, "-")
+        for key in OPT_KEYS:
+            text += _format_statistic(
+                key, self.opt_averages.loc[key, "valMean"], self.opt_averages.loc[key, "valStd"]
+            )
+        return text
+
+
+def _format_statistic(name: str, mean: float, std: float) -> str:
+    if mean != 0:
+        return f"{name.ljust(10)}: {mean: 0.02e} ± {std: 0.02e} (± {std / mean * 100: 0.02f} %) \n"
+    return f"{name.ljust(10)}: {mean: 0.02e} ± {std: 0.02e} \n"
+
+
+def check_hist_range(hist_range: dict, fit_parameters) -> None:
+    """Raise a ValueError for a histogram configuration McSAS3 would not accept."""
+    parameter = hist_range.get("parameter")
+    if parameter not in fit_parameters:
+        raise ValueError(
+            f"Histogram parameter {parameter!r} is not a fit parameter: {list(fit_parameters)}"
+        )
+    if hist_range.get("binScale") not in BIN_SCALES:
+        raise ValueError(f"binScale must be one of {BIN_SCALES}")
+    if hist_range.get("binWeighting") not in BIN_WEIGHTINGS:
+        raise ValueError(f"binWeighting must be one of {BIN_WEIGHTINGS}")
+    if not isinstance(hist_range.get("autoRange"), bool):
+        raise ValueError("autoRange must be true or false")
+    n_bin = hist_range.get("nBin")
+    if not isinstance(n_bin, int) or isinstance(n_bin, bool) or n_bin < 1:
+        raise ValueError("nBin must be an integer > 0")
+
+
+def resolve_hist_range(hist_range: dict, fit_parameter_limits: dict) -> dict:
+    """A checked copy of a histogram configuration, with rangeMin and rangeMax filled in."""
+    check_hist_range(hist_range, fit_parameter_limits)
+    hist_range = dict(hist_range)
+    if hist_range["autoRange"]:
+        limits = fit_parameter_limits[hist_range["parameter"]]
+        hist_range["rangeMin"], hist_range["rangeMax"] = limits
+    else:
+        hist_range["rangeMin"] = hist_range["presetRangeMin"]
+        hist_range["rangeMax"] = hist_range["presetRangeMax"]
+    return hist_range
+
+
+def bin_edges(hist_range: dict, values: np.ndarray) -> np.ndarray:
+    """Bin edges of a histogram range, with rangeMin and rangeMax filled in."""
+    range_min, range_max, n_bin = hist_range["rangeMin"], hist_range["rangeMax"], hist_range["nBin"]
+    if hist_range["binScale"] == "linear":
+        return np.linspace(range_min, range_max, n_bin + 1)
+    if hist_range["binScale"] == "log":
+        return np.logspace(np.log10(range_min), np.log10(range_max), n_bin + 1)
+    return np.histogram_bin_edges(values, bins="auto", range=[range_min, range_max])
+
+
+def contribution_weights(result: ResultData, bin_weighting: str) -> np.ndarray:
+    """
+    (repetition, contribution) weight of each contribution in the histograms.
+
+    The contributions are volume-weighted by the optimization already, so counting them gives
+    the volume-weighted histogram, as in McModelHistogrammer.
+    """
+    if bin_weighting == "vol":
+        return np.ones_like(result.volumes)
+    raise ValueError(f"binWeighting must be one of {BIN_WEIGHTINGS}")
+
+
+def binned_weights(
+    sorted_values: np.ndarray, cumulative_weights: np.ndarray, edges: np.ndarray
+) -> np.ndarray:
+    """
+    (repetition, bin) sum of the weights per bin, as np.histogram bins them: the last bin
+    includes its upper edge.
+
+    Args:
+        sorted_values (np.ndarray): (repetition, contribution) values, sorted per repetition.
+        cumulative_weights (np.ndarray): (repetition, contribution + 1) cumulative sum of the
+            weights in the order of sorted_values, starting at 0.
+        edges (np.ndarray): Bin edges.
+    """
+    rows = np.arange(len(sorted_values))[:, np.newaxis]
+    index = np.array([np.searchsorted(values, edges) for values in sorted_values])
+    index[:, -1] = [np.searchsorted(values, edges[-1], side="right") for values in sorted_values]
+    return np.diff(cumulative_weights[rows, index], axis=1)
+
+
+def population_modes(values: np.ndarray, range_min: float, range_max: float) -> np.ndarray:
+    """
+    (repetition, mode) count, mean, variance, skew and kurtosis of the contributions within
+    the range, NaN for repetitions without contributions in the range.
+
+    >>> population_modes(np.array([[1.0, 2.0, 3.0, 10.0]]), 0, 5)[0, :3]
+    array([3.        , 2.        , 0.66666667])
+    """
+    values = np.atleast_2d(values)
+    inside = (values >= range_min) & (values <= range_max)
+    count = inside.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(inside, values, 0).sum(axis=1) / count
+        deviation = np.where(inside, values - mean[:, np.newaxis], 0)
+        variance = (deviation**2).sum(axis=1) / count
+        sigma = np.sqrt(abs(variance))
+        skew = (deviation**3).sum(axis=1) / count / sigma**3
+        kurtosis = (deviation**4).sum(axis=1) / count / sigma**4
+    modes = np.column_stack([count.astype(float), mean, variance, skew, kurtosis])
+    modes[count == 0] = np.nan
+    return modes
+
+
+def analyse(result: ResultData, hist_ranges: list[dict]) -> HistogramAnalysis:
+    """
+    Histogram all repetitions of a result and average them, like McModelHistogrammer and
+    McAnalysis do, without storing anything.
+
+    All ranges are evaluated in one pass over the contributions: the values of a parameter are
+    sorted once for all ranges binning it, after which each range only looks up its bin edges,
+    and the population statistics are calculated once per parameter and range.
+
+    Args:
+        result (ResultData): As read by read_result() or from the result cache.
+        hist_ranges (list): Histogram configurations, the documents of a histogram config YAML.
+    """
+    hist_ranges = [resolve_hist_range(h, result.fit_parameter_limits) for h in hist_ranges]
+    scales = result.x0[:, 0] * CORRECTION_FACTOR
+    sorted_values, cumulative_weights, range_modes = {}, {}, {}
+    histograms, edges_list, rep_hists, rep_modes_list, modes = [], [], [], [], {}
+    for index, hist_range in enumerate(hist_ranges):
+        parameter, bin_weighting = hist_range["parameter"], hist_range["binWeighting"]
+        if parameter not in sorted_values:
+            order = np.argsort(result.parameters[parameter], axis=1)
+            sorted_values[parameter] = (
+                order,
+                np.take_along_axis(result.parameters[parameter], order, axis=1),
+            )
+        order, values = sorted_values[parameter]
+        if (parameter, bin_weighting) not in cumulative_weights:
+            weights = np.take_along_axis(contribution_weights(result, bin_weighting), order, axis=1)
+            cumulative_weights[parameter, bin_weighting] = np.pad(
+                np.cumsum(weights, axis=1), ((0, 0), (1, 0))
+            )
+        edges = bin_edges(hist_range, values[0])
+        if hist_range["binScale"] == "auto" and any(
+            not np.array_equal(bin_edges(hist_range, rep_values), edges) for rep_values in values
+        ):
+            raise ValueError("Automatic binning gives different bin edges per repetition")
+        counts = (
+            binned_weights(values, cumulative_weights[parameter, bin_weighting], edges)
+            * scales[:, np.newaxis]
+        )
+        range_key = (parameter, hist_range["rangeMin"], hist_range["rangeMax"])
+        if range_key not in range_modes:
+            range_modes[range_key] = population_modes(values, *range_key[1:])
+        rep_modes = pandas.DataFrame(range_modes[range_key], columns=MODE_KEYS)
+        rep_modes["totalValue"] *= scales
+        widths = np.diff(edges)
+        histograms.append(
+            pandas.DataFrame(
+                {
+                    "xMean": edges[:-1] + 0.5 * widths,
+                    "xWidth": widths,
+                    "yMean": counts.mean(axis=0),
+                    "yStd": counts.std(axis=0, ddof=1 if len(counts) > 1 else 0),
+                }
+            )
+        )
+        edges_list.append(edges)
+        rep_hists.append(counts)
+        rep_modes_list.append(rep_modes)
+        modes[index] = pandas.DataFrame(
+            {"valMean": rep_modes.mean(), "valStd": rep_modes.std(ddof=1)}
+        ).stack()
+    opts = pandas.DataFrame(
+        {
+            "scaling": result.x0[:, 0],
+            "background": result.x0[:, 1],
+            "gof": result.gof,
+            "accepted": result.accepted,
+            "step": result.step,
+        },
+        columns=OPT_KEYS,
+    )
+    model_i = result.model_i * result.x0[:, :1] + result.x0[:, 1:]
+    return HistogramAnalysis(
+        hist_ranges=hist_ranges,
+        histograms=histograms,
+        modes=pandas.DataFrame(modes).T,
+        opt_averages=pandas.DataFrame({"valMean": opts.mean(), "valStd": opts.std(ddof=1)}),
+        model_i_mean=model_i.mean(axis=0),
+        model_i_std=model_i.std(axis=0),
+        meas_data=result.meas_data,
+        n_repetitions=result.n_repetitions,
+        repetitions=result.repetitions,
+        bin_edges=edges_list,
+        repetition_histograms=rep_hists,
+        repetition_modes=rep_modes_list,
+    )
+
+
+def _write_group(h5f: h5py.Group, path: str, pairs) -> None:
+    """Write datasets into a group, replacing the ones there."""
+    group = h5f.require_group(path)
+    for key, value in pairs:
+        if key in group:
+            del group[key]
+        if value is None:  # not stored by McSAS3 either
+            continue
+        if isinstance(value, str):
+            value = np.array(value, dtype=h5py.string_dtype())
+        group.create_dataset(key, data=value)
+
+
+def _store_analysis(h5f: h5py.Group, result_index: int, analysis: HistogramAnalysis) -> None:
+    root = f"analyses/MCResult{result_index}"
+    if f"{root}/histograms" in h5f:
+        del h5f[f"{root}/histograms"]
+    for index, hist_range in enumerate(analysis.hist_ranges):
+        path = f"{root}/histograms/histRange{index}"
+        _write_group(h5f, path, hist_range.items())
+        for row, repetition in enumerate(analysis.repetitions):
+            _write_group(
+                h5f,
+                f"{path}/repetition{repetition}",
+                [
+                    *analysis.repetition_modes[index].iloc[row].items(),
+                    ("binEdges", analysis.bin_edges[index]),
+                    ("hist", analysis.repetition_histograms[index][row]),
+                ],
+            )
+        histogram = analysis.histograms[index].assign(Obs=np.nan, cdfMean=np.nan, cdfStd=np.nan)
+        _write_group(
+            h5f,
+            f"{path}/average",
+            [(key, column.values.astype(float)) for key, column in histogram.items()],
+        )
+        for mode in MODE_KEYS:
+            _write_group(
+                h5f,
+                f"{path}/average/{mode}",
+                [(stat, analysis.modes.loc[index, (mode, stat)]) for stat in ("valMean", "valStd")],
+            )
+    for key, row in analysis.opt_averages.iterrows():
+        _write_group(
+            h5f,
+            f"{root}/optimization/average/{key}",
+            [(k, row[k]) for k in ("valMean", "valStd")],
+        )
+    _write_group(
+        h5f,
+        f"{root}/optimization/average",
+        [("modelIMean", analysis.model_i_mean), ("modelIStd", analysis.model_i_std)],
+    )
+
+
+def store_analyses(file_name: str | Path, analyses: dict) -> None:
+    """
+    Write the histograms of several results into the result file, opening it once, where
+    McModelHistogrammer and McAnalysis store them, replacing the histograms of earlier runs.
+
+    Args:
+        file_name (str | Path): McSAS3 optimization result file, or sample in a container.
+        analyses (dict): HistogramAnalysis per result index.
+    """
+    with open_result(file_name, "a") as h5f:
+        for result_index, analysis in analyses.items():
+            _store_analysis(h5f, result_index, analysis)
+
+
+def store_analysis(file_name: str | Path, result_index: int, analysis: HistogramAnalysis) -> None:
+    """Write the histograms of a result into the result file, see store_analyses()."""
+    store_analyses(file_name, {result_index: analysis})
+
+
+def result_card_path(
+    file_name: str | Path, card_format: str = "pdf", result_index: int = 1
+) -> Path:
+    """
+    Result card next to the result file, as the McSAS3 histogrammer stores it, with the result
+    index in the name for results other than the first. The result card of a sample in a
+    campaign container is next to the container, with the sample in the name.
+    """
+    file_name, sample = split_address(file_name)
+    if sample is not None:
+        file_name = file_name.with_name(f"{file_name.stem}_{sample}.h5")
+    if result_index != 1:
+        return file_name.with_name(f"{file_name.stem}_result{result_index}.{card_format}")
+    return file_name.with_suffix(f".{card_format}")
+
+
+def histogram_results(
+    file_name: str | Path,
+    hist_ranges: list[dict],
+    result_indices: list[int],
+    pdf: bool = True,
+    store: bool = True,
+) -> dict:
+    """
+    Histogram several results of a file and store the histograms in it, reading and writing
+    the file once for all of them. Without store, the histograms are only calculated, for the
+    caller to store them.
+
+    Returns the HistogramAnalysis per result index, or the exception raised for it, so that a
+    missing result does not stop the others. See histogram_file() for the other arguments.
+    """
+    results = result_cache.get_many(file_name, result_indices)
+    outcomes = {}
+    for result_index, result in results.items():
+        if isinstance(result, Exception):
+            outcomes[result_index] = result
+            continue
+        try:
+            outcomes[result_index] = analyse(result, hist_ranges)
+        except ValueError as e:
+            outcomes[result_index] = e
+    analyses = {i: a for i, a in outcomes.items() if isinstance(a, HistogramAnalysis)}
+    if analyses and store:
+        store_analyses(file_name, analyses)
+        for result_index in analyses:
+            # storing the histograms did not change the contributions
+            result_cache.put(results[result_index])
+    if pdf:
+        for result_index, analysis in analyses.items():
+            save_result_card(analysis, result_card_path(file_name, "pdf", result_index))
+    return outcomes
+
+
+def histogram_file(
+    file_name: str | Path, hist_ranges: list[dict], result_index: int = 1, pdf: bool = True
+) -> HistogramAnalysis:
+    """
+    Histogram a result file and store the histograms in it, like the McSAS3 command line
+    histogrammer. The result is taken from the result cache, so that histogramming a file again
+    with other settings does not read the contributions again.
+
+    Args:
+        file_name (str | Path): McSAS3 optimization result file, or sample in a container.
+        hist_ranges (list): Histogram configurations, the documents of a histogram config YAML.
+        result_index (int): Result in the file to histogram.
+        pdf (bool): Also save the result card next to the file, with the suffix .pdf.
+    """
+    outcome = histogram_results(file_name, hist_ranges, [result_index], pdf)[result_index]
+    if isinstance(outcome, Exception):
+        raise outcome
+    return outcome
+
+
+def save_result_card(analysis: HistogramAnalysis, path: str | Path) -> Path:
+    """Render the result card into a file, like the McSAS3 histogrammer does next to the result."""
+    figure = Figure(figsize=(12, 5))
+    render_result_card(figure, analysis)
+    figure.savefig(path)
+    return Path(path)
+
+
+_TEXT_STYLE = dict(
+    family="monospace",
+    horizontalalignment="center",
+    verticalalignment="bottom",
+    multialignment="left",
+)
+
+
+def _draw_histogram(text_ax, ax, analysis: HistogramAnalysis, index: int) -> None:
+    histogram, hist_range = analysis.histograms[index], analysis.hist_ranges[index]
+    ax.bar(
+        histogram["xMean"],
+        histogram["yMean"],
+        align="center",
+        width=histogram["xWidth"],
+        yerr=histogram["yStd"],
+    )
+    ax.set_xscale("log" if hist_range["binScale"] == "log" else "linear")
+    ax.set_xlabel(hist_range["parameter"])
+    ax.set_ylabel("Vol. frac. \n (relative or absolute)")
+    text_ax.axis("off")
+    text_ax.text(
+        0.5, 0, analysis.population_report(index), transform=text_ax.transAxes, **_TEXT_STYLE
+    )
+
+
+def _draw_fit(text_ax, ax, analysis: HistogramAnalysis) -> None:
+    q = analysis.meas_data["Q"][0]
+    ax.errorbar(
+        q,
+        analysis.meas_data["I"],
+        yerr=analysis.meas_data["ISigma"],
+        label="Measured data",
+        zorder=1,
+    )
+    ax.plot(q, analysis.model_i_mean, zorder=2, label="McSAS3 fit")
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Q (1/nm)")
+    ax.set_ylabel("I (1/(m sr))")
+    ax.legend()
+    text_ax.axis("off")
+    text_ax.text(0.5, 0, analysis.run_report(), transform=text_ax.transAxes, **_TEXT_STYLE)
+
+
+def _same_histogram(previous: HistogramAnalysis, analysis: HistogramAnalysis, index: int) -> bool:
+    return (
+        previous.hist_ranges[index] == analysis.hist_ranges[index]
+        and previous.histograms[index].equals(analysis.histograms[index])
+        and previous.modes.loc[index].equals(analysis.modes.loc[index])
+    )
+
+
+def render_result_card(
+    figure: Figure, analysis: HistogramAnalysis, previous: HistogramAnalysis | None = None
+) -> list[int]:
+    """
+    Draw the McSAS3 result card into a figure: the data and fit with the optimization
+    statistics, and each histogram with its population statistics.
+
+    Given the analysis drawn into the figure before, with the same number of ranges of the same
+    result, only the histograms that changed are drawn again, into their axes. Returns the
+    indices of the histograms drawn.
+    """
+    n_histograms = len(analysis.histograms)
+    if (
+        previous is not None
+        and len(previous.histograms) == n_histograms
+        and len(figure.axes) == 2 * (1 + n_histograms)
+        and np.array_equal(previous.meas_data["I"], analysis.meas_data["I"])
+        and np.array_equal(previous.model_i_mean, analysis.model_i_mean)
+    ):
+        axes = np.array(figure.axes).reshape(2, 1 + n_histograms)
+        changed = [i for i in range(n_histograms) if not _same_histogram(previous, analysis, i)]
+        for index in changed:
+            axes[0, 1 + index].clear()
+            axes[1, 1 + index].clear()
+            _draw_histogram(axes[0, 1 + index], axes[1, 1 + index], analysis, index)
+        return changed
+
+    figure.clear()
+    axes = figure.subplots(
+        nrows=2, ncols=1 + n_histograms, squeeze=False, gridspec_kw={"height_ratios": [1, 2]}
+    )
+    for index in range(n_histograms):
+        _draw_histogram(axes[0, 1 + index], axes[1, 1 + index], analysis, index)
+    _draw_fit(axes[0, 0], axes[1, 0], analysis)
+    figure.tight_layout()
+    return list(range(n_histograms))
@@ -0,0 +1,143 @@
+# src/mcsas3gui/utils/kernel_cache.py
+
+import logging
+import os
+import platform
+import re
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import sasmodels
+
+from .file_utils import get_user_data_path
+
+logger = logging.getLogger("McSAS3")
+
+KERNEL_CACHE_ENV = "MCSAS3GUI_KERNEL_CACHE"  # overrides the base directory of the cache
+# file names of compiled sasmodels kernels, e.g. sas64_x86_64_sphere_57917324.so
+KERNEL_FILE_PATTERN = re.compile(
+    rf"sas(?P<bits>\d+)_{re.escape(platform.machine())}_(?P<model>.+)_(?P<tag>[0-9A-Fa-f]+)"
+)
+
+
+class KernelCacheEntry(NamedTuple):
+    """A compiled model kernel in the cache."""
+
+    path: Path
+    model: str  # sasmodels model id, compound models are compiled in parts
+    bits: int  # precision of the kernel: 32 (single) or 64 (double)
+    size: int  # bytes
+    last_used: datetime  # access time, if the file system keeps track of it
+
+    @property
+    def precision(self) -> str:
+        return {32: "single", 64: "double", 128: "long double"}.get(self.bits, f"{self.bits} bit")
+
+
+def kernel_cache_root() -> Path:
+    """Base directory of the kernel caches of all sasmodels versions."""
+    if os.environ.get(KERNEL_CACHE_ENV):
+        return Path(os.environ[KERNEL_CACHE_ENV])
+    return get_user_data_path() / "kernels"
+
+
+def kernel_cache_dir() -> Path:
+    """
+    Directory of the compiled kernels for the installed sasmodels version.
+
+    Kernels compiled by a different sasmodels version are never reused, so each version gets its
+    own directory. Within it, sasmodels names the kernels by model, precision and a hash of the
+    model source.
+    """
+    return kernel_cache_root() / f"sasmodels-{sasmodels.__version__}"
+
+
+def configure_kernel_cache(cache_dir: Path | None = None) -> Path:
+    """
+    Let sasmodels compile kernels into the cache directory, in this and all child processes.
+
+    The directory is passed on through SAS_DLL_PATH in the environment, which is inherited by
+    the optimization and histogramming processes started from the GUI. Kernels running through
+    OpenCL or CUDA are cached by their drivers instead.
+    """
+    cache_dir = Path(cache_dir or kernel_cache_dir())
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["SAS_DLL_PATH"] = str(cache_dir)
+    if "sasmodels.kerneldll" in sys.modules:  # reads the environment on import only
+        sys.modules["sasmodels.kerneldll"].SAS_DLL_PATH = str(cache_dir)
+    logger.debug(f"Compiled model kernels are cached in: {cache_dir}")
+    return cache_dir
+
+
+def cache_entries(cache_dir: Path | None = None) -> list[KernelCacheEntry]:
+    """All compiled kernels in the cache directory, sorted by model name."""
+    cache_dir = Path(cache_dir or kernel_cache_dir())
+    if not cache_dir.is_dir():
+        return []
+    entries = []
+    for path in cache_dir.iterdir():
+        match = KERNEL_FILE_PATTERN.fullmatch(path.name.split(".")[0])
+        if match is None or not path.is_file():
+            continue
+        stat = path.stat()
+        entries.append(
+            KernelCacheEntry(
+                path=path,
+                model=match["model"],
+                bits=int(match["bits"]),
+                size=stat.st_size,
+                last_used=datetime.fromtimestamp(max(stat.st_atime, stat.st_mtime)),
+            )
+        )
+    return sorted(entries, key=lambda entry: (entry.model, entry.bits))
+
+
+def cache_size(cache_dir: Path | None = None) -> int:
+    """Total size of the compiled kernels in bytes."""
+    return sum(entry.size for entry in cache_entries(cache_dir))
+
+
+def evict(entries: list[KernelCacheEntry]) -> int:
+    """Remove the given kernels from the cache, returns the number of bytes freed."""
+    freed = 0
+    for entry in entries:
+        try:
+            entry.path.unlink()
+            freed += entry.size
+        except OSError as e:  # e.g. loaded and locked by a running process on Windows
+            logger.warning(f"Could not remove compiled kernel {entry.path.name}: {e}")
+    return freed
+
+
+def stale_cache_dirs() -> list[Path]:
+    """Cache directories of other sasmodels versions, which are not used anymore."""
+    root, current = kernel_cache_root(), kernel_cache_dir()
+    if not root.is_dir():
+        return []
+    return sorted(
+        path
+        for path in root.iterdir()
+        if path.is_dir() and path.name.startswith("sasmodels-") and path != current
+    )
+
+
+def remove_stale_caches() -> None:
+    """Remove the cache directories of other sasmodels versions."""
+    for path in stale_cache_dirs():
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def precompile(model_name: str, model_dtype: str | None = None) -> None:
+    """
+    Build the kernel of a model as McModel does, compiling it into the cache if needed.
+
+    Args:
+        model_name (str): sasmodels model name, e.g. 'sphere@hardsphere'.
+        model_dtype (str): modelDType of the run configuration.
+    """
+    from sasmodels.core import load_model  # compiler setup, only needed here
+
+    load_model(model_name, dtype=model_dtype)  # compiles, the library is loaded on first use
@@ -0,0 +1,39 @@
+import logging
+from collections import deque
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .kernel_cache import precompile
+
+logger = logging.getLogger("McSAS3")
+
+
+class KernelPrecompileWorker(QThread):
+    compiled_signal = pyqtSignal(str, str)  # model name, error message (empty on success)
+
+    def __init__(self):
+        super().__init__()
+        self.pending = deque()  # (model name, model dtype) pairs still to compile
+        self.finished.connect(self._restart_if_pending)
+
+    def add(self, model_name: str, model_dtype: str | None):
+        """Queue a model for compilation and start working if idle."""
+        self.pending.append((model_name, model_dtype))
+        if not self.isRunning():
+            self.start()
+
+    def _restart_if_pending(self):
+        if self.pending:  # added while the last compilation was finishing
+            self.start()
+
+    def run(self):
+        """Compile the queued models one after another."""
+        while self.pending:
+            model_name, model_dtype = self.pending.popleft()
+            try:
+                precompile(model_name, model_dtype)
+                logger.debug(f"Model kernel for {model_name} ({model_dtype}) is ready.")
+                self.compiled_signal.emit(model_name, "")
+            except Exception as e:
+                logger.warning(f"Could not precompile the model kernel for {model_name}: {e}")
+                self.compiled_signal.emit(model_name, str(e))
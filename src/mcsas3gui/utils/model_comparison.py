@@ -0,0 +1,147 @@
+# src/mcsas3gui/utils/model_comparison.py
+
+import hashlib
+import logging
+import math
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+import h5py
+import numpy as np
+import pandas
+
+from .file_utils import make_out_path
+
+logger = logging.getLogger("McSAS3")
+
+
+class MatrixCell(NamedTuple):
+    """Outcome of the optimization of one input file with one run configuration."""
+
+    input_file: Path
+    run_config: Path
+    result_file: Path
+    ok: bool = False
+    runtime: float = math.nan  # seconds
+    gof: float = math.nan  # mean of the final GOF of the repetitions
+    gof_std: float = math.nan  # spread of the final GOF over the repetitions
+
+
+def run_config_tags(run_configs: list[str | Path]) -> dict[Path, str]:
+    """
+    Short tag per run configuration for the output file names: the file name without suffix.
+
+    Configurations with the same file name in different directories get a hash of their path
+    appended, so the tags are unique and do not change between runs.
+    """
+    run_configs = [Path(run_config) for run_config in run_configs]
+    stem_counts = Counter(run_config.stem for run_config in run_configs)
+    tags = {}
+    for run_config in run_configs:
+        tag = run_config.stem
+        if stem_counts[tag] > 1:
+            tag = f"{tag}_{_path_hash(run_config)}"
+        tags[run_config] = tag
+    return tags
+
+
+def _path_hash(path: Path) -> str:
+    return hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:6]
+
+
+def matrix_tasks(
+    files: list[Path], run_configs: list[str | Path], temp_dir: Path
+) -> list[tuple[Path, Path, Path]]:
+    """
+    (input file, run configuration, result file) of each cell of the matrix.
+
+    The cells are ordered by input file, so all run configurations of a file follow each other
+    and its prepared data is taken from the store after the first.
+
+    A tag may make the result file of one input file that of another, e.g. x.nxs with the tag
+    a_b and x_a.nxs with the tag b, or two input files may only differ in their suffix. The
+    colliding result files get a hash of the path of their input file appended to the tag.
+    Raises ValueError if they still collide.
+    """
+    tags = run_config_tags(run_configs)
+    cells = [
+        (Path(file_name), run_config, tag)
+        for file_name in files
+        for run_config, tag in tags.items()
+    ]
+    result_files = [make_out_path(file_name, temp_dir, tag) for file_name, _, tag in cells]
+    counts = Counter(result_files)
+    result_files = [
+        (
+            make_out_path(file_name, temp_dir, f"{tag}_{_path_hash(file_name)}")
+            if counts[result_file] > 1
+            else result_file
+        )
+        for (file_name, _, tag), result_file in zip(cells, result_files)
+    ]
+    collisions = sorted({str(f) for f, n in Counter(result_files).items() if n > 1})
+    if collisions:
+        raise ValueError(f"Result files of the comparison collide: {', '.join(collisions)}")
+    return [
+        (file_name, run_config, result_file)
+        for (file_name, run_config, _), result_file in zip(cells, result_files)
+    ]
+
+
+def result_gof(result_file: str | Path, result_index: int = 1) -> tuple[float, float]:
+    """Mean and standard deviation of the final GOF over the repetitions in a result file."""
+    with h5py.File(result_file, "r") as h5f:
+        optimization = h5f[f"/analyses/MCResult{result_index}/optimization"]
+        gofs = [
+            float(group["gof"][()])
+            for name, group in optimization.items()
+            if name.startswith("repetition") and "gof" in group
+        ]
+    if not gofs:
+        return math.nan, math.nan
+    return float(np.mean(gofs)), float(np.std(gofs))
+
+
+def evaluate_cell(
+    input_file: Path, run_config: Path, result_file: Path, ok: bool, runtime: float
+) -> MatrixCell:
+    """Collect the GOF of a finished cell from its result file."""
+    cell = MatrixCell(Path(input_file), Path(run_config), Path(result_file), ok, runtime)
+    if not ok:
+        return cell
+    try:
+        gof, gof_std = result_gof(result_file)
+    except (OSError, KeyError) as e:
+        logger.warning(f"Could not read the GOF from {result_file}: {e}")
+        return cell._replace(ok=False)
+    return cell._replace(gof=gof, gof_std=gof_std)
+
+
+def summary_table(cells: list[MatrixCell]) -> pandas.DataFrame:
+    """GOF and runtime per input file (rows) and run configuration (columns)."""
+    tags = run_config_tags(list(dict.fromkeys(cell.run_config for cell in cells)))
+    input_files = set(cell.input_file for cell in cells)
+    unique_names = len(set(input_file.name for input_file in input_files)) == len(input_files)
+    records = pandas.DataFrame(
+        {
+            "file": [
+                cell.input_file.name if unique_names else str(cell.input_file) for cell in cells
+            ],
+            "run_config": [tags[cell.run_config] for cell in cells],
+            "GOF": [cell.gof for cell in cells],
+            "GOF std": [cell.gof_std for cell in cells],
+            "runtime (s)": [cell.runtime for cell in cells],
+        }
+    )
+    table = records.pivot(index="file", columns="run_config").reindex(records["file"].unique())
+    # group the columns by run configuration, in the order of the configurations
+    table = table.reorder_levels([1, 0], axis=1)
+    return table[[tag for tag in tags.values() if tag in table.columns.get_level_values(0)]]
+
+
+def write_summary(cells: list[MatrixCell], path: Path) -> Path:
+    """Store the summary table as CSV, with a header row per level of the columns."""
+    summary_table(cells).to_csv(path)
+    logger.info(f"Model comparison summary stored in: {path}")
+    return path
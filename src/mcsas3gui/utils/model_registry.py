@@ -0,0 +1,61 @@
+# src/mcsas3gui/utils/model_registry.py
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from mcsas3.mc_hat import McHat
+from mcsas3.mc_model import McModel
+from sasmodels.core import list_models, load_model_info
+from sasmodels.modelinfo import ModelInfo
+
+# magnetic parameters, which are not used by McSAS3
+EXCLUDED_PARAMETERS = re.compile(r"up_.*|.*_M0|.*_mtheta|.*_mphi")
+# keys of a run configuration, for McModel, McOpt and McHat
+RUN_CONFIG_KEYS = (
+    *McModel.settables,
+    "maxIter",
+    "maxAccept",
+    "convCrit",
+    "weighting",
+    *McHat.storeKeys,
+)
+
+
+@lru_cache(maxsize=None)
+def list_model_names() -> tuple[str, ...]:
+    """Names of all sasmodels models, compound models such as 'sphere@hardsphere' not included."""
+    return tuple(list_models())
+
+
+@lru_cache(maxsize=256)
+def get_model_info(model_name: str) -> ModelInfo:
+    """Parsed sasmodels model info, raises an exception if the model does not exist."""
+    return load_model_info(model_name)
+
+
+@lru_cache(maxsize=256)
+def _filtered_parameters(model_name: str) -> tuple[tuple[str, float], ...]:
+    return tuple(
+        (param, default_value)
+        for param, default_value in get_model_info(model_name).parameters.defaults.items()
+        if not EXCLUDED_PARAMETERS.match(param)
+    )
+
+
+def model_parameters(model_name: str) -> dict[str, float]:
+    """Default values of the model parameters, without the magnetic ones."""
+    return dict(_filtered_parameters(model_name))
+
+
+def completion_words(model_names: Iterable[str] = ()) -> list[str]:
+    """Words to offer for completion in a run configuration: keys, models and their parameters."""
+    words = [*RUN_CONFIG_KEYS, *list_model_names()]
+    for model_name in model_names:
+        if not model_name or model_name.startswith("mcsas_"):
+            continue
+        try:
+            words += model_parameters(model_name)
+        except Exception:  # incomplete model name while typing
+            pass
+    return sorted(set(words), key=str.lower)
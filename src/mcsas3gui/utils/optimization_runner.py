@@ -0,0 +1,132 @@
+# src/mcsas3gui/utils/optimization_runner.py
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import h5py
+from mcsas3.mc_hat import McHat
+
+from .prepared_data import PreparedData, copy_to_result_file, load_meas_data, prepare_data
+from .result_reader import parse_result_indices
+from .yaml_utils import load_yaml_file
+
+logger = logging.getLogger("McSAS3")
+
+
+def run_optimization(
+    data_file: Path,
+    read_config_file: Path,
+    result_file: Path,
+    run_config_file: Path,
+    result_index: int | list[int] = 1,
+    delete_if_exists: bool = False,
+    n_threads: int = 0,
+    source_file: Path | None = None,
+) -> dict:
+    """
+    Optimize a data file, like the McSAS3 command line runner does.
+
+    The data is taken from the prepared data store instead of being read and rebinned again, so
+    that optimizing a file with several run configurations prepares its data only once.
+
+    Several result indices can be given to optimize the data into each of them in one job: the
+    data is prepared once, and each result is optimized independently with the run
+    configuration. Returns the error message per result index, None where the optimization
+    succeeded; raises if the only result index failed.
+
+    For a data file copied for the job, e.g. staged on scratch, source_file is the original:
+    the results name it as their data file, rather than the copy that is gone after the job.
+    """
+    result_indices = [result_index] if isinstance(result_index, int) else list(result_index)
+    if result_file.is_file() and delete_if_exists and result_file != data_file:
+        result_file.unlink()
+    read_config = {**load_yaml_file(read_config_file), "resultIndex": result_indices[0]}
+    prepared = prepare_data(data_file, read_config, source=source_file)
+    run_config = load_yaml_file(run_config_file)
+    if n_threads > 0:
+        run_config["nCores"] = n_threads
+    meas_data = load_meas_data(prepared)
+    errors = {}
+    for index in result_indices:
+        try:
+            _optimize(prepared, meas_data, run_config, result_file, index)
+            errors[index] = None
+        except Exception as e:
+            if len(result_indices) == 1:
+                raise
+            logger.error(f"Optimization of {data_file} into result #{index} failed: {e}")
+            errors[index] = f"{type(e).__name__}: {e}"
+    return errors
+
+
+def _optimize(
+    prepared: PreparedData, meas_data: dict, run_config: dict, result_file: Path, result_index: int
+):
+    if result_index == 1:
+        copy_to_result_file(prepared, result_file, result_index)
+        mh = McHat(seed=None, resultIndex=result_index, **run_config)
+        mh.run(meas_data, result_file, resultIndex=result_index)
+        return
+    # McSAS3 stores every result index under MCResult1 (its ResultIndex resets the index on
+    # initialization), so other results are optimized in a scratch file and moved into place
+    fd, scratch_name = tempfile.mkstemp(suffix=".hdf5", dir=result_file.parent)
+    os.close(fd)
+    scratch_file = Path(scratch_name)
+    try:
+        scratch_file.unlink()
+        copy_to_result_file(prepared, scratch_file, 1)
+        mh = McHat(seed=None, resultIndex=1, **run_config)
+        mh.run(meas_data, scratch_file, resultIndex=1)
+        target_path = f"/analyses/MCResult{result_index}"
+        with h5py.File(scratch_file, "r") as source, h5py.File(result_file, "a") as target:
+            if target_path in target:
+                del target[target_path]
+            source.copy(
+                source["/analyses/MCResult1"],
+                target.require_group("analyses"),
+                name=f"MCResult{result_index}",
+            )
+    finally:
+        scratch_file.unlink(missing_ok=True)
+
+
+def main():
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(
+        description="Runs a McSAS3 optimization on prepared data, with the arguments of the"
+        " McSAS3 command line runner."
+    )
+    parser.add_argument("-f", "--dataFile", type=lambda p: Path(p).absolute(), required=True)
+    parser.add_argument("-F", "--readConfigFile", type=lambda p: Path(p).absolute(), required=True)
+    parser.add_argument("-r", "--resultFile", type=lambda p: Path(p).absolute(), required=True)
+    parser.add_argument("-R", "--runConfigFile", type=lambda p: Path(p).absolute(), required=True)
+    parser.add_argument(
+        "-s", "--sourceFile", type=lambda p: Path(p).absolute(), help="original of the data file"
+    )
+    parser.add_argument(
+        "-i", "--resultIndex", type=parse_result_indices, default=[1], help="e.g. 1 or 1,2 or 1-3"
+    )
+    parser.add_argument("-d", "--deleteIfExists", action="store_true")
+    parser.add_argument("-t", "--nThreads", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    errors = run_optimization(
+        args.dataFile,
+        args.readConfigFile,
+        args.resultFile,
+        args.runConfigFile,
+        args.resultIndex,
+        args.deleteIfExists,
+        args.nThreads,
+        args.sourceFile,
+    )
+    return 1 if any(errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+# src/mcsas3gui/utils/parallel_utils.py
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def mp_context():
+    """
+    Multiprocessing context for all worker processes started from the GUI.
+
+    Workers are spawned rather than forked: forking a process which runs Qt event loops and
+    QThreads can leave locks of other threads in an undefined state in the child.
+    """
+    return multiprocessing.get_context("spawn")
+
+
+def default_workers(n_tasks: int | None = None) -> int:
+    """Number of worker processes: one per core, but no more than there are tasks."""
+    n_workers = os.cpu_count() or 1
+    if n_tasks is not None:
+        n_workers = min(n_workers, n_tasks)
+    return max(1, n_workers)
+
+
+def process_pool(n_tasks: int | None = None, max_workers: int | None = None) -> ProcessPoolExecutor:
+    """Create a process pool with spawned workers, sized for the given number of tasks."""
+    if max_workers is None:
+        max_workers = default_workers(n_tasks)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context())
@@ -0,0 +1,100 @@
+# src/mcsas3gui/utils/precision.py
+
+import math
+import time
+from typing import NamedTuple
+
+import numpy as np
+from mcsas3.mc_hat import McHat
+from mcsas3.mc_model import McModel
+
+from .single_repetition import run_single_repetition
+
+PRECISION_DTYPES = ("double", "single", "fast")  # sasmodels dtypes to compare, reference first
+PRECISION_TOLERANCE = 1e-3  # default acceptable relative error of the model intensity
+PRECISION_TEST_ITERATIONS = 300  # optimization steps to time for each dtype
+
+
+class PrecisionResult(NamedTuple):
+    """Accuracy and speed of the configured model in one sasmodels dtype."""
+
+    dtype: str
+    max_rel_error: float = math.nan  # of the total model intensity, relative to double precision
+    runtime: float = math.nan  # seconds for the test optimization
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def model_intensity(meas_data: dict, run_config: dict, dtype: str) -> np.ndarray:
+    """
+    Total intensity of the initial random model of the run configuration, computed in dtype.
+
+    The model parameters are drawn from the seeded random generator of McModel, so that every
+    dtype computes the same set of contributions.
+    """
+    hat = McHat(**{**run_config, "nRep": 1})
+    hat.fillFitParameterLimits(meas_data)
+    model = McModel(**{**hat._modelArgs, "modelDType": dtype})
+    model.kernel = model.func.make_kernel(meas_data["Q"])
+    try:
+        return sum(
+            model.calcModelIV(model.parameterSet.loc[contribi].to_dict())[0]
+            for contribi in range(model.nContrib)
+        )
+    finally:
+        try:
+            model.kernel.release()
+        except AttributeError:
+            pass
+
+
+def time_optimization(
+    meas_data: dict, run_config: dict, dtype: str, n_iterations: int = PRECISION_TEST_ITERATIONS
+) -> float:
+    """Seconds needed for a fixed number of optimization steps in the given dtype."""
+    config = {
+        **run_config,
+        "modelDType": dtype,
+        "maxIter": n_iterations,
+        "maxAccept": math.inf,
+        "convCrit": 0,
+    }
+    start = time.perf_counter()
+    run_single_repetition(meas_data, config)
+    return time.perf_counter() - start
+
+
+def compare_precisions(
+    meas_data: dict,
+    run_config: dict,
+    dtypes: tuple[str, ...] = PRECISION_DTYPES,
+    n_iterations: int = PRECISION_TEST_ITERATIONS,
+) -> list[PrecisionResult]:
+    """Compare model intensities and optimization speed of each dtype with double precision."""
+    reference = model_intensity(meas_data, run_config, "double")
+    results = []
+    for dtype in dtypes:
+        try:
+            intensity = model_intensity(meas_data, run_config, dtype)  # compiles the kernel
+            rel_error = np.abs(intensity - reference) / np.abs(reference)
+            results.append(
+                PrecisionResult(
+                    dtype,
+                    max_rel_error=float(np.nanmax(rel_error)),
+                    runtime=time_optimization(meas_data, run_config, dtype, n_iterations),
+                )
+            )
+        except Exception as e:  # e.g. a dtype not supported by the model or platform
+            results.append(PrecisionResult(dtype, error=f"{type(e).__name__}: {e}"))
+    return results
+
+
+def recommend_precision(
+    results: list[PrecisionResult], tolerance: float = PRECISION_TOLERANCE
+) -> PrecisionResult | None:
+    """The fastest dtype within the relative error tolerance."""
+    candidates = [r for r in results if r.ok and r.max_rel_error <= tolerance]
+    return min(candidates, key=lambda result: result.runtime, default=None)
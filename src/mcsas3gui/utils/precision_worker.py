@@ -0,0 +1,38 @@
+import logging
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .parallel_utils import process_pool
+from .precision import compare_precisions
+
+logger = logging.getLogger("McSAS3")
+
+
+class PrecisionWorker(QThread):
+    finished_signal = pyqtSignal(list, str)  # PrecisionResults, error message (empty on success)
+
+    def __init__(self, meas_data, run_config):
+        """
+        Args:
+            meas_data (dict): Measurement data, as in McData1D.measData.
+            run_config (dict): Run configuration with the model to compare.
+        """
+        super().__init__()
+        self.meas_data = meas_data
+        self.run_config = run_config
+
+    def run(self):
+        """
+        Compare the dtypes in a separate process, one dtype after another.
+
+        The timings are not run in parallel, where they would compete for the same cores.
+        """
+        try:
+            with process_pool(1) as pool:
+                results = pool.submit(compare_precisions, self.meas_data, self.run_config).result()
+        except Exception as e:
+            logger.error(f"Precision comparison failed: {e}")
+            self.finished_signal.emit([], str(e))
+            return
+        logger.info(f"Precision comparison done: {results}")
+        self.finished_signal.emit(results, "")
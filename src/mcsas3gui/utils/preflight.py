@@ -0,0 +1,71 @@
+# src/mcsas3gui/utils/preflight.py
+
+import math
+from functools import partial
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from .data_utils import load_mcdata_1d
+from .parallel_utils import default_workers, process_pool
+
+
+class PreflightResult(NamedTuple):
+    """Outcome of loading a single file with the data read configuration."""
+
+    file_name: str
+    n_points: int = 0  # number of data points after clipping and omitting Q ranges
+    q_min: float = math.nan  # Q range after clipping
+    q_max: float = math.nan
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def n_binned(self, nbins: int) -> int:
+        """
+        Data points left to optimize after rebinning into nbins bins, or without rebinning for
+        nbins 0. Empty bins are dropped in the rebinning, so this is an upper limit.
+
+        >>> PreflightResult("a.nxs", n_points=1000).n_binned(100)
+        100
+        """
+        return min(nbins, self.n_points) if nbins > 0 else self.n_points
+
+    def summary(self) -> str:
+        """Short description for the file table."""
+        if not self.ok:
+            return f"Error: {self.error}"
+        return f"{self.n_points} points, Q: {self.q_min:.4g} - {self.q_max:.4g} 1/nm"
+
+
+def preflight_file(file_name: str | Path, read_config: dict) -> PreflightResult:
+    """
+    Load a file through McData1D with the given read configuration and report what was loaded.
+
+    The rebinning is skipped: it is slow compared to reading, and a file which can be read and
+    clipped is rebinned without problems during the optimization.
+    """
+    try:
+        mds = load_mcdata_1d(file_name, {**read_config, "nbins": 0})
+        q = mds.clippedData["Q"]
+        return PreflightResult(str(file_name), len(q), float(q.min()), float(q.max()))
+    except Exception as e:  # report anything that would make the optimization fail
+        return PreflightResult(str(file_name), error=f"{type(e).__name__}: {e}")
+
+
+def run_preflight(
+    files: list[str | Path], read_config: dict, max_workers: int | None = None
+) -> Iterator[PreflightResult]:
+    """Check all files in parallel worker processes, yields the results in the order of files."""
+    if max_workers is None:
+        max_workers = default_workers(len(files))
+    if max_workers == 1:  # not worth starting another process
+        yield from map(partial(preflight_file, read_config=read_config), files)
+        return
+    # hand out several files at once to keep the interprocess overhead low for large batches
+    chunksize = max(1, len(files) // (4 * max_workers))
+    with process_pool(len(files), max_workers) as pool:
+        yield from pool.map(
+            partial(preflight_file, read_config=read_config), files, chunksize=chunksize
+        )
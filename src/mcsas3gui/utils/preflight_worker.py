@@ -0,0 +1,37 @@
+import logging
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .preflight import run_preflight
+
+logger = logging.getLogger("McSAS3")
+
+
+class PreflightWorker(QThread):
+    progress_signal = pyqtSignal(int)
+    result_signal = pyqtSignal(int, object)  # row, PreflightResult
+    finished_signal = pyqtSignal(list)  # all PreflightResults, in the order of the files
+
+    def __init__(self, files, read_config):
+        """
+        Args:
+            files (list): Input file paths to check.
+            read_config (dict): Data read configuration, as stored in the data config YAML file.
+        """
+        super().__init__()
+        self.files = files
+        self.read_config = read_config
+
+    def run(self):
+        """Load all files in parallel processes and report each result as it arrives."""
+        results = []
+        try:
+            for row, result in enumerate(run_preflight(self.files, self.read_config)):
+                results.append(result)
+                self.result_signal.emit(row, result)
+                self.progress_signal.emit(int((row + 1) / len(self.files) * 100))
+        except Exception as e:
+            logger.error(f"Pre-flight check aborted: {e}")
+        failed = sum(not result.ok for result in results)
+        logger.info(f"Pre-flight check of {len(results)} files done, {failed} failed.")
+        self.finished_signal.emit(results)
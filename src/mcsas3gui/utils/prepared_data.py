@@ -0,0 +1,264 @@
+# src/mcsas3gui/utils/prepared_data.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+import h5py
+import mcsas3
+import numpy as np
+from mcsas3.mc_data_1d import McData1D
+
+from .data_utils import load_mcdata_1d, mcdata_kwargs
+from .file_utils import get_user_data_path
+from .staging import parse_size
+
+logger = logging.getLogger("McSAS3")
+
+PREPARED_DATA_ENV = "MCSAS3GUI_PREPARED_DATA"  # overrides the directory of the store
+PREPARED_DATA_LIMIT_ENV = "MCSAS3GUI_PREPARED_DATA_LIMIT"  # overrides the size limit, e.g. 500M
+DEFAULT_LIMIT = "2G"
+STATS_FILE = "stats.json"  # hit and miss counters, in the store directory
+LOCK_FILE = "stats.lock"  # held while the counters are updated
+LOCK_TIMEOUT = 10  # seconds, a lock held longer was left behind by a crashed job
+
+
+class PreparedData(NamedTuple):
+    """Preprocessed measurement data of an input file in the store."""
+
+    path: Path  # HDF5 file with the McData1D state, as written by McData1D.store()
+    key: str  # hash of the input file path and version, and the data read configuration
+    result_index: int  # the McData1D state is stored in the group of this result index
+    hit: bool  # the data was in the store already
+
+    @property
+    def mcdata_path(self) -> str:
+        """Group of the McData1D state in the file."""
+        return f"/analyses/MCResult{self.result_index}/mcdata"
+
+
+class StoreStats(NamedTuple):
+    """Reuse of the prepared data, counted across all jobs."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / max(1, self.hits + self.misses)
+
+    def __sub__(self, other: "StoreStats") -> "StoreStats":
+        return StoreStats(self.hits - other.hits, self.misses - other.misses)
+
+    def summary(self) -> str:
+        return (
+            f"Prepared data reused {self.hits} of {self.hits + self.misses} times"
+            f" ({self.hit_rate:.0%})"
+        )
+
+
+def prepared_data_root() -> Path:
+    """Directory of the store."""
+    if os.environ.get(PREPARED_DATA_ENV):
+        return Path(os.environ[PREPARED_DATA_ENV])
+    return get_user_data_path() / "prepared_data"
+
+
+def prepared_data_limit() -> int:
+    """Size limit of the store in bytes, beyond which the least recently used data goes."""
+    return parse_size(os.environ.get(PREPARED_DATA_LIMIT_ENV) or DEFAULT_LIMIT)
+
+
+def file_stamp(file_path: str | Path, source: str | Path | None = None) -> dict:
+    """
+    Identity of an input file: its absolute path, size and modification time, which change
+    whenever the file is rewritten, without reading the file.
+
+    A copy made for the job with its modification time kept, such as a file staged on scratch,
+    is identified by the path of its source.
+    """
+    stat = Path(file_path).stat()
+    return {
+        "path": str(Path(source or file_path).resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def prepared_data_key(
+    file_path: str | Path, read_config: dict, source: str | Path | None = None
+) -> str:
+    """
+    Address of the preprocessed data of an input file in the store.
+
+    The read configuration is taken as McData1D sees it, so that defaults filled in explicitly
+    give the same key. The McSAS3 version is included, as it does the preprocessing.
+    """
+    identity = {
+        "data": file_stamp(file_path, source),
+        "config": mcdata_kwargs(read_config),
+        "mcsas3": mcsas3.__version__,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def prepare_data(
+    file_path: str | Path,
+    read_config: dict,
+    mds: McData1D | None = None,
+    root: Path | None = None,
+    source: str | Path | None = None,
+) -> PreparedData:
+    """
+    Get the preprocessed data of an input file from the store, adding it when missing.
+
+    Args:
+        file_path (str | Path): Input data file.
+        read_config (dict): Data read configuration, as stored in the data config YAML file.
+        mds (McData1D): The data already loaded with this read configuration, to add it to the
+            store without loading the file again.
+        root (Path): Directory of the store, defaults to prepared_data_root().
+        source (str | Path): The original of the input file, if it is a copy made for the job.
+            The data is stored and looked up under the original, and names it as its file.
+    """
+    root = Path(root or prepared_data_root())
+    key = prepared_data_key(file_path, read_config, source)
+    result_index = mcdata_kwargs(read_config)["resultIndex"]
+    path = root / key[:2] / f"{key}.hdf5"
+    hit = path.is_file()
+    if hit:
+        logger.info(f"Prepared data of {file_path} found in the store: {path}")
+        os.utime(path)  # last use, for pruning the least recently used data
+    else:
+        if mds is None:
+            mds = load_mcdata_1d(file_path, read_config)
+        if source is not None:
+            mds.filename = Path(source)  # stored with the data, and copied into the results
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written next to its final place and renamed, so no job ever sees a partial file
+        fd, temp_name = tempfile.mkstemp(suffix=".hdf5.tmp", dir=path.parent)
+        os.close(fd)
+        try:
+            Path(temp_name).unlink()  # McData1D.store() appends to an existing file
+            mds.store(Path(temp_name))
+            os.replace(temp_name, path)
+        finally:
+            Path(temp_name).unlink(missing_ok=True)
+        logger.info(f"Prepared data of {file_path} added to the store: {path}")
+        prune_store(root, keep=path)
+    record_access(hit, root)
+    return PreparedData(path, key, result_index, hit)
+
+
+def load_meas_data(prepared: PreparedData) -> dict:
+    """The measurement data to optimize, as in McData1D.measData."""
+    with h5py.File(prepared.path, "r") as h5f:
+        group = h5f[f"{prepared.mcdata_path}/measData"]
+        return {
+            "Q": list(np.atleast_2d(group["Q"][()])),  # a list of Q vectors, one per dimension
+            "I": group["I"][()],
+            "ISigma": group["ISigma"][()],
+        }
+
+
+def copy_to_result_file(
+    prepared: PreparedData, result_file: str | Path, result_index: int | None = None
+):
+    """
+    Write the prepared data into a result file, as McData1D.store() would.
+
+    The result file may exist and hold other results, only the mcdata group of the result index
+    is replaced. The McData1D state does not depend on the result index, so the same prepared
+    data can be written for another result index than it was stored under.
+    """
+    target_path = prepared.mcdata_path
+    if result_index is not None:
+        target_path = f"/analyses/MCResult{result_index}/mcdata"
+    with h5py.File(prepared.path, "r") as source, h5py.File(result_file, "a") as target:
+        if target_path in target:
+            del target[target_path]
+        parent = target.require_group(target_path.rsplit("/", 1)[0])
+        source.copy(source[prepared.mcdata_path], parent, name="mcdata")
+
+
+def load_stats(root: Path | None = None) -> StoreStats:
+    """Hits and misses of the store so far."""
+    path = Path(root or prepared_data_root()) / STATS_FILE
+    try:
+        return StoreStats(**json.loads(path.read_text()))
+    except FileNotFoundError:
+        return StoreStats()
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Could not read the prepared data statistics from {path}: {e}")
+        return StoreStats()
+
+
+@contextmanager
+def _stats_lock(root: Path):
+    """Hold the lock of the counters, so that concurrent jobs do not lose each other's counts."""
+    lock = root / LOCK_FILE
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            if time.monotonic() > deadline:  # left behind by a crashed job, take it over
+                logger.warning(f"Taking over the stale lock {lock}")
+                break
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        lock.unlink(missing_ok=True)
+
+
+def record_access(hit: bool, root: Path | None = None) -> StoreStats:
+    """Count a hit or miss of the store."""
+    root = Path(root or prepared_data_root())
+    root.mkdir(parents=True, exist_ok=True)
+    with _stats_lock(root):
+        stats = load_stats(root)
+        stats = stats._replace(hits=stats.hits + hit, misses=stats.misses + (not hit))
+        temp_file = root / f"{STATS_FILE}.{os.getpid()}.tmp"
+        temp_file.write_text(json.dumps(stats._asdict()))
+        os.replace(temp_file, root / STATS_FILE)
+    return stats
+
+
+def prune_store(
+    root: Path | None = None, max_bytes: int | None = None, keep: Path | None = None
+) -> int:
+    """
+    Remove the least recently used data until the store fits into its size limit, returns the
+    number of bytes freed. The data just added is kept even if it exceeds the limit alone.
+    """
+    root = Path(root or prepared_data_root())
+    max_bytes = prepared_data_limit() if max_bytes is None else max_bytes
+    entries = []
+    for path in root.glob("??/*.hdf5"):
+        try:
+            stat = path.stat()
+        except OSError:  # removed by another job meanwhile
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total, freed = sum(size for _, size, _ in entries), 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total - freed <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+            freed += size
+        except OSError as e:  # e.g. being read by a job on Windows
+            logger.warning(f"Could not remove {path} from the prepared data store: {e}")
+    if freed:
+        logger.info(f"Removed {freed / 1024**2:.1f} MiB of least recently used prepared data")
+    return freed
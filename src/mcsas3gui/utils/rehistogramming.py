@@ -0,0 +1,155 @@
+# src/mcsas3gui/utils/rehistogramming.py
+
+import logging
+import math
+import time
+from collections import Counter, deque
+from functools import partial
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from .campaign_container import split_address
+from .histogramming import HistogramAnalysis, histogram_results, store_analyses
+from .parallel_utils import default_workers, process_pool
+
+logger = logging.getLogger("McSAS3")
+
+RESULT_CARD_FORMATS = ("pdf", "png")  # suffixes of the result cards that can be rendered
+
+
+class HistogramOutcome(NamedTuple):
+    """Outcome of histogramming a result in a file."""
+
+    file_name: str
+    analysis: HistogramAnalysis | None = None  # for rendering the result card later
+    runtime: float = math.nan  # seconds, for all results of the file together
+    error: str | None = None
+    result_index: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def histogram_task(
+    file_name: str | Path,
+    hist_ranges: list[dict],
+    result_indices: list[int] = (1,),
+    store: bool = True,
+    keep_analyses: bool = True,
+) -> list[HistogramOutcome]:
+    """
+    Histogram the results of a file and store the histograms in it, without the result cards.
+
+    The file is read and written once for all results; the outcome is reported per result. The
+    analyses are only returned if kept, or if the histograms are not stored here; they hold the
+    data and the model intensity, and are passed back from a worker process.
+    """
+    start = time.perf_counter()
+    try:
+        analyses = histogram_results(
+            file_name, hist_ranges, list(result_indices), pdf=False, store=store
+        )
+    except Exception as e:  # report anything, so that the other files are still histogrammed
+        runtime, error = time.perf_counter() - start, f"{type(e).__name__}: {e}"
+        return [HistogramOutcome(str(file_name), None, runtime, error, i) for i in result_indices]
+    runtime = time.perf_counter() - start
+    return [
+        (
+            HistogramOutcome(str(file_name), None, runtime, f"{type(a).__name__}: {a}", i)
+            if isinstance(a, Exception)
+            else HistogramOutcome(
+                str(file_name), a if keep_analyses or not store else None, runtime, None, i
+            )
+        )
+        for i, a in analyses.items()
+    ]
+
+
+def run_rehistogramming(
+    files: list[str | Path],
+    hist_ranges: list[dict],
+    result_indices: list[int] = (1,),
+    max_workers: int | None = None,
+    keep_analyses: bool = True,
+) -> Iterator[HistogramOutcome]:
+    """
+    Histogram all files in parallel worker processes, yields the outcomes in the order of files,
+    and per file in the order of the result indices.
+
+    Only the numbers are calculated and stored: rendering a result card takes longer than
+    histogramming, so it is left to the caller, to be done afterwards or not at all. Without
+    result cards, the analyses need not be kept, the outcomes then have none.
+
+    Samples in campaign containers are only read by the worker processes, their histograms are
+    stored by this process once the workers are done reading that container, so that a
+    container has a single writer and is not written while it is read. Until then, the
+    outcomes of its samples, and of the files after them, are held back.
+    """
+    task = partial(
+        histogram_task,
+        hist_ranges=hist_ranges,
+        result_indices=tuple(result_indices),
+        keep_analyses=keep_analyses,
+    )
+    if max_workers is None:
+        max_workers = default_workers(len(files))
+    if max_workers == 1:  # not worth starting another process, and the result cache is shared
+        for outcomes in map(task, files):
+            yield from outcomes
+        return
+    containers = [_container_of(file_name) for file_name in files]
+    to_read = Counter(container for container in containers if container is not None)
+    pool_task = partial(
+        _pool_task,
+        hist_ranges=hist_ranges,
+        result_indices=tuple(result_indices),
+        keep_analyses=keep_analyses,
+    )
+    chunksize = max(1, len(files) // (4 * max_workers))
+    with process_pool(len(files), max_workers) as pool:
+        # the workers store the histograms of result files, not those of container samples
+        items = [(file_name, container is None) for file_name, container in zip(files, containers)]
+        held = deque()  # [outcomes, container] in the order of files, until they can be yielded
+        for outcomes, container in zip(pool.map(pool_task, items, chunksize=chunksize), containers):
+            held.append([outcomes, container])
+            if container is not None:
+                to_read[container] -= 1
+                if not to_read[container]:  # all its samples are read, store their histograms
+                    for entry in held:
+                        if entry[1] == container:
+                            entry[:] = [_store_outcomes(entry[0], keep_analyses), None]
+            while held and held[0][1] is None:
+                yield from held.popleft()[0]
+
+
+def _container_of(file_name: str | Path) -> Path | None:
+    """The container of a sample, None for a result file."""
+    container, sample = split_address(file_name)
+    return None if sample is None else container.resolve()
+
+
+def _pool_task(
+    item: tuple, hist_ranges: list[dict], result_indices: tuple, keep_analyses: bool
+) -> list:
+    file_name, store = item
+    return histogram_task(file_name, hist_ranges, result_indices, store, keep_analyses)
+
+
+def _store_outcomes(
+    outcomes: list[HistogramOutcome], keep_analyses: bool = True
+) -> list[HistogramOutcome]:
+    """Store the histograms of a sample in a container, which the worker did not."""
+    analyses = {outcome.result_index: outcome.analysis for outcome in outcomes if outcome.ok}
+    if not analyses:
+        return outcomes
+    try:
+        store_analyses(outcomes[0].file_name, analyses)
+    except (OSError, KeyError) as e:
+        error = f"{type(e).__name__}: {e}"
+        return [
+            outcome._replace(analysis=None, error=outcome.error or error) for outcome in outcomes
+        ]
+    if not keep_analyses:
+        return [outcome._replace(analysis=None) for outcome in outcomes]
+    return outcomes
@@ -0,0 +1,286 @@
+# src/mcsas3gui/utils/result_reader.py
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import h5py
+import numpy as np
+
+from .campaign_container import open_result, resolve_address, result_stamp, split_address
+
+logger = logging.getLogger("McSAS3")
+
+CACHE_MAX_ENTRIES = 16  # results held in memory at most
+CACHE_MAX_BYTES = 512 * 1024**2  # array memory held at most; the last read result is always kept
+
+
+class ResultData(NamedTuple):
+    """
+    Everything needed from a McSAS3 result file to histogram it, with the values of all
+    repetitions stacked in one array per quantity: rows are repetitions, columns contributions.
+    """
+
+    file_name: Path
+    result_index: int
+    meas_data: dict  # as in McData1D.measData
+    fit_parameter_limits: dict  # (lower, upper) per fit parameter
+    repetitions: np.ndarray  # repetition indices, in the order of the rows
+    parameters: dict  # (repetition, contribution) array of values per fit parameter
+    volumes: np.ndarray  # (repetition, contribution)
+    x0: np.ndarray  # (repetition, 2): scaling and background
+    gof: np.ndarray  # (repetition,)
+    accepted: np.ndarray  # (repetition,)
+    step: np.ndarray  # (repetition,)
+    model_i: np.ndarray  # (repetition, Q): unscaled model intensity
+
+    @property
+    def n_repetitions(self) -> int:
+        return len(self.repetitions)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays."""
+        arrays = [self.volumes, self.x0, self.gof, self.accepted, self.step, self.model_i]
+        arrays += list(self.parameters.values())
+        arrays += [np.asarray(v) for v in self.meas_data.values()]
+        return sum(array.nbytes for array in arrays)
+
+
+class CacheStats(NamedTuple):
+    """Use of a ResultCache so far."""
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    nbytes: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"Result cache: {self.hits} hits, {self.misses} reads,"
+            f" {self.entries} results in {self.nbytes / 1024**2:.1f} MiB"
+        )
+
+
+def parse_result_indices(text: str | int) -> list[int]:
+    """
+    Result indices given as a comma-separated list, with ranges.
+
+    >>> parse_result_indices("1, 3-5")
+    [1, 3, 4, 5]
+    """
+    indices = []
+    for item in str(text).split(","):
+        first, _, last = item.strip().partition("-")
+        try:
+            first, last = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Invalid result indices: {text!r}") from None
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid result indices: {text!r}")
+        indices += [i for i in range(first, last + 1) if i not in indices]
+    return indices
+
+
+def format_result_indices(result_indices: list[int]) -> str:
+    """The result indices as accepted by parse_result_indices() and the -i option."""
+    return ",".join(str(i) for i in result_indices)
+
+
+def index_status(ok_per_index: dict) -> str:
+    """
+    Status of a job over several result indices, for the file tables.
+
+    >>> index_status({1: True, 2: False})
+    '#1 Complete, #2 Failed'
+    """
+    if len(ok_per_index) == 1:
+        return "Complete" if all(ok_per_index.values()) else "Failed"
+    return ", ".join(f"#{i} {'Complete' if ok else 'Failed'}" for i, ok in ok_per_index.items())
+
+
+def optimized_result_indices(file_name: str | Path) -> list[int]:
+    """Indices of the results in a file with at least one optimized repetition."""
+    with open_result(file_name) as h5f:
+        analyses = h5f.get("analyses", {})
+        return sorted(
+            int(name.removeprefix("MCResult"))
+            for name, group in analyses.items()
+            if name.startswith("MCResult")
+            and any(key.startswith("repetition") for key in group.get("optimization", {}))
+        )
+
+
+def _read_result(h5f: h5py.Group, file_name: Path, result_index: int) -> ResultData:
+    root = f"analyses/MCResult{result_index}"
+    meas_group = h5f[f"{root}/mcdata/measData"]
+    meas_data = {
+        "Q": list(np.atleast_2d(meas_group["Q"][()])),
+        "I": meas_group["I"][()],
+        "ISigma": meas_group["ISigma"][()],
+    }
+    limits_group = h5f[f"{root}/model/fitParameterLimits"]
+    fit_parameter_limits = {
+        name: tuple(float(v) for v in limits_group[name][()]) for name in limits_group
+    }
+    names = sorted(
+        (name for name in h5f[f"{root}/model"] if name.startswith("repetition")),
+        key=lambda name: int(name.removeprefix("repetition")),
+    )
+    if not names:
+        raise ValueError(f"No optimization repetitions found in {file_name}")
+    parameters, volumes, x0, gof, accepted, step, model_i = {}, [], [], [], [], [], []
+    for name in names:
+        model_group = h5f[f"{root}/model/{name}"]
+        opt_group = h5f[f"{root}/optimization/{name}"]
+        columns = [
+            c.decode() if isinstance(c, bytes) else str(c)
+            for c in model_group["parameterSet/columns"][()]
+        ]
+        data = np.atleast_2d(model_group["parameterSet/data"][()].astype(float))
+        for i, column in enumerate(columns):
+            parameters.setdefault(column, []).append(data[:, i])
+        volumes.append(model_group["volumes"][()])
+        x0.append(opt_group["x0"][()])
+        gof.append(opt_group["gof"][()])
+        accepted.append(opt_group["accepted"][()])
+        step.append(opt_group["step"][()])
+        model_i.append(opt_group["modelI"][()])
+    return ResultData(
+        file_name=Path(file_name),
+        result_index=result_index,
+        meas_data=meas_data,
+        fit_parameter_limits=fit_parameter_limits,
+        repetitions=np.array([int(name.removeprefix("repetition")) for name in names]),
+        parameters={column: np.array(values) for column, values in parameters.items()},
+        volumes=np.array(volumes, dtype=float),
+        x0=np.array(x0, dtype=float),
+        gof=np.array(gof, dtype=float),
+        accepted=np.array(accepted, dtype=int),
+        step=np.array(step, dtype=int),
+        model_i=np.array(model_i, dtype=float),
+    )
+
+
+def read_result(file_name: str | Path, result_index: int = 1) -> ResultData:
+    """
+    Read the optimized contributions of all repetitions from a McSAS3 result file.
+
+    Only the stored values are read: unlike McAnalysis, no model kernel is set up and no model
+    intensity is recalculated. The file may also be a sample in a campaign container.
+    """
+    with open_result(file_name) as h5f:
+        return _read_result(h5f, Path(file_name), result_index)
+
+
+def read_results(file_name: str | Path, result_indices: list[int]) -> dict:
+    """
+    Read several results from a McSAS3 result file, opening it once.
+
+    Returns the ResultData per result index, or the exception raised when reading it, so that
+    one missing result does not hide the others.
+    """
+    results = {}
+    with open_result(file_name) as h5f:
+        for result_index in result_indices:
+            try:
+                results[result_index] = _read_result(h5f, Path(file_name), result_index)
+            except (KeyError, ValueError) as e:
+                results[result_index] = e
+    return results
+
+
+class ResultCache:
+    """
+    Results read from files, least recently used first out.
+
+    An entry is valid as long as its file has the same modification time and size, so that a
+    result file optimized again is read again. For a sample in a campaign container, it is valid
+    as long as the sample was not written again, whatever happened to the other samples.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> ResultData
+        self._lock = threading.Lock()  # the tabs read in worker threads
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(file_name: str | Path, result_index: int = 1) -> tuple:
+        path, sample = split_address(file_name)
+        if sample is not None:
+            return (resolve_address(file_name), result_stamp(file_name), 0, result_index)
+        stat = path.stat()
+        return (resolve_address(file_name), stat.st_mtime_ns, stat.st_size, result_index)
+
+    def get(self, file_name: str | Path, result_index: int = 1) -> ResultData:
+        """The result from the cache, read from the file if missing or outdated."""
+        key = self.key(file_name, result_index)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+        result = read_result(file_name, result_index)
+        self._store(key, result)
+        return result
+
+    def get_many(self, file_name: str | Path, result_indices: list[int]) -> dict:
+        """
+        Several results of a file from the cache, reading the missing ones with the file opened
+        once. Returns the ResultData, or the exception raised reading it, per result index.
+        """
+        keys = {result_index: self.key(file_name, result_index) for result_index in result_indices}
+        results = {}
+        with self._lock:
+            for result_index, key in keys.items():
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    results[result_index] = self._entries[key]
+        missing = [result_index for result_index in result_indices if result_index not in results]
+        if missing:
+            for result_index, result in read_results(file_name, missing).items():
+                if isinstance(result, ResultData):
+                    self._store(keys[result_index], result)
+                results[result_index] = result
+        return {result_index: results[result_index] for result_index in result_indices}
+
+    def put(self, result: ResultData) -> None:
+        """
+        Keep a result under the current state of its file, after writing to the file without
+        changing the result itself, e.g. when histograms are stored.
+        """
+        self._store(self.key(result.file_name, result.result_index), result, miss=False)
+
+    def _store(self, key: tuple, result: ResultData, miss: bool = True) -> None:
+        with self._lock:
+            self._misses += miss
+            # entries of earlier states of the file are outdated for good
+            for old_key in [k for k in self._entries if (k[0], k[3]) == (key[0], key[3])]:
+                del self._entries[old_key]
+            self._entries[key] = result
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._nbytes() > self.max_bytes
+            ):
+                old_key, _ = self._entries.popitem(last=False)
+                logger.debug(f"Result of {old_key[0]} dropped from the cache")
+
+    def _nbytes(self) -> int:
+        return sum(result.nbytes for result in self._entries.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, len(self._entries), self._nbytes())
+
+
+# shared by the histogramming test and batch, so a file tested is not read again for the batch
+result_cache = ResultCache()
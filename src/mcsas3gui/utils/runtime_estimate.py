@@ -0,0 +1,215 @@
+# src/mcsas3gui/utils/runtime_estimate.py
+
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from mcsas3.mc_opt import McOpt
+
+from .file_utils import get_user_data_path
+from .prepared_data import load_meas_data, prepare_data
+from .single_repetition import run_single_repetition
+
+logger = logging.getLogger("McSAS3")
+
+CALIBRATION_ITERATIONS = 200  # optimization steps timed per calibration run
+PROCESS_OVERHEAD = 3.0  # seconds per file for starting the runner, reading and storing
+CORRECTIONS_FILE = "runtime_corrections.json"  # learned corrections, in the user data path
+CORRECTION_WEIGHT = 0.5  # weight of the latest batch in the learned correction factor
+
+
+class Calibration(NamedTuple):
+    """Measured cost of an optimization of one data shape with the run configuration."""
+
+    n_points: int  # number of data points after binning
+    setup_time: float  # seconds to build the model and compute its initial intensity
+    time_per_iteration: float  # seconds
+
+
+class BatchEstimate(NamedTuple):
+    """Predicted runtime of a batch of optimizations."""
+
+    file_times: dict  # predicted seconds per input file and result, before correction
+    n_cores: int  # cores used in parallel for the repetitions of a file
+    correction: float = 1.0  # learned ratio of actual to predicted runtimes
+    n_batches: int = 0  # number of earlier batches the correction was learned from
+    n_results: int = 1  # results optimized per file, one per result index
+
+    def predicted(self, files: list | None = None) -> float:
+        """Uncorrected seconds for the given files, or all, with all of their results."""
+        files = self.file_times if files is None else files
+        return sum(self.file_times[file_name] for file_name in files) * self.n_results
+
+    @property
+    def wall_time(self) -> float:
+        """Corrected seconds until all files are done, they are processed one after another."""
+        return self.predicted() * self.correction
+
+    @property
+    def core_hours(self) -> float:
+        """Core-hours to allocate for the batch."""
+        return self.wall_time * self.n_cores / 3600
+
+    def summary(self) -> str:
+        results = f" with {self.n_results} results each" if self.n_results > 1 else ""
+        text = (
+            f"Estimated runtime for {len(self.file_times)} files{results}:"
+            f" {format_duration(self.wall_time)} on {self.n_cores} cores,"
+            f" {self.core_hours:.2f} core-hours"
+        )
+        if self.n_batches:
+            text += f" (corrected by x{self.correction:.2f} from {self.n_batches} earlier batches)"
+        return text
+
+
+class _TimestampQueue:
+    """Stands in for the progress queue, to note when the optimization loop starts."""
+
+    def __init__(self):
+        self.first_report = None
+
+    def put(self, message):
+        if self.first_report is None:
+            self.first_report = time.perf_counter()
+
+
+def format_duration(seconds: float) -> str:
+    """Duration in hours, minutes and seconds, e.g. '1 h 02 min'."""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours} h {minutes:02d} min"
+    if minutes:
+        return f"{minutes} min {seconds:02d} s"
+    return f"{seconds} s"
+
+
+def calibrate(
+    meas_data: dict, run_config: dict, n_iterations: int = CALIBRATION_ITERATIONS
+) -> Calibration:
+    """Time the setup and a fixed number of optimization steps of a single repetition."""
+    config = {**run_config, "maxIter": n_iterations, "maxAccept": math.inf, "convCrit": 0}
+    timestamps = _TimestampQueue()
+    start = time.perf_counter()
+    result = run_single_repetition(meas_data, config, progress_queue=timestamps)
+    end = time.perf_counter()
+    n_steps = max(1, result.n_steps)  # n_iterations, unless the optimization stopped earlier
+    return Calibration(
+        n_points=len(meas_data["I"]),
+        setup_time=timestamps.first_report - start,
+        time_per_iteration=(end - timestamps.first_report) / n_steps,
+    )
+
+
+def calibrate_file(
+    file_name: str | Path,
+    read_config: dict,
+    run_config: dict,
+    n_iterations: int = CALIBRATION_ITERATIONS,
+) -> Calibration:
+    """
+    Calibrate the run configuration on a file, prepared with the data configuration.
+
+    The prepared data is kept in the store, for the optimization of the file in the batch.
+    """
+    prepared = prepare_data(file_name, read_config)
+    return calibrate(load_meas_data(prepared), run_config, n_iterations)
+
+
+def effective_cores(run_config: dict) -> int:
+    """Cores running repetitions in parallel: nCores, but no more than available or needed."""
+    n_cores = int(run_config.get("nCores", 1) or 1)
+    return max(1, min(n_cores, os.cpu_count() or 1, int(run_config.get("nRep", 1))))
+
+
+def file_runtime(calibration: Calibration, run_config: dict) -> float:
+    """
+    Predicted seconds for the optimization of one file.
+
+    Each repetition is assumed to run up to maxIter, repetitions ending earlier through
+    maxAccept or convCrit are accounted for by the learned correction.
+    """
+    max_iter = run_config.get("maxIter", McOpt.maxIter)
+    repetition = calibration.setup_time + max_iter * calibration.time_per_iteration
+    n_rounds = math.ceil(int(run_config.get("nRep", 1)) / effective_cores(run_config))
+    return PROCESS_OVERHEAD + repetition * n_rounds
+
+
+def estimate_batch(
+    calibrations: dict,
+    file_shapes: dict,
+    run_config: dict,
+    corrections: dict | None = None,
+    n_results: int = 1,
+) -> BatchEstimate:
+    """
+    Predict the runtime of a batch.
+
+    Args:
+        calibrations (dict): Calibration per data shape key.
+        file_shapes (dict): Data shape key per input file, every key must have a calibration.
+        run_config (dict): Run configuration of the batch.
+        corrections (dict): Learned corrections, as returned by load_corrections().
+        n_results (int): Results optimized per file, one per result index, each taking as long.
+    """
+    file_times = {
+        file_name: file_runtime(calibrations[shape], run_config)
+        for file_name, shape in file_shapes.items()
+    }
+    correction = (corrections or {}).get(str(run_config.get("modelName")), {})
+    return BatchEstimate(
+        file_times=file_times,
+        n_cores=effective_cores(run_config),
+        correction=correction.get("factor", 1.0),
+        n_batches=correction.get("n_batches", 0),
+        n_results=n_results,
+    )
+
+
+def load_corrections(path: Path | None = None) -> dict:
+    """Learned correction factors per model name."""
+    path = Path(path or get_user_data_path() / CORRECTIONS_FILE)
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read the runtime corrections from {path}: {e}")
+        return {}
+
+
+def record_actual_runtime(
+    model_name: str, predicted: float, actual: float, path: Path | None = None
+) -> float:
+    """
+    Update the correction factor of a model with the actual runtime of a batch.
+
+    Args:
+        model_name (str): Model of the run configuration.
+        predicted (float): Uncorrected predicted runtime of the files which were run, with all
+            of their results.
+        actual (float): Measured runtime in seconds.
+    Returns:
+        The new correction factor.
+    """
+    path = Path(path or get_user_data_path() / CORRECTIONS_FILE)
+    corrections = load_corrections(path)
+    previous = corrections.get(model_name)
+    ratio = actual / predicted
+    if previous is None:
+        correction = {"factor": ratio, "n_batches": 1}
+    else:
+        factor = (1 - CORRECTION_WEIGHT) * previous["factor"] + CORRECTION_WEIGHT * ratio
+        correction = {"factor": factor, "n_batches": previous["n_batches"] + 1}
+    corrections[model_name] = correction
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(corrections, indent=2))
+    logger.info(
+        f"Batch took {format_duration(actual)}, predicted {format_duration(predicted)}:"
+        f" runtime correction for {model_name} is now x{correction['factor']:.2f}."
+    )
+    return correction["factor"]
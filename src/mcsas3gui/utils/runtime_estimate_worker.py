@@ -0,0 +1,46 @@
+import logging
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .parallel_utils import process_pool
+from .runtime_estimate import calibrate_file
+
+logger = logging.getLogger("McSAS3")
+
+
+class CalibrationWorker(QThread):
+    progress_signal = pyqtSignal(int)
+    finished_signal = pyqtSignal(dict, str)  # Calibration per data shape, error message
+
+    def __init__(self, representatives, read_config, run_config):
+        """
+        Args:
+            representatives (dict): A file to calibrate on, per data shape key.
+            read_config (dict): Data read configuration, as stored in the data config YAML file.
+            run_config (dict): Run configuration of the batch.
+        """
+        super().__init__()
+        self.representatives = representatives
+        self.read_config = read_config
+        self.run_config = run_config
+
+    def run(self):
+        """
+        Calibrate on each representative file in a separate process, one after another.
+
+        The calibrations are not run in parallel, where they would compete for the same cores.
+        """
+        calibrations = {}
+        try:
+            with process_pool(1) as pool:
+                for index, (shape, file_name) in enumerate(self.representatives.items()):
+                    calibrations[shape] = pool.submit(
+                        calibrate_file, file_name, self.read_config, self.run_config
+                    ).result()
+                    self.progress_signal.emit(int((index + 1) / len(self.representatives) * 100))
+        except Exception as e:
+            logger.error(f"Runtime calibration failed: {e}")
+            self.finished_signal.emit(calibrations, f"{type(e).__name__}: {e}")
+            return
+        logger.info(f"Runtime calibration done: {calibrations}")
+        self.finished_signal.emit(calibrations, "")
@@ -0,0 +1,189 @@
+# src/mcsas3gui/utils/single_repetition.py
+
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from mcsas3.mc_core import McCore
+from mcsas3.mc_hat import McHat
+from mcsas3.mc_model import McModel
+from mcsas3.mc_opt import McOpt
+
+from .gof_plateau import PLATEAU_WINDOW, convergence_diagnostics, detect_plateau, limit_diagnostics
+
+REPORT_INTERVAL = 0.5  # seconds between progress reports of a running optimization
+PREVIEW_FACTOR = 10  # default reduction of data points and budgets for a quick preview
+# lower limits for a quick preview, below which the fit would not say much about the settings
+PREVIEW_MIN_POINTS = 20
+PREVIEW_MIN_CONTRIB = 20
+PREVIEW_MIN_ITER = 200
+PREVIEW_MIN_ACCEPT = 20
+PREVIEW_TIME_LIMIT = 2.0  # seconds, a preview stops there even if its budgets are not used up
+
+
+class SingleRepetitionResult(NamedTuple):
+    """Optimization result of a single repetition, as needed for plotting the fit."""
+
+    fit_q: np.ndarray  # Q of the measurement data
+    model_i: np.ndarray  # unscaled model intensity
+    accepted_gofs: np.ndarray
+    accepted_steps: np.ndarray
+    max_iter: int
+    max_accept: int | float
+    x0: np.ndarray  # scaling and background
+    stop_reason: str = ""  # convCrit, maxAccept, maxIter, time limit or GOF plateau
+    diagnostics: tuple[str, ...] = ()  # hints on a misconfiguration, e.g. parameter limits hit
+    n_steps: int = 0  # optimization steps executed, accepted or not
+    runtime: float = np.nan  # seconds spent in the optimization loop, without the model setup
+
+
+def preview_config(run_config: dict, factor: int = PREVIEW_FACTOR) -> dict:
+    """Run configuration with nContrib, maxIter and maxAccept reduced by the given factor."""
+    config = dict(run_config)
+    defaults = {
+        "nContrib": McModel.nContrib,
+        "maxIter": McOpt.maxIter,
+        "maxAccept": McOpt.maxAccept,
+    }
+    minimum = {
+        "nContrib": PREVIEW_MIN_CONTRIB,
+        "maxIter": PREVIEW_MIN_ITER,
+        "maxAccept": PREVIEW_MIN_ACCEPT,
+    }
+    for key, default in defaults.items():
+        value = config.get(key, default)
+        if np.isfinite(value):
+            config[key] = int(min(value, max(minimum[key], value // factor)))
+    return config
+
+
+def thin_meas_data(meas_data: dict, factor: int = PREVIEW_FACTOR) -> dict:
+    """Every factor-th data point, evenly spread over the full Q range including its ends."""
+    n_points = len(meas_data["I"])
+    n_keep = min(n_points, max(PREVIEW_MIN_POINTS, n_points // factor))
+    keep = np.unique(np.linspace(0, n_points - 1, n_keep).round().astype(int))
+    thinned = dict(meas_data)
+    thinned["Q"] = [np.asarray(q)[keep] for q in meas_data["Q"]]
+    thinned["I"] = np.asarray(meas_data["I"])[keep]
+    thinned["ISigma"] = np.asarray(meas_data["ISigma"])[keep]
+    return thinned
+
+
+def run_single_repetition(
+    meas_data: dict,
+    run_config: dict,
+    result_file: Path | None = None,
+    progress_queue=None,
+    cancel_event=None,
+    report_interval: float = REPORT_INTERVAL,
+    time_limit: float | None = None,
+    stop_on_plateau: bool = False,
+    plateau_window: int = PLATEAU_WINDOW,
+) -> SingleRepetitionResult | None:
+    """
+    Run a single optimization repetition, equivalent to McHat.runOnce(), and return the result.
+
+    Unlike McHat, the optimization loop is run here, so that newly accepted (step, GOF) pairs
+    can be sent as ("progress", steps, gofs, step) to the progress_queue periodically, and the
+    optimization can be stopped by setting the cancel_event. Returns None if cancelled.
+    The result is stored in the result_file as well, if given. With a time_limit (in seconds),
+    the optimization stops there like it does when reaching maxIter. With stop_on_plateau, it
+    stops when the GOF has not improved meaningfully in the last plateau_window attempts.
+    """
+    hat = McHat(**{**run_config, "nRep": 1})  # validates the configuration keys
+    hat.fillFitParameterLimits(meas_data)
+    opt = McOpt(**hat._optArgs)
+    model = McModel(**hat._modelArgs)
+    opt.repetition = 0
+    mc = McCore(meas_data, model=model, opt=opt)
+
+    n_reported, last_report = 0, time.monotonic()
+
+    def report():
+        nonlocal n_reported, last_report
+        if progress_queue is not None:
+            steps, gofs = opt.acceptedSteps[n_reported:], opt.acceptedGofs[n_reported:]
+            progress_queue.put(("progress", list(steps), [float(gof) for gof in gofs], opt.step))
+        n_reported, last_report = len(opt.acceptedSteps), time.monotonic()
+
+    def plateau_status():
+        return detect_plateau(
+            opt.acceptedSteps, opt.acceptedGofs, opt.step, opt.convCrit, plateau_window
+        )
+
+    report()
+    stop_reason = ""
+    deadline = time.monotonic() + time_limit if time_limit is not None else float("inf")
+    start = time.perf_counter()
+    while (opt.accepted < opt.maxAccept) & (opt.step < opt.maxIter) & (opt.gof > opt.convCrit):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        if time.monotonic() > deadline:
+            stop_reason = "time limit"
+            break
+        mc.iterate()
+        if time.monotonic() - last_report >= report_interval:
+            report()
+            if stop_on_plateau and getattr(plateau_status(), "plateau", False):
+                stop_reason = "GOF plateau"
+                break
+    runtime = time.perf_counter() - start
+    report()
+    if not stop_reason:
+        stop_reason = (
+            "convCrit"
+            if opt.gof <= opt.convCrit
+            else "maxAccept" if opt.accepted >= opt.maxAccept else "maxIter"
+        )
+    diagnostics = convergence_diagnostics(plateau_status(), opt.convCrit)
+    if model.fitParameterLimits:
+        diagnostics += limit_diagnostics(
+            model.parameterSet, model.fitParameterLimits, model.logRandoms
+        )
+
+    try:
+        model.kernel.release()
+    except AttributeError:
+        pass  # can happen with a simulation model
+    if result_file is not None:
+        mc.store(filename=result_file)
+        hat.store(filename=result_file)
+    return SingleRepetitionResult(
+        fit_q=np.asarray(meas_data["Q"]).flatten(),
+        model_i=np.asarray(opt.modelI),
+        accepted_gofs=np.asarray(opt.acceptedGofs),
+        accepted_steps=np.asarray(opt.acceptedSteps),
+        max_iter=opt.maxIter,
+        max_accept=opt.maxAccept,
+        x0=np.asarray(opt.x0),
+        stop_reason=stop_reason,
+        diagnostics=tuple(diagnostics),
+        n_steps=int(opt.step),
+        runtime=runtime,
+    )
+
+
+def single_repetition_process(
+    meas_data,
+    run_config,
+    result_file,
+    progress_queue,
+    cancel_event,
+    time_limit=None,
+    stop_on_plateau=False,
+):
+    """Entry point of the worker process, reports the outcome as last message on the queue."""
+    try:
+        result = run_single_repetition(
+            meas_data,
+            run_config,
+            result_file,
+            progress_queue,
+            cancel_event,
+            time_limit=time_limit,
+            stop_on_plateau=stop_on_plateau,
+        )
+        progress_queue.put(("cancelled",) if result is None else ("done", result))
+    except Exception as e:
+        progress_queue.put(("error", f"{type(e).__name__}: {e}"))
@@ -0,0 +1,88 @@
+import logging
+import queue
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .parallel_utils import mp_context
+from .single_repetition import single_repetition_process
+
+logger = logging.getLogger("McSAS3")
+
+CANCEL_GRACE_TIME = 5.0  # seconds to wait for a cancelled process before terminating it
+
+
+class SingleRepetitionWorker(QThread):
+    progress_signal = pyqtSignal(list, list, int)  # all accepted steps, GOFs so far; total steps
+    finished_signal = pyqtSignal(str, object)  # "done", "cancelled" or "error"; result or message
+
+    def __init__(
+        self, meas_data, run_config, result_file=None, time_limit=None, stop_on_plateau=False
+    ):
+        """
+        Args:
+            meas_data (dict): Measurement data with Q, I, ISigma, as in McData1D.measData.
+            run_config (dict): Optimization settings, as in the run config YAML file.
+            result_file (Path): Optional HDF5 file to store the result in as well.
+            time_limit (float): Optional limit of the optimization time in seconds.
+            stop_on_plateau (bool): Stop when the GOF does not improve meaningfully anymore.
+        """
+        super().__init__()
+        self.meas_data = meas_data
+        self.run_config = run_config
+        self.result_file = result_file
+        self.time_limit = time_limit
+        self.stop_on_plateau = stop_on_plateau
+        self.accepted_steps, self.accepted_gofs = [], []
+        self._cancel_requested_at = None
+        self._context = mp_context()
+        self._cancel_event = self._context.Event()
+
+    def cancel(self):
+        """Ask the optimization to stop, it is terminated if it does not stop in time."""
+        self._cancel_event.set()
+        self._cancel_requested_at = time.monotonic()
+
+    def run(self):
+        """Run the repetition in a separate process and relay its progress reports."""
+        progress_queue = self._context.Queue()
+        process = self._context.Process(
+            target=single_repetition_process,
+            args=(
+                self.meas_data,
+                self.run_config,
+                self.result_file,
+                progress_queue,
+                self._cancel_event,
+                self.time_limit,
+                self.stop_on_plateau,
+            ),
+            daemon=True,
+        )
+        process.start()
+        outcome = ("error", "The optimization process ended unexpectedly.")
+        while True:
+            try:
+                message = progress_queue.get(timeout=0.1)
+            except queue.Empty:
+                if not process.is_alive():
+                    break
+                if (
+                    self._cancel_requested_at is not None
+                    and time.monotonic() - self._cancel_requested_at > CANCEL_GRACE_TIME
+                ):
+                    process.terminate()
+                    outcome = ("cancelled",)
+                    break
+                continue
+            if message[0] == "progress":
+                _, steps, gofs, step = message
+                self.accepted_steps += steps
+                self.accepted_gofs += gofs
+                self.progress_signal.emit(list(self.accepted_steps), list(self.accepted_gofs), step)
+            else:
+                outcome = message
+                break
+        process.join()
+        logger.debug(f"Single repetition process finished with: {outcome}")
+        self.finished_signal.emit(outcome[0], outcome[1] if len(outcome) > 1 else None)
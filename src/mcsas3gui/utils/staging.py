@@ -0,0 +1,148 @@
+# src/mcsas3gui/utils/staging.py
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger("McSAS3")
+
+SCRATCH_ENV = "MCSAS3GUI_SCRATCH"  # overrides the node-local scratch directory
+SCRATCH_LIMIT_ENV = "MCSAS3GUI_SCRATCH_LIMIT"  # overrides the size limit, e.g. 500M or 20G
+DEFAULT_LIMIT = "10G"
+STALE_AGE = 24 * 3600  # seconds after which job directories left behind by crashed runs go
+JOB_PREFIX = "job-"  # of the job directories in the scratch directory
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+class ScratchConfig(NamedTuple):
+    """Where jobs are staged, and how much they may stage at once."""
+
+    root: Path
+    max_bytes: int  # staged by all jobs in the scratch directory together
+
+    def summary(self) -> str:
+        return f"Staging in {self.root}, at most {self.max_bytes / 1024**3:.1f} GiB"
+
+
+class StagedJob(NamedTuple):
+    """A job running on scratch, with the copy of its input and its result to publish."""
+
+    directory: Path  # job directory on scratch, removed when done
+    input_file: Path  # copy of the input file
+    result_file: Path  # written by the job
+    destination: Path  # where the result file is published
+
+
+def parse_size(text: str | int) -> int:
+    """
+    Size in bytes, from a number with an optional binary unit.
+
+    >>> parse_size("1.5K"), parse_size("20G") // 1024**3, parse_size(512)
+    (1536, 20, 512)
+    """
+    text = str(text).strip().upper().removesuffix("B").removesuffix("I")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    try:
+        return int(float(text.removesuffix(unit)) * SIZE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid size: {text!r}") from None
+
+
+def scratch_config() -> ScratchConfig:
+    """The scratch directory and its size limit, from the environment or the defaults."""
+    root = os.environ.get(SCRATCH_ENV) or Path(tempfile.gettempdir()) / "mcsas3gui-scratch"
+    return ScratchConfig(Path(root), parse_size(os.environ.get(SCRATCH_LIMIT_ENV) or DEFAULT_LIMIT))
+
+
+def _directory_size(directory: Path) -> int:
+    size = 0
+    for path in directory.rglob("*"):
+        try:
+            size += path.stat().st_size if path.is_file() else 0
+        except OSError:  # removed by its job meanwhile
+            pass
+    return size
+
+
+def staged_bytes(config: ScratchConfig) -> int:
+    """Bytes staged by all jobs in the scratch directory."""
+    if not config.root.is_dir():
+        return 0
+    return sum(_directory_size(job) for job in config.root.glob(f"{JOB_PREFIX}*"))
+
+
+def clean_scratch(config: ScratchConfig, max_age: float = STALE_AGE) -> int:
+    """Remove job directories not touched for max_age seconds, returns how many."""
+    if not config.root.is_dir():
+        return 0
+    removed = 0
+    for job in config.root.glob(f"{JOB_PREFIX}*"):
+        try:
+            if time.time() - job.stat().st_mtime > max_age:
+                shutil.rmtree(job)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Could not remove the stale scratch directory {job}: {e}")
+    if removed:
+        logger.info(f"Removed {removed} stale job directories from {config.root}")
+    return removed
+
+
+def stage(input_file: Path, result_file: Path, config: ScratchConfig) -> StagedJob | None:
+    """
+    Copy the input file into a new job directory on scratch, for the job to run there.
+
+    Returns None if the job does not fit into the size limit or the free space of the scratch
+    directory, for it to run in place instead. The result is expected to be about as large as
+    the input, or as the result it replaces.
+    """
+    input_file, result_file = Path(input_file), Path(result_file)
+    needed = input_file.stat().st_size
+    needed += result_file.stat().st_size if result_file.is_file() else needed
+    config.root.mkdir(parents=True, exist_ok=True)
+    if (
+        staged_bytes(config) + needed > config.max_bytes
+        or shutil.disk_usage(config.root).free < needed
+    ):
+        logger.info(f"Not enough scratch space for {input_file.name}, running it in place")
+        return None
+    directory = Path(tempfile.mkdtemp(prefix=JOB_PREFIX, dir=config.root))
+    try:
+        staged_input = Path(shutil.copy2(input_file, directory / input_file.name))
+    except OSError:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    # named like the destination, as the result file name may be stored in the result
+    return StagedJob(directory, staged_input, directory / result_file.name, result_file)
+
+
+def publish(job: StagedJob) -> Path:
+    """
+    Move the result of a job to its destination at once, so that the destination never holds
+    a partial file: the result is copied next to it under a temporary name, then renamed.
+    """
+    job.destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(job.result_file, job.destination)  # on the same file system already
+        return job.destination
+    except OSError:
+        pass
+    fd, temp_name = tempfile.mkstemp(
+        prefix=f".{job.destination.name}.", suffix=".tmp", dir=job.destination.parent
+    )
+    os.close(fd)
+    try:
+        shutil.copyfile(job.result_file, temp_name)
+        os.replace(temp_name, job.destination)
+    finally:
+        Path(temp_name).unlink(missing_ok=True)
+    return job.destination
+
+
+def discard(job: StagedJob) -> None:
+    """Remove the job directory with everything the job left on scratch."""
+    shutil.rmtree(job.directory, ignore_errors=True)
@@ -0,0 +1,222 @@
+# src/mcsas3gui/utils/startup_profile.py
+
+import builtins
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger("McSAS3")
+
+REPORT_FILE = "startup_profile.txt"
+TRACE_FILE = "startup_trace.json"  # for chrome://tracing or https://ui.perfetto.dev
+MIN_REPORTED = 0.001  # seconds, faster phases and packages are left out of the report
+
+_active = None  # the running StartupProfiler, spans are not recorded without one
+
+
+class Span(NamedTuple):
+    """A timed phase of the startup, or an import statement that loaded modules."""
+
+    name: str
+    category: str  # import, tab, template, window or paint
+    start: float  # seconds since the profiler started
+    duration: float  # seconds, including nested spans
+    depth: int  # nesting within spans of the same kind, imports and phases are nested apart
+    self_time: float  # seconds, excluding nested imports, for imports
+    modules: int = 0  # modules loaded, excluding those of nested imports, for imports
+
+
+@contextmanager
+def span(name: str, category: str = "startup"):
+    """Time a phase of the startup, if the startup is being profiled."""
+    if _active is None:
+        yield
+        return
+    with _active.span(name, category):
+        yield
+
+
+class StartupProfiler:
+    """
+    Records the wall time of the startup phases, and of each import statement that loads
+    modules, like -X importtime but per statement and aggregated by package in the report.
+
+    Only the main thread is profiled.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._origin = time.perf_counter()
+        self._thread = threading.get_ident()
+        self._depth = 0  # of the open phases
+        self._import_stack = []  # per open import
+        self._paint_watcher = None
+        self._original_import = None
+        self.first_paint = None  # seconds since the start, once the window painted
+
+    def start(self) -> "StartupProfiler":
+        global _active
+        _active = self
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def stop(self) -> None:
+        global _active
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original_import
+        _active = None
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    @contextmanager
+    def span(self, name: str, category: str = "startup"):
+        start, depth = self._now(), self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            duration = self._now() - start
+            self.spans.append(Span(name, category, start, duration, depth, duration))
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if threading.get_ident() != self._thread:
+            return self._original_import(name, globals, locals, fromlist, level)
+        loaded, start = len(sys.modules), self._now()
+        self._import_stack.append([0.0, 0])  # time and modules of the nested imports
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            duration, loaded = self._now() - start, len(sys.modules) - loaded
+            nested_time, nested_modules = self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1][0] += duration
+                self._import_stack[-1][1] += loaded
+            if loaded > 0:  # not imported before
+                self.spans.append(
+                    Span(
+                        _module_name(name, globals, level),
+                        "import",
+                        start,
+                        duration,
+                        len(self._import_stack),
+                        duration - nested_time,
+                        loaded - nested_modules,
+                    )
+                )
+
+    def watch_first_paint(self, widget, callback=None) -> None:
+        """Record when the widget is first painted, and call back once that is done."""
+        from PyQt6.QtCore import QEvent, QObject, QTimer
+
+        profiler, shown = self, self._now()
+
+        class PaintWatcher(QObject):
+            def eventFilter(self, watched, event):
+                if event.type() == QEvent.Type.Paint and profiler.first_paint is None:
+                    watched.removeEventFilter(self)
+                    QTimer.singleShot(0, self.painted)  # right after the paint event
+                return False
+
+            def painted(self):
+                profiler.first_paint = profiler._now()
+                profiler.spans.append(
+                    Span("first paint", "paint", shown, profiler.first_paint - shown, 0, 0.0)
+                )
+                if callback is not None:
+                    callback()
+
+        self._paint_watcher = PaintWatcher(widget)
+        widget.installEventFilter(self._paint_watcher)
+
+    def package_times(self) -> dict:
+        """Self time and modules loaded of the imports of each top-level package, slowest first."""
+        packages = {}
+        for entry in self.spans:
+            if entry.category == "import":
+                package = entry.name.partition(".")[0]
+                self_time, modules = packages.get(package, (0.0, 0))
+                packages[package] = (self_time + entry.self_time, modules + entry.modules)
+        return dict(sorted(packages.items(), key=lambda item: -item[1][0]))
+
+    def report(self) -> str:
+        """A readable summary of the startup phases and the imports."""
+        lines = [f"McSAS3GUI startup profile, {datetime.now():%Y-%m-%d %H:%M:%S}", ""]
+        if self.first_paint is not None:
+            lines += [f"Window painted after {self.first_paint:.3f} s", ""]
+        lines.append("Startup phases, wall time including nested phases:")
+        for entry in sorted(
+            (entry for entry in self.spans if entry.category != "import"),
+            key=lambda entry: entry.start,
+        ):
+            if entry.duration >= MIN_REPORTED:
+                label = "  " * entry.depth + entry.name
+                lines.append(f"{entry.duration * 1e3:10.1f} ms  {label} [{entry.category}]")
+        imports = [entry for entry in self.spans if entry.category == "import"]
+        lines += [
+            "",
+            f"Imports by package, {len(imports)} import statements loading"
+            f" {sum(entry.modules for entry in imports)} modules, wall time excluding nested"
+            " imports:",
+        ]
+        for package, (self_time, modules) in self.package_times().items():
+            if self_time >= MIN_REPORTED:
+                lines.append(f"{self_time * 1e3:10.1f} ms  {package} ({modules} modules)")
+        lines += ["", "Slowest import statements, wall time including nested imports:"]
+        outermost = [entry for entry in imports if entry.depth == 0]
+        for entry in sorted(outermost, key=lambda entry: -entry.duration)[:20]:
+            lines.append(f"{entry.duration * 1e3:10.1f} ms  {entry.name}")
+        return "\n".join(lines) + "\n"
+
+    def trace(self) -> dict:
+        """The spans as complete events of the Chrome trace event format."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": entry.name,
+                "cat": entry.category,
+                "ph": "X",
+                "ts": entry.start * 1e6,
+                "dur": entry.duration * 1e6,
+                "pid": pid,
+                "tid": 1 if entry.category == "import" else 0,
+                "args": {"modules": entry.modules} if entry.category == "import" else {},
+            }
+            for entry in sorted(self.spans, key=lambda entry: (entry.start, -entry.duration))
+        ]
+        names = {0: "startup", 1: "imports"}
+        events += [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in names.items()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, directory: Path) -> tuple[Path, Path]:
+        """Write the report and the Chrome trace into the directory, returns both paths."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        report_path, trace_path = directory / REPORT_FILE, directory / TRACE_FILE
+        report_path.write_text(self.report(), encoding="utf-8")
+        trace_path.write_text(json.dumps(self.trace()), encoding="utf-8")
+        return report_path, trace_path
+
+
+def _module_name(name: str, globals: dict | None, level: int) -> str:
+    """The absolute name of an imported module, also for relative imports."""
+    if not level:
+        return name
+    package = (globals or {}).get("__package__") or ""
+    try:
+        return importlib.util.resolve_name("." * level + name, package)
+    except (ImportError, ValueError):
+        return name
@@ -4,22 +4,47 @@ from .base_worker import BaseWorker
 
 
 class TaskRunnerMixin:
-    def run_tasks(self, files_in_out, command_template, extra_keywords=None):
+    def run_tasks(
+        self,
+        files_in_out,
+        command_template,
+        extra_keywords=None,
+        rows=None,
+        task_keywords=None,
+        scratch=None,
+    ):
         """
         Run tasks with the provided command template and files.
 
         Args:
-            files_in_out (dict): Pairs for {input:output} file paths to process.
+            files_in_out (dict | list): Pairs for {input:output} file paths to process, or a list
+                of (input, output) pairs if an input file is processed more than once.
             command_template (str): Command template with placeholders for replacement.
             extra_keywords (dict): Additional keywords for replacing in the command template.
+            rows (list): Table row of each task, if not all files in the table are processed.
+            task_keywords (list): Keywords per task, which override the extra keywords.
+            scratch (ScratchConfig): Stage the tasks in this scratch directory, see BaseWorker.
         """
         if not files_in_out:
             QMessageBox.warning(self, "Run Tasks", "No files selected.")
             return
+        worker = BaseWorker(files_in_out, command_template, extra_keywords, task_keywords, scratch)
+        self.start_worker(worker, len(files_in_out), rows)
 
-        self.worker = BaseWorker(files_in_out, command_template, extra_keywords)
+    def start_worker(self, worker, n_tasks, rows=None):
+        """
+        Run the tasks of a worker with the signals of BaseWorker, reporting in the file table.
+
+        Args:
+            worker (QThread): Worker with progress, status, task_done and finished signals.
+            n_tasks (int): Number of tasks of the worker.
+            rows (list): Table row of each task, if not all files in the table are processed.
+        """
+        self._task_rows = list(rows) if rows is not None else list(range(n_tasks))
+        self.worker = worker
         self.worker.progress_signal.connect(self.update_progress)
         self.worker.status_signal.connect(self.update_file_status)
+        self.worker.task_done_signal.connect(self.task_done)
         self.worker.finished_signal.connect(self.tasks_finished)
 
         self.run_button.setEnabled(False)
@@ -32,7 +57,11 @@ class TaskRunnerMixin:
 
     def update_file_status(self, row, status):
         """Update the status of a file in the table."""
-        self.file_selection_widget.set_status_by_row(row, status)
+        self.file_selection_widget.set_status_by_row(self._task_rows[row], status)
+
+    def task_done(self, task, success, runtime):
+        """Called after each task, with its runtime in seconds."""
+        pass
 
     def tasks_finished(self):
         """Re-enable the run button after tasks are complete."""
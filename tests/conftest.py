@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from mcsas3gui.utils.file_utils import get_main_path
+from mcsas3gui.utils.optimization_runner import run_optimization
+
+NEXUS_FILE = Path(get_main_path() / "testdata" / "merged_AutoMOFs_7_L011.nxs")
+HIST_CONFIG = get_main_path() / "configurations" / "histogram" / "hist_config_dual.yaml"
+READ_CONFIG = {
+    "nbins": 50,
+    "dataRange": [0.1, 1.0],
+    "pathDict": {
+        "Q": "/entry/result/Q",
+        "I": "/entry/result/I",
+        "ISigma": "/entry/result/I_errors",
+    },
+}
+# a short optimization, tests needing more or fewer iterations or repetitions override these
+RUN_CONFIG = {
+    "modelName": "sphere",
+    "nContrib": 20,
+    "fitParameterLimits": {"radius": [3.14, 314]},
+    "staticParameters": {"sld": 33.4, "sld_solvent": 0, "background": 0},
+    "maxIter": 100,
+    "nRep": 2,
+    "nCores": 1,
+}
+
+
+def write_configs(directory: Path, run_config: dict = RUN_CONFIG) -> tuple[Path, Path]:
+    """Write the data read and run configurations into the directory, returns both files."""
+    read_file, run_file = directory / "read.yaml", directory / "run.yaml"
+    read_file.write_text(yaml.safe_dump(READ_CONFIG))
+    run_file.write_text(yaml.safe_dump(run_config))
+    return read_file, run_file
+
+
+@pytest.fixture(scope="session")
+def result_file(tmp_path_factory) -> Path:
+    """The test data optimized once with RUN_CONFIG, tests writing into it work on a copy."""
+    tmp_path = tmp_path_factory.mktemp("optimized")
+    read_file, run_file = write_configs(tmp_path)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("MCSAS3GUI_PREPARED_DATA", str(tmp_path / "store"))
+        run_optimization(NEXUS_FILE, read_file, tmp_path / "result.hdf5", run_file)
+    return tmp_path / "result.hdf5"
@@ -0,0 +1,55 @@
+from mcsas3gui.utils.autotune import (
+    SweepResult,
+    parse_values,
+    projected_runtime,
+    recommend,
+    recommended_n_cores,
+    run_sweep,
+    sweep_configs,
+)
+from mcsas3gui.utils.data_utils import load_mcdata_1d
+
+from conftest import NEXUS_FILE, READ_CONFIG, RUN_CONFIG
+
+RUN_CONFIG = {**RUN_CONFIG, "nContrib": 50, "maxIter": 300, "maxAccept": 100, "convCrit": 1}
+
+
+def test_sweep_configs():
+    configs = sweep_configs(RUN_CONFIG, {"nContrib": [10, 20], "convCrit": [1, 2, 5]})
+    assert len(configs) == 6
+    assert configs[-1] == {**RUN_CONFIG, "nContrib": 20, "convCrit": 5}
+    assert sweep_configs(RUN_CONFIG, {}) == [RUN_CONFIG]
+    assert parse_values("100, 200; 1.5,") == [100, 200, 1.5]
+
+
+def test_recommendation():
+    results = [
+        SweepResult({"nContrib": 10, "convCrit": 1}, runtime=1.0, gof=3.0),
+        SweepResult({"nContrib": 20, "convCrit": 1}, runtime=2.0, gof=0.9),
+        SweepResult({"nContrib": 40, "convCrit": 1}, runtime=4.0, gof=0.8),
+        SweepResult({"nContrib": 5, "convCrit": 1}, error="ValueError: nope"),
+    ]
+    assert recommend(results, gof_target=1) is results[1]
+    assert results[1].converged and not results[0].converged
+    assert recommend(results, gof_target=0.5) is None
+    assert recommended_n_cores(10, n_cpus=8) == 5
+    assert recommended_n_cores(10, n_cpus=1) == 1
+    assert recommended_n_cores(10, n_cpus=32) == 10
+    assert projected_runtime(2.0, n_rep=10, n_cores=4) == 6.0
+
+
+def test_run_sweep():
+    meas_data = load_mcdata_1d(NEXUS_FILE, READ_CONFIG).measData
+    configs = sweep_configs(
+        {**RUN_CONFIG, "maxIter": 100}, {"nContrib": [10, 20], "convCrit": [100]}
+    )
+    configs.append({**RUN_CONFIG, "modelName": "no_such_model"})
+    # keys missing from the run configuration are not recorded as None
+    configs.append({key: value for key, value in RUN_CONFIG.items() if key != "convCrit"})
+    results = list(run_sweep(configs, meas_data, max_workers=1))
+    assert [result.settings["nContrib"] for result in results] == [10, 20, 50, 50]
+    assert all(result.ok and 0 < result.steps <= 100 for result in results[:2])
+    assert results[0].steps >= results[0].accepted and results[0].runtime > 0
+    assert not results[2].ok
+    assert results[3].settings == {"nContrib": 50, "maxAccept": 100}
+    assert results[3].converged == (results[3].gof <= 1)
@@ -0,0 +1,94 @@
+import shutil
+from pathlib import Path
+
+import h5py
+import pytest
+import yaml
+
+from mcsas3gui.utils.campaign_container import (
+    ContainerWriter,
+    container_samples,
+    pack,
+    read_index,
+    sample_address,
+    sample_names,
+)
+from mcsas3gui.utils.campaign_table import result_files, update_table
+from mcsas3gui.utils.histogramming import result_card_path
+from mcsas3gui.utils.rehistogramming import run_rehistogramming
+from mcsas3gui.utils.result_reader import ResultCache, read_result
+
+from conftest import HIST_CONFIG
+
+
+def test_pack_and_replace(result_file, tmp_path):
+    files = [shutil.copy(result_file, tmp_path / f"S{i}_output.hdf5") for i in range(3)]
+    (tmp_path / "broken_output.hdf5").write_text("not an HDF5 file")
+    container = tmp_path / "campaign.h5"
+    names = sample_names(files)
+    outcomes = pack(container, files + [tmp_path / "broken_output.hdf5"], remove=True)
+    assert outcomes[:3] == [sample_address(container, name) for name in names]
+    assert isinstance(outcomes[3], OSError)
+    assert not any(Path(f).exists() for f in files)  # moved into the container
+    assert (tmp_path / "broken_output.hdf5").exists()
+    assert read_result(outcomes[1]).n_repetitions == 2
+
+    # a sample written again is replaced, not added
+    outcomes = ContainerWriter(container).add([(result_file, names[1])])
+    assert read_index(container) == names
+    with h5py.File(container) as h5f:
+        assert list(h5f["index/source"].asstr()[()])[1] == str(result_file)
+    with pytest.raises(ValueError):
+        ContainerWriter(result_file)  # not a container
+    with pytest.raises(ValueError):
+        ContainerWriter(container, shard_size=2)  # written without shards
+
+    # files of the same name from different directories are different samples
+    (tmp_path / "day1").mkdir(), (tmp_path / "day2").mkdir()
+    days = [shutil.copy(result_file, tmp_path / day / "S0_output.hdf5") for day in ("day1", "day2")]
+    for day in days:  # added in separate batches
+        pack(container, [day])
+    assert read_index(container) == names + sample_names(days)
+    assert len(set(read_index(container))) == 5
+
+
+def test_shards_histogramming_and_table(result_file, tmp_path):
+    container = tmp_path / "campaign.h5"
+    files = [shutil.copy(result_file, tmp_path / f"S{i}.hdf5") for i in range(3)]
+    names = sample_names(files)
+    outcomes = pack(container, files, shard_size=2)
+    assert [Path(address.split("::")[0]).name for address in outcomes] == [
+        "campaign_000.h5",
+        "campaign_000.h5",
+        "campaign_001.h5",
+    ]
+    assert list(container_samples(container)) == names
+    with pytest.raises(ValueError):
+        ContainerWriter(container)  # written in shards
+    # a new writer continues in the last shard with room
+    assert ContainerWriter(container, shard_size=2).add([(files[0], "S3")]) == [
+        sample_address(tmp_path / "campaign_001.h5", "S3")
+    ]
+
+    # histogrammed by worker processes, stored by a single writer
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    histogrammed = list(
+        run_rehistogramming(outcomes, hist_ranges, max_workers=2, keep_analyses=False)
+    )
+    assert all(outcome.ok and outcome.analysis is None for outcome in histogrammed)
+    with h5py.File(tmp_path / "campaign_001.h5") as h5f:
+        assert len(h5f[f"samples/{names[2]}/analyses/MCResult1/histograms"]) == 2
+    assert result_card_path(outcomes[2]).name == f"campaign_001_{names[2]}.pdf"
+
+    shard_samples = result_files([tmp_path / "campaign_000.h5"])
+    assert [str(f) for f in shard_samples] == outcomes[:2]
+    update = update_table(tmp_path / "table.h5", shard_samples, max_workers=1)
+    assert len(update.table) == 4 and not update.errors
+    assert update.table["file"].iloc[-1].endswith(f"campaign_000.h5::{names[1]}")
+
+    # writing one sample outdates only what is known about that sample
+    key = ResultCache.key(outcomes[0])
+    assert all(outcome.ok for outcome in run_rehistogramming(outcomes[1:2], hist_ranges))
+    assert ResultCache.key(outcomes[0]) == key
+    update = update_table(tmp_path / "table.h5", shard_samples, max_workers=1)
+    assert (update.n_read, update.n_unchanged) == (1, 1)
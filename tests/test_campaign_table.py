@@ -0,0 +1,94 @@
+import shutil
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pandas
+import yaml
+
+from mcsas3gui.utils.campaign_table import (
+    read_table,
+    result_files,
+    update_rows,
+    update_table,
+    write_table,
+)
+from mcsas3gui.utils.histogramming import histogram_file
+
+from conftest import HIST_CONFIG, NEXUS_FILE
+
+
+def test_update_table(result_file, tmp_path):
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    files = [tmp_path / "a_output.hdf5", tmp_path / "b_output.hdf5"]
+    analyses = []
+    for file_name in files:
+        shutil.copy(result_file, file_name)
+        analyses.append(histogram_file(file_name, hist_ranges, pdf=False))
+    (tmp_path / "broken.hdf5").write_text("not an HDF5 file")
+    table_path = tmp_path / "campaign.h5"
+
+    update = update_table(table_path, files + [tmp_path / "broken.hdf5"], max_workers=2)
+    assert (update.n_read, len(update.errors)) == (3, 1)
+    table = read_table(table_path)
+    assert len(table) == 4
+    assert list(table["parameter"]) == ["radius"] * 4
+    assert list(table["hist_index"]) == [0, 1, 0, 1]
+    assert table.loc[1, "binScale"] == "linear"
+    assert table.loc[1, "mean"] == analyses[0].modes.loc[1, ("mean", "valMean")]
+    assert table.loc[1, "totalValue_std"] == analyses[0].modes.loc[1, ("totalValue", "valStd")]
+    assert table.loc[0, "gof"] == analyses[0].opt_averages.loc["gof", "valMean"]
+
+    # unchanged files are not read again
+    update = update_table(table_path, files)
+    assert (update.n_read, update.n_unchanged) == (0, 2)
+    # a file histogrammed again replaces its rows in place, the other rows are kept
+    inode = table_path.stat().st_ino
+    histogram_file(files[1], hist_ranges[:1], pdf=False)
+    update = update_table(table_path, files)
+    assert (update.n_read, update.n_unchanged) == (1, 1)
+    assert table_path.stat().st_ino == inode
+    table = read_table(table_path)
+    assert [Path(f).name for f in table["file"]] == ["a_output.hdf5"] * 2 + ["b_output.hdf5"]
+
+    # a directory scan finds the result files, not the input files or the table next to them
+    shutil.copy(NEXUS_FILE, tmp_path)
+    assert result_files([tmp_path]) == files
+
+
+def test_update_table_result_indices(result_file, tmp_path):
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    file_name = shutil.copy(result_file, tmp_path / "output.hdf5")
+    histogram_file(file_name, hist_ranges, pdf=False)
+    update = update_table(tmp_path / "campaign.h5", [file_name], [1, 2])
+    # the rows of the histogrammed result are kept, the missing one is reported
+    assert list(update.table["result_index"]) == [1, 1]
+    assert "#2 KeyError" in update.errors[str(Path(file_name).resolve())]
+
+
+def test_update_rows(tmp_path):
+    table_path = tmp_path / "campaign.h5"
+    write_table(pandas.DataFrame({"file": list("abcde"), "value": np.arange(5.0)}), table_path)
+    # fewer new rows than stale ones: the last row is moved into the place left over
+    stale = np.array([False, True, False, True, False])
+    assert update_rows(table_path, stale, pandas.DataFrame({"file": ["f"], "value": [5.0]}))
+    assert list(read_table_unsorted(table_path)) == [("a", 0), ("f", 5), ("c", 2), ("e", 4)]
+    # more new rows than stale ones: the table is extended
+    new_rows = pandas.DataFrame({"file": ["g", "h"], "value": [6, 7]})
+    assert update_rows(table_path, np.array([True, False, False, False]), new_rows)
+    assert list(read_table_unsorted(table_path)) == [
+        ("g", 6),
+        ("f", 5),
+        ("c", 2),
+        ("e", 4),
+        ("h", 7),
+    ]
+    # rows that do not fit the columns are not written
+    assert not update_rows(table_path, np.zeros(5, bool), pandas.DataFrame({"file": ["i"]}))
+    assert not update_rows(table_path, np.zeros(5, bool), new_rows.assign(value=["x", "y"]))
+
+
+def read_table_unsorted(table_path):
+    with h5py.File(table_path, "r") as h5f:
+        files, values = h5f["campaign/file"].asstr()[()], h5f["campaign/value"][()]
+    return zip(files, values.astype(int))
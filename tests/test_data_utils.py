@@ -0,0 +1,14 @@
+import numpy as np
+from mcsas3.mc_data_1d import McData1D
+
+from mcsas3gui.utils.data_utils import load_mcdata_1d, mcdata_kwargs
+
+from conftest import NEXUS_FILE, READ_CONFIG
+
+
+def test_selective_nexus_read_matches_mcdata1d():
+    mds = load_mcdata_1d(NEXUS_FILE, READ_CONFIG)
+    reference = McData1D(filename=NEXUS_FILE, **mcdata_kwargs(READ_CONFIG))
+    assert mds.filename == NEXUS_FILE
+    for key in ("Q", "I", "ISigma"):
+        np.testing.assert_allclose(mds.binnedData[key], reference.binnedData[key])
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas
+import pytest
+
+from mcsas3gui.utils.data_utils import load_mcdata_1d
+from mcsas3gui.utils.gof_plateau import detect_plateau, gof_trend, limit_diagnostics
+from mcsas3gui.utils.single_repetition import run_single_repetition
+
+from conftest import NEXUS_FILE, READ_CONFIG, RUN_CONFIG
+
+RUN_CONFIG = {**RUN_CONFIG, "maxIter": 20000, "convCrit": 0}
+
+
+def test_gof_trend_and_plateau():
+    steps = np.arange(0, 1000, 10)
+    gofs = 100 * np.exp(-0.001 * steps)
+    slope, gof = gof_trend(steps, gofs, 1000, window=500)
+    assert slope == pytest.approx(-0.001, rel=0.1) and gof == gofs[-1]
+    assert detect_plateau(steps, gofs, 400, conv_crit=1, window=500) is None
+    status = detect_plateau(steps, gofs, 1000, conv_crit=1, window=500)
+    assert not status.plateau and status.improvement > 0.3
+    assert status.steps_to_convergence == pytest.approx(np.log(1 / gofs[-1]) / slope, rel=0.1)
+
+    # no accepted steps in the last window: a plateau above convCrit, but not below it
+    status = detect_plateau(steps, gofs, 5000, conv_crit=1, window=500)
+    assert status.plateau and status.improvement == 0
+    assert not detect_plateau(steps, gofs, 5000, conv_crit=100, window=500).plateau
+
+
+def test_limit_diagnostics():
+    parameter_set = pandas.DataFrame({"radius": [1.0] * 5 + list(np.geomspace(2, 90, 15))})
+    diagnostics = limit_diagnostics(parameter_set, {"radius": (1, 100)}, {"radius": True})
+    assert len(diagnostics) == 1 and "lower limit" in diagnostics[0]
+    assert not limit_diagnostics(parameter_set, {"radius": (0.1, 1000)}, {"radius": True})
+
+
+def test_stop_on_plateau():
+    mds = load_mcdata_1d(NEXUS_FILE, READ_CONFIG)
+    result = run_single_repetition(
+        mds.measData, RUN_CONFIG, report_interval=0.05, stop_on_plateau=True, plateau_window=200
+    )
+    assert result.stop_reason == "GOF plateau"
+    assert result.accepted_steps[-1] < RUN_CONFIG["maxIter"]
+    assert any("convCrit" in diagnostic for diagnostic in result.diagnostics)
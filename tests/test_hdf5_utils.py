@@ -0,0 +1,45 @@
+import os
+
+import h5py
+import numpy as np
+
+from mcsas3gui.utils.hdf5_utils import is_hdf5_file, list_hdf5_group
+
+
+def _make_nexus_like(file_name):
+    with h5py.File(file_name, "w") as h5f:
+        result = h5f.create_group("entry/result")
+        result["Q"] = np.linspace(0.1, 1, 10)
+        result["I"] = np.ones(10)
+        h5f.create_group("entry/instrument/detector")["data"] = np.zeros((2, 4, 4))
+
+
+def test_list_hdf5_group_lists_direct_members_only(tmp_path):
+    file_name = tmp_path / "test.nxs"
+    _make_nexus_like(file_name)
+
+    (entry,) = list_hdf5_group(file_name)
+    assert entry.path == "/entry" and entry.is_group and entry.n_children == 2
+
+    nodes = {node.name: node for node in list_hdf5_group(file_name, "/entry/result")}
+    assert set(nodes) == {"Q", "I"}
+    assert nodes["Q"].path == "/entry/result/Q"
+    assert nodes["Q"].shape == (10,) and not nodes["Q"].is_group
+
+
+def test_list_hdf5_group_is_refreshed_when_file_changes(tmp_path):
+    file_name = tmp_path / "test.h5"
+    _make_nexus_like(file_name)
+    assert len(list_hdf5_group(file_name, "/entry/result")) == 2
+
+    with h5py.File(file_name, "a") as h5f:
+        h5f["entry/result/ISigma"] = np.ones(10)
+    stat = os.stat(file_name)  # make sure the mtime differs on coarse-grained file systems
+    os.utime(file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert len(list_hdf5_group(file_name, "/entry/result")) == 3
+
+
+def test_is_hdf5_file():
+    assert is_hdf5_file("some/file.NXS")
+    assert not is_hdf5_file("some/file.csv")
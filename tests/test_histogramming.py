@@ -0,0 +1,111 @@
+import contextlib
+import io
+import shutil
+
+import h5py
+import numpy as np
+import pandas
+import pytest
+import yaml
+from matplotlib.figure import Figure
+from mcsas3.mc_analysis import McAnalysis
+
+from mcsas3gui.utils.histogramming import (
+    analyse,
+    binned_weights,
+    histogram_file,
+    render_result_card,
+)
+from mcsas3gui.utils.result_reader import read_result
+
+from conftest import HIST_CONFIG, RUN_CONFIG
+
+
+def test_analysis_matches_mcanalysis(result_file):
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    result = read_result(result_file)
+    assert len(result.repetitions) == RUN_CONFIG["nRep"]
+    assert result.parameters["radius"].shape == (RUN_CONFIG["nRep"], RUN_CONFIG["nContrib"])
+    analysis = analyse(result, hist_ranges)
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = McAnalysis(result_file, result.meas_data, pandas.DataFrame(hist_ranges))
+    # McAnalysis refits scaling and background on loading, the stored values are used here
+    for index, histogram in enumerate(analysis.histograms):
+        expected = reference._averagedHistograms[index]
+        np.testing.assert_allclose(histogram["xMean"], expected["xMean"])
+        np.testing.assert_allclose(histogram["yMean"], expected["yMean"], rtol=1e-3)
+        np.testing.assert_allclose(histogram["yStd"], expected["yStd"], rtol=1e-2, atol=1e-9)
+    np.testing.assert_allclose(
+        analysis.modes.values.astype(float),
+        reference._averagedModes[analysis.modes.columns].values.astype(float),
+        rtol=1e-2,
+    )
+    np.testing.assert_allclose(analysis.model_i_mean, reference.modelIAvg.modelIMean, rtol=1e-2)
+    # autoRange takes the range from the fit parameter limits
+    assert (analysis.hist_ranges[0]["rangeMin"], analysis.hist_ranges[0]["rangeMax"]) == (3.14, 314)
+
+
+def test_binned_weights_match_numpy():
+    rng = np.random.default_rng(1)
+    edges = np.linspace(1, 10, 10)
+    # values outside the range and on the edges, including the upper one
+    values = np.concatenate([rng.uniform(0, 12, (4, 200)), np.tile(edges, (4, 1))], axis=1)
+    sorted_values = np.sort(values, axis=1)
+    cumulative = np.pad(np.cumsum(np.ones_like(values), axis=1), ((0, 0), (1, 0)))
+    expected = [np.histogram(row, bins=edges)[0] for row in values]
+    np.testing.assert_array_equal(binned_weights(sorted_values, cumulative, edges), expected)
+
+
+def test_one_pass_matches_per_range(result_file):
+    result = read_result(result_file)
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    hist_ranges.append({**hist_ranges[1], "binScale": "log", "nBin": 35})
+    analysis = analyse(result, hist_ranges)
+    for index, hist_range in enumerate(hist_ranges):
+        single = analyse(result, [hist_range])
+        pandas.testing.assert_frame_equal(analysis.histograms[index], single.histograms[0])
+        np.testing.assert_array_equal(analysis.modes.loc[index], single.modes.loc[0])
+    # the binning changes the histogram, but not the population statistics of the range
+    np.testing.assert_array_equal(analysis.modes.loc[1], analysis.modes.loc[2])
+
+
+def test_render_and_errors(result_file):
+    result = read_result(result_file)
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    figure = Figure(figsize=(12, 5))
+    analysis = analyse(result, hist_ranges)
+    assert render_result_card(figure, analysis) == [0, 1]
+    assert len(figure.axes) == 6
+    # a change of one range redraws only its histogram, into the same axes
+    axes = list(figure.axes)
+    changed = analyse(result, [hist_ranges[0], {**hist_ranges[1], "nBin": 20}])
+    assert render_result_card(figure, changed, analysis) == [1]
+    assert figure.axes == axes
+    assert len(figure.axes[5].patches) == 20
+    # a different number of ranges draws the card anew
+    assert render_result_card(figure, analyse(result, hist_ranges[:1]), changed) == [0]
+    assert len(figure.axes) == 4
+    with pytest.raises(ValueError, match="not a fit parameter"):
+        analyse(result, [{**hist_ranges[0], "parameter": "length"}])
+    with pytest.raises(ValueError, match="nBin"):
+        analyse(result, [{**hist_ranges[0], "nBin": 0}])
+
+
+def test_histogram_file(result_file, tmp_path):
+    result_file = shutil.copy(result_file, tmp_path / "result.hdf5")
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    analysis = histogram_file(result_file, hist_ranges)
+    assert result_file.with_suffix(".pdf").is_file()
+    with h5py.File(result_file, "r") as h5f:
+        group = h5f["/analyses/MCResult1/histograms/histRange1"]
+        assert group["binScale"][()].decode() == "linear"
+        np.testing.assert_allclose(group["average/yMean"][()], analysis.histograms[1]["yMean"])
+        np.testing.assert_allclose(
+            group["repetition0/hist"][()], analysis.repetition_histograms[1][0]
+        )
+        assert group["average/mean/valMean"][()] == analysis.modes.loc[1, ("mean", "valMean")]
+        assert "modelIMean" in h5f["/analyses/MCResult1/optimization/average"]
+    # histogramming again with fewer ranges leaves no histograms of the earlier run behind
+    histogram_file(result_file, hist_ranges[:1], pdf=False)
+    with h5py.File(result_file, "r") as h5f:
+        assert list(h5f["/analyses/MCResult1/histograms"]) == ["histRange0"]
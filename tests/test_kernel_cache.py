@@ -0,0 +1,32 @@
+from sasmodels import kerneldll
+
+from mcsas3gui.utils.kernel_cache import (
+    KERNEL_CACHE_ENV,
+    cache_entries,
+    cache_size,
+    configure_kernel_cache,
+    evict,
+    kernel_cache_dir,
+    precompile,
+    stale_cache_dirs,
+)
+
+
+def test_kernels_are_compiled_into_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(KERNEL_CACHE_ENV, str(tmp_path))
+    monkeypatch.setenv("SAS_DLL_PATH", kerneldll.SAS_DLL_PATH)  # restored after the test
+    monkeypatch.setattr(kerneldll, "SAS_DLL_PATH", kerneldll.SAS_DLL_PATH)
+    (tmp_path / "sasmodels-0.1").mkdir()
+
+    cache_dir = configure_kernel_cache()
+    assert cache_dir == kernel_cache_dir() and cache_dir.parent == tmp_path
+    assert kerneldll.SAS_DLL_PATH == str(cache_dir)
+    assert stale_cache_dirs() == [tmp_path / "sasmodels-0.1"]
+
+    precompile("sphere@hardsphere", "double")
+    entries = cache_entries()
+    assert {(entry.model, entry.bits) for entry in entries} == {("sphere", 64), ("hardsphere", 64)}
+    assert cache_size() == sum(entry.size for entry in entries) > 0
+
+    assert evict(entries[:1]) == entries[0].size
+    assert cache_entries() == entries[1:]
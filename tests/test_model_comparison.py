@@ -0,0 +1,50 @@
+import math
+from pathlib import Path
+
+from mcsas3gui.utils.model_comparison import (
+    evaluate_cell,
+    matrix_tasks,
+    run_config_tags,
+    summary_table,
+)
+from mcsas3gui.utils.optimization_runner import run_optimization
+
+from conftest import NEXUS_FILE, RUN_CONFIG, write_configs
+
+RUN_CONFIG = {**RUN_CONFIG, "nContrib": 50}
+
+
+def test_matrix_output_names_do_not_collide(tmp_path):
+    run_configs = [Path("a/spheres.yaml"), Path("b/spheres.yaml"), Path("a/hardsphere.yaml")]
+    tags = run_config_tags(run_configs)
+    assert len(set(tags.values())) == 3 and tags[Path("a/hardsphere.yaml")] == "hardsphere"
+    assert run_config_tags(run_configs) == tags  # deterministic
+    files = [tmp_path / "x.nxs", tmp_path / "y.nxs"]
+    tasks = matrix_tasks(files, run_configs, tmp_path)
+    assert [input_file for input_file, _, _ in tasks] == [files[0]] * 3 + [files[1]] * 3
+    assert len({result_file for _, _, result_file in tasks}) == 6
+    assert tasks[2][2] == tmp_path / "x_hardsphere_output.hdf5"
+    # a tag turning the output of one file into that of another is disambiguated
+    files = [tmp_path / "x.nxs", tmp_path / "x_a.nxs", tmp_path / "x_a.h5"]
+    tasks = matrix_tasks(files, [Path("a_b.yaml"), Path("b.yaml")], tmp_path)
+    result_files = [result_file.name for _, _, result_file in tasks]
+    assert len(set(result_files)) == 6
+    assert result_files[1] == "x_b_output.hdf5"  # the others collide, e.g. x with a_b and x_a
+    assert result_files[0].startswith("x_a_b_") and result_files[0] != "x_a_b_output.hdf5"
+    assert matrix_tasks(files, [Path("a_b.yaml"), Path("b.yaml")], tmp_path) == tasks
+
+
+def test_comparison_summary(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCSAS3GUI_PREPARED_DATA", str(tmp_path / "store"))
+    read_file, run_file = write_configs(tmp_path, RUN_CONFIG)
+    result_file = tmp_path / "result.hdf5"
+    run_optimization(NEXUS_FILE, read_file, result_file, run_file)
+    cells = [
+        evaluate_cell(NEXUS_FILE, Path("run.yaml"), result_file, True, 2.0),
+        evaluate_cell(NEXUS_FILE, Path("other.yaml"), tmp_path / "missing.hdf5", False, 1.0),
+    ]
+    assert cells[0].gof > 0 and cells[0].gof_std >= 0 and math.isnan(cells[1].gof)
+    table = summary_table(cells)
+    assert list(table.columns.get_level_values(0).unique()) == ["run", "other"]
+    assert table.loc[NEXUS_FILE.name, ("run", "runtime (s)")] == 2.0
+    assert table.loc[NEXUS_FILE.name, ("run", "GOF")] == cells[0].gof
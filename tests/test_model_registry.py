@@ -0,0 +1,36 @@
+import re
+
+from sasmodels.core import load_model_info
+
+from mcsas3gui.utils.model_registry import (
+    completion_words,
+    get_model_info,
+    model_parameters,
+)
+
+
+def test_model_parameters_exclude_magnetic_parameters():
+    defaults = load_model_info("sphere@hardsphere").parameters.defaults
+    expected = {
+        param: value
+        for param, value in defaults.items()
+        if not any(
+            re.match(pattern, param) for pattern in (r"up_.*", r".*_M0", r".*_mtheta", r".*_mphi")
+        )
+    }
+    assert model_parameters("sphere@hardsphere") == expected
+    assert "radius" in expected and "sld_M0" not in expected
+
+
+def test_model_info_is_cached():
+    model_parameters("cylinder")  # loaded on first use
+    hits = get_model_info.cache_info().hits
+    assert get_model_info("cylinder") is get_model_info("cylinder")
+    assert get_model_info.cache_info().hits == hits + 2
+    model_parameters("cylinder")["radius"] = -1  # callers get a copy
+    assert model_parameters("cylinder")["radius"] > 0
+
+
+def test_completion_words():
+    words = completion_words(["sphere@hardsphere", "sphere@hards", "mcsas_sphere"])
+    assert {"fitParameterLimits", "nContrib", "cylinder", "volfraction", "radius"} <= set(words)
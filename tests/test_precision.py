@@ -0,0 +1,25 @@
+from mcsas3gui.utils.data_utils import load_mcdata_1d
+from mcsas3gui.utils.precision import PrecisionResult, compare_precisions, recommend_precision
+
+from conftest import NEXUS_FILE, READ_CONFIG, RUN_CONFIG
+
+RUN_CONFIG = {**RUN_CONFIG, "nContrib": 50}
+
+
+def test_compare_precisions():
+    meas_data = load_mcdata_1d(NEXUS_FILE, READ_CONFIG).measData
+    results = compare_precisions(meas_data, RUN_CONFIG, ("double", "single"), n_iterations=20)
+    assert [result.dtype for result in results] == ["double", "single"]
+    assert results[0].max_rel_error == 0
+    assert 0 < results[1].max_rel_error < 1e-3
+    assert all(result.runtime > 0 for result in results)
+
+
+def test_recommend_precision():
+    results = [
+        PrecisionResult("double", 0.0, runtime=2.0),
+        PrecisionResult("single", 1e-5, runtime=1.0),
+        PrecisionResult("fast", error="RuntimeError: not supported"),
+    ]
+    assert recommend_precision(results, tolerance=1e-3).dtype == "single"
+    assert recommend_precision(results, tolerance=1e-6).dtype == "double"
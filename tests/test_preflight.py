@@ -0,0 +1,21 @@
+from mcsas3gui.utils.file_utils import get_main_path
+from mcsas3gui.utils.preflight import preflight_file, run_preflight
+from mcsas3gui.utils.yaml_utils import load_yaml_file
+
+CSV_FILE = get_main_path() / "testdata" / "quickstartdemo1.csv"
+CSV_CONFIG = load_yaml_file(get_main_path() / "configurations/readdata/read_csv_simple.yaml")
+
+
+def test_preflight_file_reports_clipped_range():
+    result = preflight_file(CSV_FILE, {**CSV_CONFIG, "dataRange": [0.1, 1.0]})
+    assert result.ok, result.error
+    assert result.n_points > 0
+    assert 0.1 <= result.q_min < result.q_max < 1.0
+
+
+def test_preflight_reports_errors_in_order(tmp_path):
+    missing_file = tmp_path / "missing.csv"
+    results = list(run_preflight([CSV_FILE, missing_file], CSV_CONFIG, max_workers=1))
+    assert [result.ok for result in results] == [True, False]
+    assert results[1].file_name == str(missing_file)
+    assert "Error" in results[1].summary()
@@ -0,0 +1,107 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import h5py
+import numpy as np
+
+from mcsas3gui.utils.data_utils import load_mcdata_1d
+from mcsas3gui.utils.optimization_runner import run_optimization
+from mcsas3gui.utils.prepared_data import (
+    StoreStats,
+    copy_to_result_file,
+    load_meas_data,
+    load_stats,
+    prepare_data,
+    prune_store,
+    record_access,
+)
+from mcsas3gui.utils.result_reader import optimized_result_indices
+
+from conftest import NEXUS_FILE, READ_CONFIG, RUN_CONFIG, write_configs
+
+RUN_CONFIG = {**RUN_CONFIG, "nContrib": 50, "nRep": 1}
+
+
+def test_prepared_data_is_content_addressed(tmp_path):
+    store = tmp_path / "store"
+    prepared = prepare_data(NEXUS_FILE, READ_CONFIG, root=store)
+    assert not prepared.hit and prepared.path.is_file()
+    mds = load_mcdata_1d(NEXUS_FILE, READ_CONFIG)
+    meas_data = load_meas_data(prepared)
+    for key in ("I", "ISigma"):
+        np.testing.assert_array_equal(meas_data[key], mds.measData[key])
+    np.testing.assert_array_equal(meas_data["Q"][0], mds.measData["Q"][0])
+
+    # explicit defaults give the same key, a copy is recognized only as a copy of its source
+    assert prepare_data(
+        NEXUS_FILE, {**READ_CONFIG, "resultIndex": 1}, root=store
+    ) == prepared._replace(hit=True)
+    copy = shutil.copy2(NEXUS_FILE, tmp_path / "copy.nxs")
+    assert prepare_data(copy, READ_CONFIG, root=store, source=NEXUS_FILE).hit
+    assert not prepare_data(copy, READ_CONFIG, root=store).hit
+    assert not prepare_data(NEXUS_FILE, {**READ_CONFIG, "nbins": 40}, root=store).hit
+    assert load_stats(store) == StoreStats(hits=2, misses=3)
+
+    result_file = tmp_path / "result.hdf5"
+    copy_to_result_file(prepared, result_file)
+    copy_to_result_file(prepared, result_file)  # replaces the earlier copy
+    with h5py.File(result_file) as h5f:
+        assert h5f["/analyses/MCResult1/mcdata/measData/I"].shape == (50,)
+
+
+def test_store_is_pruned(tmp_path):
+    store = tmp_path / "store"
+    first = prepare_data(NEXUS_FILE, READ_CONFIG, root=store)
+    os.utime(first.path, (0, 0))  # used long ago
+    second = prepare_data(NEXUS_FILE, {**READ_CONFIG, "nbins": 40}, root=store)
+    assert first.path.is_file()  # within the default limit
+    assert prune_store(store, max_bytes=second.path.stat().st_size) > 0
+    assert not first.path.is_file() and second.path.is_file()
+
+    # concurrent jobs count every access
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda hit: record_access(hit, store), [True] * 20))
+    assert load_stats(store) == StoreStats(hits=20, misses=2)
+
+
+def test_optimization_runner(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_configs(tmp_path, RUN_CONFIG)
+    store = tmp_path / "store"
+    monkeypatch.setenv("MCSAS3GUI_PREPARED_DATA", str(store))
+    for run in range(2):
+        run_optimization(
+            NEXUS_FILE, tmp_path / "read.yaml", tmp_path / "result.hdf5", tmp_path / "run.yaml"
+        )
+    assert load_stats(store) == StoreStats(hits=1, misses=1)
+    with h5py.File(tmp_path / "result.hdf5") as h5f:
+        assert "csvargs" in h5f["/analyses/MCResult1/mcdata"]  # needed to load it again
+        assert {"model", "optimization"} <= set(h5f["/analyses/MCResult1"])
+
+    # a job on a copy of the data, e.g. staged on scratch, names the original as its data
+    copy = shutil.copy2(NEXUS_FILE, tmp_path / "staged.nxs")
+    run_optimization(
+        copy,
+        tmp_path / "read.yaml",
+        tmp_path / "staged.hdf5",
+        tmp_path / "run.yaml",
+        source_file=NEXUS_FILE,
+    )
+    assert load_stats(store) == StoreStats(hits=2, misses=1)
+    with h5py.File(tmp_path / "staged.hdf5") as h5f:
+        assert h5f["/analyses/MCResult1/mcdata/filename"].asstr()[()] == str(NEXUS_FILE)
+
+
+def test_optimization_runner_result_indices(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_configs(tmp_path, RUN_CONFIG)
+    store = tmp_path / "store"
+    monkeypatch.setenv("MCSAS3GUI_PREPARED_DATA", str(store))
+    result_file = tmp_path / "result.hdf5"
+    errors = run_optimization(
+        NEXUS_FILE, tmp_path / "read.yaml", result_file, tmp_path / "run.yaml", [1, 2]
+    )
+    assert errors == {1: None, 2: None}
+    assert load_stats(store) == StoreStats(hits=0, misses=1)  # prepared once for both
+    assert optimized_result_indices(result_file) == [1, 2]
@@ -0,0 +1,47 @@
+import shutil
+
+import h5py
+import pytest
+import yaml
+
+from mcsas3gui.utils.histogramming import result_card_path
+from mcsas3gui.utils.rehistogramming import run_rehistogramming
+
+from conftest import HIST_CONFIG
+
+
+@pytest.fixture(scope="module")
+def result_files(result_file, tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("rehistogramming")
+    shutil.copy(result_file, tmp_path / "result0.hdf5")
+    shutil.copy(result_file, tmp_path / "result1.hdf5")
+    (tmp_path / "broken.hdf5").write_text("not an HDF5 file")
+    return [tmp_path / "result0.hdf5", tmp_path / "broken.hdf5", tmp_path / "result1.hdf5"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_rehistogramming(result_files, max_workers):
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    outcomes = list(run_rehistogramming(result_files, hist_ranges, max_workers=max_workers))
+    assert [outcome.file_name for outcome in outcomes] == [str(f) for f in result_files]
+    assert [outcome.ok for outcome in outcomes] == [True, False, True]
+    assert "OSError" in outcomes[1].error
+    assert len(outcomes[0].analysis.histograms) == 2
+    for result_file in result_files[::2]:
+        with h5py.File(result_file, "r") as h5f:
+            assert list(h5f["/analyses/MCResult1/histograms"]) == ["histRange0", "histRange1"]
+        # result cards are left to the caller
+        assert not result_card_path(result_file, "pdf").exists()
+    # without result cards, the analyses are not passed back
+    outcomes = run_rehistogramming(
+        result_files, hist_ranges, max_workers=max_workers, keep_analyses=False
+    )
+    assert [outcome.analysis for outcome in outcomes] == [None, None, None]
+
+
+def test_result_indices(result_files):
+    hist_ranges = list(yaml.safe_load_all(HIST_CONFIG.read_text()))
+    outcomes = list(run_rehistogramming(result_files[:1], hist_ranges, [2, 1], max_workers=1))
+    assert [(outcome.result_index, outcome.ok) for outcome in outcomes] == [(2, False), (1, True)]
+    assert "KeyError" in outcomes[0].error
+    assert result_card_path(result_files[0], "png", 2).name == "result0_result2.png"
@@ -0,0 +1,96 @@
+import os
+
+import h5py
+import numpy as np
+
+from mcsas3gui.utils.result_reader import (
+    ResultCache,
+    optimized_result_indices,
+    read_result,
+    read_results,
+)
+
+
+def write_result(file_name, n_rep=2, n_contrib=10, seed=0):
+    """A McSAS3 result file with only the datasets the reader needs."""
+    rng = np.random.default_rng(seed)
+    root = "/analyses/MCResult1"
+    with h5py.File(file_name, "w") as h5f:
+        h5f[f"{root}/mcdata/measData/Q"] = np.linspace(0.1, 1, 20)[np.newaxis]
+        h5f[f"{root}/mcdata/measData/I"] = np.ones(20)
+        h5f[f"{root}/mcdata/measData/ISigma"] = np.full(20, 0.1)
+        h5f[f"{root}/model/fitParameterLimits/radius"] = [1.0, 100.0]
+        for rep in range(n_rep):
+            model = h5f.create_group(f"{root}/model/repetition{rep}")
+            model["parameterSet/columns"] = np.array(["radius"], dtype=h5py.string_dtype())
+            model["parameterSet/data"] = rng.uniform(1, 100, (n_contrib, 1))
+            model["volumes"] = rng.uniform(size=n_contrib)
+            opt = h5f.create_group(f"{root}/optimization/repetition{rep}")
+            opt["x0"] = [1.0, 0.01]
+            opt["gof"] = 1.5
+            opt["accepted"] = 100
+            opt["step"] = 1000
+            opt["modelI"] = np.ones(20)
+
+
+def test_read_result(tmp_path):
+    write_result(tmp_path / "result.hdf5", n_rep=3, n_contrib=10)
+    result = read_result(tmp_path / "result.hdf5")
+    assert list(result.repetitions) == [0, 1, 2]
+    assert result.parameters["radius"].shape == (3, 10)
+    assert result.x0.shape == (3, 2)
+    assert result.model_i.shape == (3, 20)
+    assert result.fit_parameter_limits == {"radius": (1.0, 100.0)}
+    assert result.nbytes > result.parameters["radius"].nbytes
+
+
+def test_cache_hits_and_invalidation(tmp_path):
+    file_name = tmp_path / "result.hdf5"
+    write_result(file_name)
+    cache = ResultCache()
+    first = cache.get(file_name)
+    assert cache.get(file_name) is first
+    assert cache.stats()[:3] == (1, 1, 1)
+    # a file optimized again is read again, and its outdated entry dropped
+    write_result(file_name, seed=1)
+    os.utime(file_name, ns=(0, 0))
+    second = cache.get(file_name)
+    assert second is not first
+    assert not np.array_equal(second.parameters["radius"], first.parameters["radius"])
+    assert cache.stats()[:3] == (1, 2, 1)
+    # writing without changing the result keeps it
+    with h5py.File(file_name, "a") as h5f:
+        h5f["/analyses/MCResult1/histograms/histRange0/nBin"] = 10
+    cache.put(second)
+    assert cache.get(file_name) is second
+
+
+def test_cache_eviction(tmp_path):
+    for i in range(3):
+        write_result(tmp_path / f"result{i}.hdf5", seed=i)
+    cache = ResultCache(max_entries=2)
+    results = [cache.get(tmp_path / f"result{i}.hdf5") for i in range(2)]
+    cache.get(tmp_path / "result0.hdf5")  # result1 is now the least recently used
+    cache.get(tmp_path / "result2.hdf5")
+    assert cache.get(tmp_path / "result0.hdf5") is results[0]
+    assert cache.get(tmp_path / "result1.hdf5") is not results[1]
+    # one large result is kept, even beyond the memory limit
+    cache = ResultCache(max_bytes=1)
+    cache.get(tmp_path / "result0.hdf5")
+    cache.get(tmp_path / "result1.hdf5")
+    assert cache.stats().entries == 1
+
+
+def test_read_results_per_index(tmp_path):
+    file_name = tmp_path / "result.hdf5"
+    write_result(file_name)
+    assert optimized_result_indices(file_name) == [1]
+    results = read_results(file_name, [1, 2])
+    assert results[1].result_index == 1
+    assert isinstance(results[2], KeyError)  # the missing result does not hide the other
+    cache = ResultCache()
+    first = cache.get(file_name)
+    results = cache.get_many(file_name, [2, 1])
+    assert list(results) == [2, 1]
+    assert results[1] is first
+    assert cache.stats()[:3] == (1, 1, 1)
@@ -0,0 +1,49 @@
+import pytest
+
+from mcsas3gui.utils.prepared_data import PREPARED_DATA_ENV, load_stats
+from mcsas3gui.utils.runtime_estimate import (
+    PROCESS_OVERHEAD,
+    Calibration,
+    calibrate_file,
+    estimate_batch,
+    format_duration,
+    load_corrections,
+    record_actual_runtime,
+)
+
+from conftest import NEXUS_FILE, READ_CONFIG, RUN_CONFIG
+
+RUN_CONFIG = {**RUN_CONFIG, "nContrib": 50, "maxIter": 1000, "nRep": 4}
+
+
+def test_calibrate_file(tmp_path, monkeypatch):
+    monkeypatch.setenv(PREPARED_DATA_ENV, str(tmp_path))
+    calibration = calibrate_file(NEXUS_FILE, READ_CONFIG, RUN_CONFIG, n_iterations=50)
+    assert calibration.n_points == 50
+    assert load_stats().misses == 1  # the data is prepared for the batch
+    assert calibration.setup_time > 0 and calibration.time_per_iteration > 0
+
+
+def test_estimate_batch(tmp_path):
+    calibrations = {100: Calibration(50, setup_time=1.0, time_per_iteration=0.01)}
+    shapes = {"a.nxs": 100, "b.nxs": 100}
+    estimate = estimate_batch(calibrations, shapes, RUN_CONFIG)
+    per_file = PROCESS_OVERHEAD + (1.0 + 1000 * 0.01) * 4  # four rounds on a single core
+    assert estimate.file_times == {"a.nxs": pytest.approx(per_file), "b.nxs": per_file}
+    assert estimate.wall_time == pytest.approx(2 * per_file)
+    assert estimate.core_hours == pytest.approx(2 * per_file / 3600)
+    # each result index is optimized on its own
+    estimate = estimate_batch(calibrations, shapes, RUN_CONFIG, n_results=3)
+    assert estimate.predicted(["a.nxs"]) == pytest.approx(3 * per_file)
+    assert estimate.wall_time == pytest.approx(6 * per_file)
+    assert "with 3 results each" in estimate.summary()
+
+    corrections_file = tmp_path / "corrections.json"
+    assert record_actual_runtime("sphere", 100, 50, corrections_file) == 0.5
+    assert record_actual_runtime("sphere", 100, 100, corrections_file) == 0.75
+    corrections = load_corrections(corrections_file)
+    assert corrections["sphere"] == {"factor": 0.75, "n_batches": 2}
+    estimate = estimate_batch(calibrations, shapes, RUN_CONFIG, corrections)
+    assert estimate.wall_time == pytest.approx(2 * per_file * 0.75)
+    assert "2 earlier batches" in estimate.summary()
+    assert format_duration(3725) == "1 h 02 min"
@@ -0,0 +1,78 @@
+import queue
+import threading
+
+import h5py
+import numpy as np
+
+from mcsas3gui.utils.data_utils import load_mcdata_1d
+from mcsas3gui.utils.single_repetition import (
+    preview_config,
+    run_single_repetition,
+    thin_meas_data,
+)
+
+from conftest import NEXUS_FILE, READ_CONFIG, RUN_CONFIG
+
+RUN_CONFIG = {**RUN_CONFIG, "nContrib": 50, "maxIter": 300, "maxAccept": 100, "convCrit": 1}
+
+
+def test_single_repetition_streams_progress_and_stores(tmp_path):
+    mds = load_mcdata_1d(NEXUS_FILE, READ_CONFIG)
+    result_file = tmp_path / "test.hdf5"
+    mds.store(result_file)
+    progress = queue.Queue()
+    result = run_single_repetition(
+        mds.measData.copy(), RUN_CONFIG, result_file, progress, report_interval=0
+    )
+    steps, gofs = [], []
+    while not progress.empty():
+        kind, new_steps, new_gofs, _ = progress.get()
+        assert kind == "progress"
+        steps += new_steps
+        gofs += new_gofs
+    with h5py.File(result_file, "r") as h5f:
+        group = h5f["/analyses/MCResult1/optimization/repetition0"]
+        assert steps == list(group["acceptedSteps"][()])
+        assert gofs == list(group["acceptedGofs"][()])
+        np.testing.assert_array_equal(result.model_i, group["modelI"][()])
+        np.testing.assert_array_equal(result.x0, group["x0"][()])
+    assert steps == list(result.accepted_steps)
+
+
+def test_single_repetition_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mds = load_mcdata_1d(NEXUS_FILE, READ_CONFIG)
+    result = run_single_repetition(mds.measData.copy(), RUN_CONFIG)
+    assert len(result.model_i) == len(result.fit_q) == len(mds.measData["Q"][0])
+    assert result.accepted_gofs[-1] <= result.accepted_gofs[0]
+    assert not list(tmp_path.iterdir())
+
+
+def test_single_repetition_cancel(tmp_path):
+    mds = load_mcdata_1d(NEXUS_FILE, READ_CONFIG)
+    cancel = threading.Event()
+    cancel.set()
+    result_file = tmp_path / "test.hdf5"
+    assert run_single_repetition(mds.measData.copy(), RUN_CONFIG, result_file, None, cancel) is None
+    assert not result_file.exists()
+
+
+def test_preview_config_and_data():
+    config = preview_config({**RUN_CONFIG, "nContrib": 300, "maxIter": 100000}, factor=10)
+    assert (config["nContrib"], config["maxIter"], config["maxAccept"]) == (30, 10000, 20)
+    assert config["fitParameterLimits"] == RUN_CONFIG["fitParameterLimits"]
+    assert "maxAccept" not in preview_config({"modelName": "sphere"}, factor=10)
+
+    meas_data = load_mcdata_1d(NEXUS_FILE, {**READ_CONFIG, "nbins": 100}).measData
+    thinned = thin_meas_data(meas_data, factor=4)
+    assert len(thinned["I"]) == len(thinned["ISigma"]) == len(thinned["Q"][0]) == 25
+    assert thinned["Q"][0][0] == meas_data["Q"][0][0]
+    assert thinned["Q"][0][-1] == meas_data["Q"][0][-1]
+    assert len(thin_meas_data(meas_data, factor=50)["I"]) == 20
+
+
+def test_single_repetition_time_limit():
+    mds = load_mcdata_1d(NEXUS_FILE, READ_CONFIG)
+    config = {**RUN_CONFIG, "maxIter": 100000, "maxAccept": 100000, "convCrit": 0}
+    result = run_single_repetition(mds.measData.copy(), config, time_limit=0.5)
+    assert 0 < result.accepted_steps[-1] <= result.n_steps < 100000
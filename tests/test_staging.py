@@ -0,0 +1,74 @@
+import os
+import sys
+from pathlib import Path
+
+from mcsas3gui.utils.base_worker import BaseWorker
+from mcsas3gui.utils.staging import (
+    JOB_PREFIX,
+    ScratchConfig,
+    clean_scratch,
+    discard,
+    publish,
+    stage,
+)
+
+# writes the paths it was given for the result and the source into the result, fails for
+# inputs named fail*, after writing the result unless named failearly*
+COMMAND = (
+    f'"{Path(sys.executable).as_posix()}" -c "import sys, pathlib;'
+    " name = pathlib.Path(sys.argv[1]).name;"
+    " name.startswith('failearly') or"
+    " pathlib.Path(sys.argv[2]).write_text(sys.argv[2] + chr(10) + sys.argv[3]);"
+    " assert not name.startswith('fail')\""
+    " {input_file} {result_file} {source_file}"
+)
+
+
+def test_stage_and_publish(tmp_path):
+    config = ScratchConfig(tmp_path / "scratch", max_bytes=1024)
+    (tmp_path / "input.dat").write_bytes(b"x" * 100)
+    job = stage(tmp_path / "input.dat", tmp_path / "out" / "result.hdf5", config)
+    assert job.input_file.read_bytes() == b"x" * 100
+    assert job.directory.parent == config.root
+    job.result_file.write_text("result")
+    assert publish(job).read_text() == "result"
+    discard(job)
+    assert not job.directory.exists()
+    assert not list((tmp_path / "out").glob("*.tmp"))
+
+    # beyond the size limit, the job runs in place
+    (tmp_path / "large.dat").write_bytes(b"x" * 600)
+    assert stage(tmp_path / "large.dat", tmp_path / "result.hdf5", config) is None
+
+
+def test_clean_scratch(tmp_path):
+    config = ScratchConfig(tmp_path, max_bytes=1024)
+    (tmp_path / f"{JOB_PREFIX}old").mkdir()
+    (tmp_path / f"{JOB_PREFIX}new").mkdir()
+    os.utime(tmp_path / f"{JOB_PREFIX}old", (0, 0))
+    assert clean_scratch(config) == 1
+    assert [p.name for p in tmp_path.iterdir()] == [f"{JOB_PREFIX}new"]
+
+
+def test_base_worker_staging(tmp_path):
+    config = ScratchConfig(tmp_path / "scratch", max_bytes=1024**2)
+    inputs = [tmp_path / "sample.dat", tmp_path / "fail.dat", tmp_path / "failearly.dat"]
+    for input_file in inputs:
+        input_file.write_text("data")
+    results = [tmp_path / "out" / f"{input_file.stem}_output.hdf5" for input_file in inputs]
+    results[1].parent.mkdir()
+    for result_file in results[1:]:
+        result_file.write_text("earlier result")
+    worker = BaseWorker(dict(zip(inputs, results)), COMMAND, scratch=config)
+    outcomes = []
+    worker.task_done_signal.connect(lambda task, success, runtime: outcomes.append(success))
+    worker.run()
+    assert outcomes == [True, False, False]
+    # the job wrote on scratch, the result was published to its destination
+    written_to, source = results[0].read_text().splitlines()
+    assert Path(written_to).is_relative_to(config.root)
+    assert Path(source) == inputs[0]  # the input as given, not its copy on scratch
+    # a failed job leaves what it wrote, as in place, and never the earlier result
+    assert Path(results[1].read_text().splitlines()[0]).is_relative_to(config.root)
+    assert not results[2].exists()
+    assert not list(config.root.iterdir())
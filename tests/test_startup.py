@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["h5py", "matplotlib", "mcsas3", "pandas", "sasmodels.core", "scipy"]
+
+# starts the GUI in a fresh interpreter, so that no module is imported already; the time until
+# the window is visible is checked by benchmarks/bench_startup.py, as it depends on the machine
+STARTUP_SCRIPT = f"""
+import json, sys, tempfile, time
+from pathlib import Path
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from mcsas3gui.gui.main_window import McSAS3MainWindow
+from mcsas3gui.utils.kernel_cache import configure_kernel_cache
+configure_kernel_cache(Path(tempfile.mkdtemp()))
+app = QApplication(sys.argv)
+window = McSAS3MainWindow(Path(tempfile.mkdtemp()))
+window.show()
+app.processEvents()
+visible = time.perf_counter() - start
+imported = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+window.GSTab.config_dropdown.setCurrentText("quick_start_demo.yaml")
+window.tabs.setCurrentIndex(3)  # the optimization tab, needs the settings tabs too
+print(json.dumps({{
+    "visible": visible,
+    "imported": imported,
+    "built": sorted(window._built),
+    "data_config": window.tab("optimization_tab").data_config_selector.get_file_path(),
+}}))
+"""
+
+
+def run_startup() -> dict:
+    """Start the GUI in a fresh interpreter and return what STARTUP_SCRIPT reports."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_startup_deferred_imports():
+    startup = run_startup()
+    assert startup["imported"] == []  # only imported once a tab needs them
+    # the other tabs are built on first activation, with the template applied
+    assert startup["built"] == [
+        "data_loading_tab",
+        "hist_settings_tab",
+        "histogramming_tab",
+        "optimization_tab",
+        "run_settings_tab",
+    ]
+    assert startup["data_config"].endswith(".yaml")
+
+
+def test_profile_startup(tmp_path):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", MCSAS3GUI_KERNEL_CACHE=str(tmp_path))
+    subprocess.run(
+        [sys.executable, "-m", "mcsas3gui", "--profile-startup", str(tmp_path / "profile")],
+        env=env,
+        capture_output=True,
+        check=True,
+        timeout=300,
+    )
+    report = (tmp_path / "profile" / "startup_profile.txt").read_text()
+    assert "Window painted after" in report
+    assert "load_selected_default_config getting_started.yaml" in report
+    assert "mcsas3gui.utils.kernel_cache" in report  # imported after the profiler started
+    events = json.loads((tmp_path / "profile" / "startup_trace.json").read_text())["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert {"McSAS3MainWindow", "first paint", "optimization_tab"} <= set(spans)
+    # the tabs are built on first activation, after the window painted
+    assert spans["data_loading_tab"]["ts"] > spans["first paint"]["ts"]
+    assert {"import", "tab", "template", "window", "paint"} == {
+        event["cat"] for event in spans.values()
+    }